@@ -0,0 +1,236 @@
+"""
+Benchmarks Api_suite.py - Purpose and Relationship
+
+Theoretical Understanding
+A repeatable benchmark of the core /api/ endpoints. It seeds synthetic tables (default 100k
+employees, 1M inventory items, 50k products, scaled with --scale), then drives a fixed list of
+scenarios (lists, filters, search, ordering, sparse fieldsets, detail, changes feed, async lists)
+and reports for each:
+
+- rps and p50/p95/p99 latency
+- queries per request, counted in-process with CaptureQueriesContext on a separate request
+
+Two modes:
+- client: requests go through Django's test Client in this process, one at a time. No server and
+          no network, so it isolates the Django cost of each endpoint.
+- server: gunicorn serves the app and loadgen.py drives it with --concurrency keep-alive
+          connections, which includes the server and the HTTP stack.
+
+List and detail responses are cached (caching.py), so repeated requests mostly measure cache hits.
+--cold clears the cache before every request (client mode only) to measure the full path.
+
+Results are written to JSON together with the git commit, settings and dataset sizes. Pass an
+earlier file to --compare to print the change per scenario and flag regressions.
+
+Usage (from django_backend/, against the benchmark database, see django_backend/settings_bench.py):
+
+    python benchmarks/api_suite.py --scale 0.01 --requests 200                # quick run
+    python benchmarks/api_suite.py --mode server --concurrency 32 --duration 10
+    python benchmarks/api_suite.py --compare benchmarks/results/api-<commit>-client.json
+
+Relationship with Other Components
+- core/urls.py: the endpoints under test
+- datasets.py:  synthetic rows and the benchmark user's token
+- loadgen.py:   load generator (server mode) and percentile summary
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from datetime import timedelta
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'django_backend.settings_bench')
+os.environ.setdefault('CORE_THROTTLE', '0')  # also inherited by the gunicorn/uvicorn servers
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.core.cache import cache  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.test import Client  # noqa: E402
+from django.test.utils import CaptureQueriesContext  # noqa: E402
+from django.utils import timezone  # noqa: E402
+
+from datasets import MODELS, bench_token, require_bench_database, seed  # noqa: E402
+from loadgen import free_port, print_table, run_load, server, summarize  # noqa: E402
+
+SIZES = {'employees': 100_000, 'inventory': 1_000_000, 'products': 50_000}
+COLUMNS = ['scenario', 'rps', 'p50_ms', 'p95_ms', 'p99_ms', 'queries', 'errors']
+
+
+def scenarios(page_size):
+    """Return {name: path}; detail paths use a row from the middle of each table."""
+    since = (timezone.now() - timedelta(minutes=5)).isoformat().replace('+00:00', 'Z')
+    paths = {}
+    for resource, model in MODELS.items():
+        middle = model.objects.count() // 2
+        pk = model.objects.order_by('id').values_list('id', flat=True)[middle:middle + 1].first()
+        paths[f'{resource}_list'] = f'/api/{resource}/?page_size={page_size}'
+        paths[f'{resource}_detail'] = f'/api/{resource}/{pk}/'
+        paths[f'{resource}_prefix'] = f'/api/{resource}/?name__istartswith=bench&page_size={page_size}'
+        paths[f'{resource}_search'] = f'/api/{resource}/?search=99&page_size={page_size}'
+        paths[f'{resource}_changes'] = f'/api/{resource}/changes/?since={since}'
+        paths[f'{resource}_async_list'] = f'/api/async/{resource}/?page_size={page_size}'
+    paths['employees_ordering'] = f'/api/employees/?ordering=-base_salary&page_size={page_size}'
+    paths['inventory_low_stock'] = f'/api/inventory/?quantity__lte=10&page_size={page_size}'
+    paths['inventory_ordering'] = f'/api/inventory/?ordering=-quantity&page_size={page_size}'
+    paths['products_price_range'] = f'/api/products/?price__gte=50&price__lte=60&page_size={page_size}'
+    paths['products_sparse'] = f'/api/products/?fields=id,name,price&page_size={page_size}'
+    paths['products_async_sparse'] = f'/api/async/products/?fields=id,name,price&page_size={page_size}'
+    paths['inventory_sparse'] = f'/api/inventory/?fields=id,name,quantity&page_size={page_size}'
+    return dict(sorted(paths.items()))
+
+
+def count_queries(client, path, headers, cold=False):
+    if cold:
+        cache.clear()
+    with CaptureQueriesContext(connection) as captured:
+        client.get(path, headers=headers)
+    return len(captured)
+
+
+def bench_client():
+    if 'testserver' not in settings.ALLOWED_HOSTS and '*' not in settings.ALLOWED_HOSTS:
+        settings.ALLOWED_HOSTS = [*settings.ALLOWED_HOSTS, 'testserver']
+    return Client()
+
+
+def run_client(paths, token, requests, cold, only):
+    client = bench_client()
+    headers = {'Authorization': f'Token {token}'}
+    results = []
+    for name, path in paths.items():
+        if only and name not in only:
+            continue
+        client.get(path, headers=headers)  # warm-up: connections, caches, lazy imports
+        queries = count_queries(client, path, headers, cold)
+        latencies, errors = [], 0
+        started = time.perf_counter()
+        for _ in range(requests):
+            if cold:
+                cache.clear()
+            begin = time.perf_counter()
+            response = client.get(path, headers=headers)
+            if response.status_code >= 400:
+                errors += 1
+            else:
+                latencies.append(time.perf_counter() - begin)
+        result = summarize(latencies, errors, time.perf_counter() - started)
+        results.append({'scenario': name, 'path': path, **result, 'queries': queries})
+        print(f'{name}: {result}', file=sys.stderr)
+    return results
+
+
+def run_server(paths, token, args):
+    client = bench_client()
+    headers = {'Authorization': f'Token {token}'}
+    port = free_port()
+    command = ['gunicorn', 'django_backend.wsgi:application', '--bind', f'127.0.0.1:{port}',
+               '--workers', str(args.workers), '--threads', str(args.threads), '--backlog', '4096']
+    results = []
+    with server(command, port, BACKEND_DIR):
+        for name, path in paths.items():
+            if args.only and name not in args.only:
+                continue
+            queries = count_queries(client, path, headers)
+            result = run_load(f'http://127.0.0.1:{port}{path}', args.concurrency, args.duration, headers)
+            results.append({'scenario': name, 'path': path, **result, 'queries': queries})
+            print(f'{name}: {result}', file=sys.stderr)
+    return results
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=BACKEND_DIR, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def compare(results, baseline_path, threshold):
+    """Print each scenario's change against an earlier run; return the names that regressed."""
+    baseline = {row['scenario']: row for row in json.loads(Path(baseline_path).read_text())['results']}
+    rows, regressed = [], []
+    for row in results:
+        old = baseline.get(row['scenario'])
+        if old is None:
+            continue
+        p50_change = (row['p50_ms'] - old['p50_ms']) / old['p50_ms'] * 100 if old['p50_ms'] else 0.0
+        rps_change = (row['rps'] - old['rps']) / old['rps'] * 100 if old['rps'] else 0.0
+        worse = p50_change > threshold or rps_change < -threshold or row['queries'] > old['queries']
+        if worse:
+            regressed.append(row['scenario'])
+        rows.append({
+            'scenario': row['scenario'], 'p50_ms': f"{old['p50_ms']} -> {row['p50_ms']}",
+            'p50_change': f'{p50_change:+.1f}%', 'rps_change': f'{rps_change:+.1f}%',
+            'queries': f"{old['queries']} -> {row['queries']}", 'regressed': 'YES' if worse else '',
+        })
+    print_table(rows, ['scenario', 'p50_ms', 'p50_change', 'rps_change', 'queries', 'regressed'])
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--mode', choices=['client', 'server'], default='client')
+    parser.add_argument('--scale', type=float, default=1.0, help='multiply the default table sizes')
+    parser.add_argument('--no-seed', action='store_true', help='use the tables as they are')
+    parser.add_argument('--page-size', type=int, default=100)
+    parser.add_argument('--requests', type=int, default=500, help='requests per scenario (client mode)')
+    parser.add_argument('--cold', action='store_true', help='clear the cache before every request (client mode)')
+    parser.add_argument('--concurrency', type=int, default=32, help='connections (server mode)')
+    parser.add_argument('--duration', type=float, default=10.0, help='seconds per scenario (server mode)')
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--threads', type=int, default=8, help='gunicorn threads per worker')
+    parser.add_argument('--only', nargs='+', help='run only these scenarios')
+    parser.add_argument('--json', help='results file (default: benchmarks/results/api-<commit>-<mode>.json)')
+    parser.add_argument('--compare', help='earlier results file to compare against')
+    parser.add_argument('--threshold', type=float, default=10.0, help='regression threshold in percent')
+    args = parser.parse_args()
+    require_bench_database()
+
+    sizes = {resource: int(rows * args.scale) for resource, rows in SIZES.items()}
+    if not args.no_seed:
+        for resource, rows in sizes.items():
+            inserted = seed(resource, rows, progress=lambda name, done, total: print(
+                f'seeding {name}: {done}/{total}', end='\r', file=sys.stderr))
+            print(f'{resource}: {rows} rows ({inserted} inserted)', file=sys.stderr)
+    token = bench_token()
+    paths = scenarios(args.page_size)
+    if args.mode == 'client':
+        results = run_client(paths, token, args.requests, args.cold, args.only)
+    else:
+        results = run_server(paths, token, args)
+
+    commit = git_commit()
+    report = {
+        'commit': commit,
+        'created': timezone.now().isoformat(),
+        'mode': args.mode,
+        'database': connection.vendor,
+        'settings': os.environ['DJANGO_SETTINGS_MODULE'],
+        'debug': settings.DEBUG,
+        'rows': {resource: model.objects.count() for resource, model in MODELS.items()},
+        'options': {key: value for key, value in vars(args).items() if key not in ('json', 'compare')},
+        'results': results,
+    }
+    path = Path(args.json) if args.json else BACKEND_DIR / 'benchmarks' / 'results' / f'api-{commit}-{args.mode}.json'
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report, indent=2))
+    print_table(results, COLUMNS)
+    print(f'results written to {path}')
+    if args.compare and compare(results, args.compare, args.threshold):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+"""
+Benchmarks Asgi_vs_wsgi.py - Purpose and Relationship
+
+Theoretical Understanding
+Compares the synchronous ViewSets served by gunicorn (WSGI, worker threads) with the async read
+views served by uvicorn (ASGI, one event loop per worker) on the same list endpoint, at increasing
+numbers of concurrent keep-alive connections. Both servers get the same number of worker processes.
+A thread-per-request server can only run workers * threads requests at once and queues the rest,
+so its p99 latency grows with the number of open connections. An event loop keeps accepting and
+serving connections while queries are in flight.
+
+Usage (from django_backend/, against the benchmark database, see django_backend/settings_bench.py):
+
+    pip install gunicorn uvicorn
+    python benchmarks/asgi_vs_wsgi.py --resource inventory --concurrency 50 200 1000 --duration 10
+    python benchmarks/asgi_vs_wsgi.py --concurrency 20 --slow-clients 100
+
+The second run adds long-lived slow connections, like dashboards on poor networks. Each one holds a
+gunicorn thread while it trickles in its request. Under uvicorn it only costs an idle socket.
+
+Relationship with Other Components
+- core/async_views.py: /api/async/<resource>/ (ASGI)
+- core/views.py:       /api/<resource>/ (WSGI)
+- loadgen.py:          load generator and percentile summary
+- datasets.py:         synthetic rows and the benchmark user's token
+"""
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'django_backend.settings_bench')
+os.environ.setdefault('CORE_THROTTLE', '0')  # also inherited by the gunicorn/uvicorn servers
+
+import django  # noqa: E402
+
+django.setup()
+
+from datasets import MODELS, bench_token, require_bench_database, seed  # noqa: E402
+from loadgen import free_port, print_table, run_load, server  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--resource', choices=sorted(MODELS), default='inventory')
+    parser.add_argument('--rows', type=int, default=10000, help='seed the table up to this many rows')
+    parser.add_argument('--page-size', type=int, default=100)
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[50, 200, 1000])
+    parser.add_argument('--slow-clients', type=int, default=0,
+                        help='extra connections that send their request one byte every 200 ms')
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--threads', type=int, default=8, help='gunicorn threads per worker')
+    parser.add_argument('--json', help='write the results to this file')
+    args = parser.parse_args()
+    require_bench_database()
+
+    seed(args.resource, args.rows)
+    headers = {'Authorization': f'Token {bench_token()}'}
+    port = free_port()
+    servers = {
+        'wsgi (gunicorn)': (
+            ['gunicorn', 'django_backend.wsgi:application', '--bind', f'127.0.0.1:{port}',
+             '--workers', str(args.workers), '--threads', str(args.threads), '--backlog', '4096'],
+            f'/api/{args.resource}/',
+        ),
+        'asgi (uvicorn)': (
+            ['uvicorn', 'django_backend.asgi:application', '--port', str(port),
+             '--workers', str(args.workers), '--no-access-log', '--backlog', '4096'],
+            f'/api/async/{args.resource}/',
+        ),
+    }
+    results = []
+    for name, (command, path) in servers.items():
+        with server(command, port, BACKEND_DIR):
+            url = f'http://127.0.0.1:{port}{path}?page_size={args.page_size}'
+            for concurrency in args.concurrency:
+                result = run_load(url, concurrency, args.duration, headers, slow_clients=args.slow_clients)
+                results.append({'server': name, 'concurrency': concurrency, 'slow_clients': args.slow_clients, **result})
+                print(f'{name} c={concurrency}: {result}', file=sys.stderr)
+
+    print_table(results, ['server', 'concurrency', 'slow_clients', 'rps', 'p50_ms', 'p95_ms', 'p99_ms', 'errors'])
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
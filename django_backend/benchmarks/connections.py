@@ -0,0 +1,130 @@
+"""
+Benchmarks Connections.py - Purpose and Relationship
+
+Theoretical Understanding
+With CONN_MAX_AGE = 0 Django opens a new database connection for every request and closes it at the
+end. For PostgreSQL that is a TCP (or TLS) handshake, authentication and a new backend process
+before the first query can run. This benchmark measures that cost in two ways:
+
+1. Connect cost: time to open and close a raw connection, compared with one `SELECT 1` on a
+   connection that is already open. The difference is what each request pays when connections are
+   not reused.
+2. End to end: the same detail endpoint is served by gunicorn once per connection setting (see
+   DB_CONN_MAX_AGE / DB_POOL in settings.py), and the p50 latency is compared with the
+   close-after-every-request baseline.
+
+Usage (from django_backend/, against the benchmark database, see django_backend/settings_bench.py):
+
+    python benchmarks/connections.py --concurrency 8 --duration 10
+    python benchmarks/connections.py --connect-only
+
+The end-to-end part sets DB_* environment variables for each server, so it needs the project's
+settings.py (which reads them). The pool setting is skipped unless the database is PostgreSQL and
+psycopg_pool is installed.
+
+Relationship with Other Components
+- django_backend/settings.py: DB_CONN_MAX_AGE, DB_CONN_HEALTH_CHECKS, DB_POOL*
+- loadgen.py:                 load generator and percentile summary
+- datasets.py:                the benchmark user's token
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'django_backend.settings_bench')
+os.environ.setdefault('CORE_THROTTLE', '0')  # also inherited by the gunicorn/uvicorn servers
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.db import connection  # noqa: E402
+
+from core.models import InventoryItem  # noqa: E402
+from datasets import bench_token, require_bench_database  # noqa: E402
+from loadgen import free_port, percentile, print_table, run_load, server  # noqa: E402
+
+SETTINGS = {
+    'close per request': {'DB_CONN_MAX_AGE': '0', 'DB_POOL': '0'},
+    'persistent': {'DB_CONN_MAX_AGE': '60', 'DB_CONN_HEALTH_CHECKS': '0', 'DB_POOL': '0'},
+    'persistent + health checks': {'DB_CONN_MAX_AGE': '60', 'DB_CONN_HEALTH_CHECKS': '1', 'DB_POOL': '0'},
+    'pool': {'DB_POOL': '1'},
+}
+
+
+def connect_cost(rounds):
+    """Return (p50 ms to open + close a connection, p50 ms for SELECT 1 on an open one)."""
+    params = connection.get_connection_params()
+    connects, queries = [], []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        raw = connection.get_new_connection(params)
+        raw.close()
+        connects.append(time.perf_counter() - started)
+    connection.ensure_connection()
+    with connection.cursor() as cursor:
+        for _ in range(rounds):
+            started = time.perf_counter()
+            cursor.execute('SELECT 1')
+            cursor.fetchone()
+            queries.append(time.perf_counter() - started)
+    return round(percentile(connects, 50) * 1000, 3), round(percentile(queries, 50) * 1000, 3)
+
+
+def pool_available():
+    return connection.vendor == 'postgresql' and importlib.util.find_spec('psycopg_pool') is not None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rounds', type=int, default=200, help='connections opened by the connect-cost test')
+    parser.add_argument('--connect-only', action='store_true', help='skip the end-to-end server runs')
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--threads', type=int, default=4, help='gunicorn threads per worker')
+    parser.add_argument('--json', help='write the results to this file')
+    args = parser.parse_args()
+    require_bench_database()
+
+    connect_ms, query_ms = connect_cost(args.rounds)
+    print(f'{connection.vendor}: open + close a connection p50 {connect_ms} ms, '
+          f'SELECT 1 on an open connection p50 {query_ms} ms')
+    results = {'connect_p50_ms': connect_ms, 'select1_p50_ms': query_ms, 'servers': []}
+
+    if not args.connect_only:
+        item = InventoryItem.objects.order_by('id').first() or InventoryItem.objects.create(
+            name='bench item', quantity=1, unit='pcs'
+        )
+        headers = {'Authorization': f'Token {bench_token()}'}
+        port = free_port()
+        command = ['gunicorn', 'django_backend.wsgi:application', '--bind', f'127.0.0.1:{port}',
+                   '--workers', str(args.workers), '--threads', str(args.threads)]
+        for name, env in SETTINGS.items():
+            if env.get('DB_POOL') == '1' and not pool_available():
+                print(f'{name}: skipped (needs PostgreSQL and psycopg_pool)', file=sys.stderr)
+                continue
+            with server(command, port, BACKEND_DIR, env={**os.environ, **env}):
+                result = run_load(f'http://127.0.0.1:{port}/api/inventory/{item.pk}/', args.concurrency,
+                                  args.duration, headers)
+            results['servers'].append({'setting': name, **result})
+            print(f'{name}: {result}', file=sys.stderr)
+        baseline = results['servers'][0]['p50_ms'] if results['servers'] else 0
+        for row in results['servers']:
+            row['p50_saved_ms'] = round(baseline - row['p50_ms'], 2)
+        print_table(results['servers'], ['setting', 'rps', 'p50_ms', 'p95_ms', 'p99_ms', 'p50_saved_ms', 'errors'])
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+"""
+Benchmarks Datasets.py - Purpose and Relationship
+
+Theoretical Understanding
+Synthetic data for the benchmark scripts. Rows are generated deterministically from their index,
+so two runs with the same size see the same table contents (names, quantities, prices), and tables
+are only topped up to the requested size, so a seeded database can be reused between commits.
+Rows are inserted with bulk_create in fixed-size batches, so a million rows never sit in memory at
+once.
+
+Relationship with Other Components
+- api_suite.py, asgi_vs_wsgi.py and connections.py seed tables and get their auth token from here
+- Every script that touches the database calls require_bench_database() first: it exits unless all
+  core rows were created by the benchmarks (an empty database, or one seeded by an earlier run)
+- Must be imported after django.setup()
+"""
+
+import sys
+from itertools import islice
+
+from django.apps import apps
+from django.db import connection
+from rest_framework.authtoken.models import Token
+
+from core.models import Employee, InventoryItem, Product, User
+
+UNITS = ['pcs', 'kg', 'box', 'l']
+
+SEEDERS = {
+    'employees': lambda i: Employee(name=f'bench employee {i}', base_salary=3000 + i % 1000),
+    'inventory': lambda i: InventoryItem(name=f'bench item {i}', quantity=i % 500, unit=UNITS[i % len(UNITS)]),
+    'products': lambda i: Product(name=f'bench product {i}', description='', price=10 + i % 90),
+}
+MODELS = {'employees': Employee, 'inventory': InventoryItem, 'products': Product}
+PREFIX = 'bench'  # every row the benchmarks create is named with it
+
+
+def require_bench_database():
+    """Exit unless every core row in the database was created by the benchmarks."""
+    named = {User: 'username', **{model: 'name' for model in MODELS.values()}}
+    for model in apps.get_app_config('core').get_models():
+        rows = model.objects.all()
+        if model in named:
+            rows = rows.exclude(**{f'{named[model]}__startswith': PREFIX})
+        if rows.exists():
+            sys.exit(f'database {connection.settings_dict["NAME"]!r} holds {model._meta.verbose_name_plural} '
+                     'the benchmarks did not create; run them against an empty database '
+                     '(see django_backend/settings_bench.py)')
+
+
+def bench_token():
+    user, created = User.objects.get_or_create(username=PREFIX, defaults={'role': 'manager'})
+    if created:
+        user.set_unusable_password()
+        user.save()
+    return Token.objects.get_or_create(user=user)[0].key
+
+
+def seed(resource, rows, batch_size=5000, progress=None):
+    """Top the resource's table up to `rows` rows; returns the number of rows inserted."""
+    model = MODELS[resource]
+    existing = model.objects.count()
+    objs = (SEEDERS[resource](i) for i in range(existing, rows))
+    inserted = 0
+    while batch := list(islice(objs, batch_size)):
+        model.objects.bulk_create(batch)
+        inserted += len(batch)
+        if progress:
+            progress(resource, existing + inserted, rows)
+    return inserted
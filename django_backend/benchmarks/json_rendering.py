@@ -0,0 +1,108 @@
+"""
+Benchmarks Json_rendering.py - Purpose and Relationship
+
+Theoretical Understanding
+Measures only the JSON step of a list response: 10k rows of each core resource are serialized once
+with the ViewSet's serializer (outside the timing), then encoded with DRF's JSONRenderer and with
+ORJSONRenderer, and the bodies are decoded again with JSONParser and ORJSONParser. The rows are
+built in memory, so no database is needed. Before timing, both bodies are decoded and compared, so
+a speed-up never hides a difference in the output (floats, datetimes, unicode names).
+
+Usage (from django_backend/):
+
+    pip install orjson
+    python benchmarks/json_rendering.py --rows 10000 --repeat 20
+
+Relationship with Other Components
+- core/renderers.py:   ORJSONRenderer, ORJSONParser
+- core/serializers.py: the serializers whose output is encoded
+"""
+
+import argparse
+import io
+import json
+import os
+import sys
+import time
+from datetime import timedelta
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'django_backend.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.utils import timezone  # noqa: E402
+from rest_framework.parsers import JSONParser  # noqa: E402
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+
+from core import renderers  # noqa: E402
+from core.models import Employee, InventoryItem, Product  # noqa: E402
+from core.serializers import EmployeeSerializer, InventoryItemSerializer, ProductSerializer  # noqa: E402
+from loadgen import print_table  # noqa: E402
+
+NOW = timezone.now()
+BUILDERS = {
+    'employees': (EmployeeSerializer, lambda i: Employee(
+        id=i, name=f'Employé {i}', base_salary=3000 + i * 0.37, updated_at=NOW - timedelta(seconds=i),
+    )),
+    'inventory': (InventoryItemSerializer, lambda i: InventoryItem(
+        id=i, name=f'item {i}', quantity=i % 500, unit='pcs', last_updated=NOW - timedelta(microseconds=i * 977),
+    )),
+    'products': (ProductSerializer, lambda i: Product(
+        id=i, name=f'product {i}', price=round(9.99 + i / 7, 2), description='Ünïcode description ' * 3,
+        image_url=f'https://example.com/{i}.png', updated_at=NOW,
+    )),
+}
+
+
+def best_of(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return round(min(timings) * 1000, 2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--json', help='write the results to this file')
+    args = parser.parse_args()
+    if renderers.orjson is None:
+        print('orjson is not installed: ORJSONRenderer falls back to the stdlib path', file=sys.stderr)
+
+    stdlib_renderer, fast_renderer = JSONRenderer(), renderers.ORJSONRenderer()
+    stdlib_parser, fast_parser = JSONParser(), renderers.ORJSONParser()
+    results = []
+    for resource, (serializer_class, build) in BUILDERS.items():
+        data = serializer_class([build(i) for i in range(1, args.rows + 1)], many=True).data
+        body, fast_body = stdlib_renderer.render(data), fast_renderer.render(data)
+        if json.loads(body) != json.loads(fast_body):
+            raise SystemExit(f'{resource}: ORJSONRenderer output differs from JSONRenderer')
+        render_ms = best_of(lambda: stdlib_renderer.render(data), args.repeat)
+        fast_render_ms = best_of(lambda: fast_renderer.render(data), args.repeat)
+        parse_ms = best_of(lambda: stdlib_parser.parse(io.BytesIO(body)), args.repeat)
+        fast_parse_ms = best_of(lambda: fast_parser.parse(io.BytesIO(body)), args.repeat)
+        results.append({
+            'resource': resource, 'rows': args.rows, 'kb': len(body) // 1024,
+            'render_ms': render_ms, 'orjson_render_ms': fast_render_ms,
+            'render_speedup': round(render_ms / fast_render_ms, 1) if fast_render_ms else None,
+            'parse_ms': parse_ms, 'orjson_parse_ms': fast_parse_ms,
+            'parse_speedup': round(parse_ms / fast_parse_ms, 1) if fast_parse_ms else None,
+        })
+
+    print_table(results, ['resource', 'rows', 'kb', 'render_ms', 'orjson_render_ms', 'render_speedup',
+                          'parse_ms', 'orjson_parse_ms', 'parse_speedup'])
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
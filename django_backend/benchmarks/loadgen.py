@@ -0,0 +1,163 @@
+"""
+Benchmarks Loadgen.py - Purpose and Relationship
+
+Theoretical Understanding
+A small closed-loop HTTP load generator built on asyncio streams, so it needs no third-party client
+and one process can keep thousands of keep-alive connections busy. Each connection sends a request,
+waits for the full response, records the latency and sends the next one until the duration ends.
+Throughput is completed requests / duration; latency percentiles come from every recorded sample.
+
+Relationship with Other Components
+- asgi_vs_wsgi.py and the other benchmark scripts start a server and call run_load() against it
+- slow_clients simulates dashboards on slow networks that hold a connection open for a long time
+- server() starts a gunicorn/uvicorn command (optionally with its own environment) and waits until
+  its port accepts connections
+"""
+
+import asyncio
+import socket
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+
+def percentile(samples, q):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))]
+
+
+def summarize(latencies, errors, duration):
+    return {
+        'requests': len(latencies),
+        'errors': errors,
+        'rps': round(len(latencies) / duration, 1),
+        'p50_ms': round(percentile(latencies, 50) * 1000, 2),
+        'p95_ms': round(percentile(latencies, 95) * 1000, 2),
+        'p99_ms': round(percentile(latencies, 99) * 1000, 2),
+    }
+
+
+async def _read_response(reader):
+    head = await reader.readuntil(b'\r\n\r\n')
+    status = int(head.split(b' ', 2)[1])
+    length = None
+    for line in head.split(b'\r\n')[1:]:
+        name, _, value = line.partition(b':')
+        if name.strip().lower() == b'content-length':
+            length = int(value)
+    if length is None:
+        raise ConnectionError('response without Content-Length')
+    await reader.readexactly(length)
+    return status
+
+
+async def _connection(url, headers, deadline, latencies, counters):
+    parts = urlsplit(url)
+    target = parts.path + (f'?{parts.query}' if parts.query else '')
+    request = (
+        f'GET {target} HTTP/1.1\r\nHost: {parts.netloc}\r\nConnection: keep-alive\r\n'
+        + ''.join(f'{name}: {value}\r\n' for name, value in headers.items())
+        + '\r\n'
+    ).encode()
+    reader = writer = None
+    while time.perf_counter() < deadline:
+        try:
+            if writer is None:
+                reader, writer = await asyncio.open_connection(parts.hostname, parts.port)
+            started = time.perf_counter()
+            writer.write(request)
+            status = await _read_response(reader)
+            if status >= 400:
+                counters['errors'] += 1
+            else:
+                latencies.append(time.perf_counter() - started)
+        except (OSError, asyncio.IncompleteReadError, ConnectionError, ValueError):
+            counters['errors'] += 1
+            if writer is not None:
+                writer.close()
+            reader = writer = None
+            await asyncio.sleep(0.01)
+    if writer is not None:
+        writer.close()
+
+
+async def _slow_connection(url, deadline, interval):
+    """A client on a bad network: sends its request one byte every `interval` seconds."""
+    parts = urlsplit(url)
+    request = f'GET {parts.path} HTTP/1.1\r\nHost: {parts.netloc}\r\n\r\n'.encode()
+    while time.perf_counter() < deadline:
+        writer = None
+        try:
+            reader, writer = await asyncio.open_connection(parts.hostname, parts.port)
+            for index in range(len(request)):
+                writer.write(request[index:index + 1])
+                await asyncio.sleep(interval)
+                if time.perf_counter() >= deadline:
+                    break
+            else:
+                await _read_response(reader)
+        except (OSError, asyncio.IncompleteReadError, ConnectionError, ValueError):
+            await asyncio.sleep(interval)
+        finally:
+            if writer is not None:
+                writer.close()
+
+
+async def _run(url, concurrency, duration, headers, slow_clients=0, slow_interval=0.2):
+    latencies, counters = [], {'errors': 0}
+    deadline = time.perf_counter() + duration
+    await asyncio.gather(
+        *(_connection(url, headers, deadline, latencies, counters) for _ in range(concurrency)),
+        *(_slow_connection(url, deadline, slow_interval) for _ in range(slow_clients)),
+    )
+    return summarize(latencies, counters['errors'], duration)
+
+
+def run_load(url, concurrency=50, duration=10.0, headers=None, warmup=1.0, slow_clients=0):
+    """Drive url with `concurrency` keep-alive connections; returns rps and latency percentiles.
+
+    slow_clients adds connections that trickle their requests in; they are not measured, but
+    occupy a worker thread each on thread-per-request servers.
+    """
+    if warmup:
+        asyncio.run(_run(url, min(concurrency, 10), warmup, headers or {}))
+    return asyncio.run(_run(url, concurrency, duration, headers or {}, slow_clients))
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def wait_for_port(port, timeout=30.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with socket.create_connection(('127.0.0.1', port), timeout=0.5):
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f'server on port {port} did not start')
+
+
+@contextmanager
+def server(command, port, cwd, env=None):
+    process = subprocess.Popen(command, cwd=cwd, env=env, stdout=subprocess.DEVNULL, stderr=sys.stderr)
+    try:
+        wait_for_port(port)
+        yield process
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+
+
+def print_table(rows, columns):
+    widths = {column: max(len(column), *(len(str(row.get(column, ''))) for row in rows)) for column in columns}
+    print('  '.join(column.ljust(widths[column]) for column in columns))
+    for row in rows:
+        print('  '.join(str(row.get(column, '')).ljust(widths[column]) for column in columns))
@@ -0,0 +1,168 @@
+"""
+Benchmarks Logins.py - Purpose and Relationship
+
+Theoretical Understanding
+Login throughput is bounded by password hashing: each login recomputes one slow hash, so one core
+serves at most 1 / (hash time) logins per second. For each password hasher this benchmark reports:
+
+- hash_ms:        one check_password() on one thread, i.e. the CPU cost of a login
+- per_core:       1000 / hash_ms, the ceiling for one core
+- logins_s:       authenticate() throughput through the login pool (core/passwords.py) with
+                  --concurrency callers, including the user lookup
+- logins_s_core:  logins_s divided by the cores the pool can use (min(workers, CPUs))
+- p50/p95:        authenticate() latency under that load, including time queued for a worker
+- busy:           logins refused with LoginBusy (pool and queue full), i.e. 503s at /api/login/
+- queries:        database queries for one POST /api/login/ that reuses an existing token
+
+Each hasher is measured with its own settings.PASSWORD_HASHERS (override_settings), so the stored
+hash is already in the preferred format and no login pays for a rehash.
+
+Usage (from django_backend/, against the benchmark database, see django_backend/settings_bench.py):
+
+    python benchmarks/logins.py --logins 200 --concurrency 32
+    python benchmarks/logins.py --hashers scrypt argon2 --workers 4 --queue 0
+
+Relationship with Other Components
+- core/passwords.py: PooledModelBackend, HashPool, LoginBusy
+- core/views.py:     LoginView (queries per login)
+- loadgen.py:        percentile summary and table output
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'django_backend.settings_bench')
+os.environ.setdefault('CORE_THROTTLE', '0')  # the login budget would refuse most of the run
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.contrib.auth import authenticate  # noqa: E402
+from django.contrib.auth.hashers import check_password, make_password  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.test import Client, override_settings  # noqa: E402
+from django.test.utils import CaptureQueriesContext  # noqa: E402
+from rest_framework.authtoken.models import Token  # noqa: E402
+
+from core import passwords  # noqa: E402
+from core.models import User  # noqa: E402
+from core.passwords import HashPool, LoginBusy  # noqa: E402
+from datasets import require_bench_database  # noqa: E402
+from loadgen import percentile, print_table  # noqa: E402
+
+HASHERS = {
+    'pbkdf2': 'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+    'scrypt': 'django.contrib.auth.hashers.ScryptPasswordHasher',
+    'argon2': 'django.contrib.auth.hashers.Argon2PasswordHasher',
+}
+PASSWORD = 'bench-login-password'
+COLUMNS = ['hasher', 'hash_ms', 'per_core', 'logins_s', 'logins_s_core', 'p50_ms', 'p95_ms', 'busy', 'queries']
+
+
+def login_user(name):
+    user, _ = User.objects.get_or_create(username=f'bench-login-{name}')
+    user.password = make_password(PASSWORD)  # with the hasher under test (PASSWORD_HASHERS[0])
+    user.save(update_fields=['password'])
+    Token.objects.get_or_create(user=user)
+    return user
+
+
+def hash_ms(encoded, rounds):
+    samples = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        check_password(PASSWORD, encoded)
+        samples.append(time.perf_counter() - started)
+    return percentile(samples, 50) * 1000
+
+
+def pool_throughput(username, logins, concurrency):
+    latencies, busy = [], 0
+
+    def login(_):
+        started = time.perf_counter()
+        try:
+            user = authenticate(None, username=username, password=PASSWORD)
+        except LoginBusy:
+            return None
+        finally:
+            connection.close()  # each caller thread has its own connection
+        assert user is not None
+        return time.perf_counter() - started
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as callers:
+        for latency in callers.map(login, range(logins)):
+            if latency is None:
+                busy += 1
+            else:
+                latencies.append(latency)
+    return latencies, busy, time.perf_counter() - started
+
+
+def login_queries(username):
+    if 'testserver' not in settings.ALLOWED_HOSTS and '*' not in settings.ALLOWED_HOSTS:
+        settings.ALLOWED_HOSTS = [*settings.ALLOWED_HOSTS, 'testserver']
+    client = Client()
+    with CaptureQueriesContext(connection) as captured:
+        response = client.post('/api/login/', {'username': username, 'password': PASSWORD},
+                               content_type='application/json')
+    assert response.status_code == 200, response.content
+    return len(captured)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--hashers', nargs='+', choices=list(HASHERS), default=list(HASHERS))
+    parser.add_argument('--rounds', type=int, default=10, help='single-thread checks per hasher')
+    parser.add_argument('--logins', type=int, default=100, help='logins through the pool per hasher')
+    parser.add_argument('--concurrency', type=int, default=32, help='threads calling authenticate()')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='hashing threads in the pool')
+    parser.add_argument('--queue', type=int, default=64, help='logins allowed to wait for a worker')
+    parser.add_argument('--queue-timeout', type=float, default=2.0)
+    parser.add_argument('--json', help='write the results to this file')
+    args = parser.parse_args()
+    require_bench_database()
+
+    cores = min(args.workers, os.cpu_count() or 1)
+    results = []
+    for name in args.hashers:
+        if name == 'argon2' and importlib.util.find_spec('argon2') is None:
+            print(f'{name}: skipped (needs argon2-cffi)', file=sys.stderr)
+            continue
+        preferred = [HASHERS[name]] + [path for other, path in HASHERS.items() if other != name]
+        with override_settings(PASSWORD_HASHERS=preferred):
+            user = login_user(name)
+            single = hash_ms(user.password, args.rounds)
+            passwords._pool = HashPool(args.workers, args.queue, args.queue_timeout)
+            latencies, busy, duration = pool_throughput(user.username, args.logins, args.concurrency)
+            queries = login_queries(user.username)
+        rate = len(latencies) / duration
+        results.append({
+            'hasher': name, 'hash_ms': round(single, 2), 'per_core': round(1000 / single, 1),
+            'logins_s': round(rate, 1), 'logins_s_core': round(rate / cores, 1),
+            'p50_ms': round(percentile(latencies, 50) * 1000, 2),
+            'p95_ms': round(percentile(latencies, 95) * 1000, 2), 'busy': busy, 'queries': queries,
+        })
+        print(f'{name}: {results[-1]}', file=sys.stderr)
+
+    print(f'{os.cpu_count()} CPUs, pool of {args.workers} workers + {args.queue} queued, '
+          f'{args.concurrency} callers, {connection.vendor}')
+    print_table(results, COLUMNS)
+    if args.json:
+        Path(args.json).write_text(json.dumps({'workers': args.workers, 'cores': cores, 'results': results}, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+"""
+Benchmarks Serializers.py - Purpose and Relationship
+
+Theoretical Understanding
+Measures what a list response costs between the database and the renderer, for one page of rows,
+in four variants per resource:
+
+- full:        model instances + ModelSerializer(many=True), all fields (the previous list path)
+- sparse:      .only(<fields>) instances + the serializer trimmed to the same fields
+- lean:        values() rows + LeanRows (fieldsets.py), all fields (the list path now)
+- lean_sparse: values(<fields>) rows + LeanRows for the selected fields
+
+Each variant times the query and the conversion together (ms per page, best of --repeat), and
+reports rows/s and the size of the JSON it would send. The selected fields per resource are the ones
+a table view typically shows (SPARSE below). Every variant's output is checked against the
+serializer's before it is timed.
+
+Usage (from django_backend/, against the benchmark database, see django_backend/settings_bench.py):
+
+    python benchmarks/serializers.py --rows 20000 --page-size 1000
+    python benchmarks/serializers.py --no-seed --resources products --repeat 20
+
+Relationship with Other Components
+- core/fieldsets.py, core/serializers.py: the code under test
+- datasets.py: synthetic rows
+- loadgen.py:  table output
+- api_suite.py runs the same fieldsets end to end (the *_sparse scenarios)
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'django_backend.settings_bench')
+
+import django  # noqa: E402
+
+django.setup()
+
+from core.fieldsets import lean_rows, readable_fields  # noqa: E402
+from core.renderers import ORJSONRenderer  # noqa: E402
+from core.serializers import EmployeeSerializer, InventoryItemSerializer, ProductSerializer  # noqa: E402
+from datasets import MODELS, require_bench_database, seed  # noqa: E402
+from loadgen import print_table  # noqa: E402
+
+SERIALIZERS = {'employees': EmployeeSerializer, 'inventory': InventoryItemSerializer, 'products': ProductSerializer}
+SPARSE = {
+    'employees': ('id', 'name', 'base_salary'),
+    'inventory': ('id', 'name', 'quantity', 'unit'),
+    'products': ('id', 'name', 'price'),
+}
+COLUMNS = ['resource', 'variant', 'ms_per_page', 'rows_per_s', 'speedup', 'json_kb']
+
+
+def variants(resource, page_size):
+    serializer_class, model = SERIALIZERS[resource], MODELS[resource]
+    queryset = model.objects.order_by('-id')
+    fields, sparse = readable_fields(serializer_class), SPARSE[resource]
+    lean, lean_sparse = lean_rows(serializer_class, fields), lean_rows(serializer_class, sparse)
+    return {
+        'full': lambda: serializer_class(list(queryset[:page_size]), many=True).data,
+        'sparse': lambda: serializer_class(list(queryset.only(*sparse)[:page_size]), many=True, fields=sparse).data,
+        'lean': lambda: lean(queryset.values(*lean.columns)[:page_size]),
+        'lean_sparse': lambda: lean_sparse(queryset.values(*lean_sparse.columns)[:page_size]),
+    }
+
+
+def best_ms(build, repeat):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        build()
+        samples.append(time.perf_counter() - started)
+    return min(samples) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--resources', nargs='+', choices=list(SERIALIZERS), default=list(SERIALIZERS))
+    parser.add_argument('--rows', type=int, default=20_000, help='rows to seed per resource')
+    parser.add_argument('--no-seed', action='store_true', help='use the tables as they are')
+    parser.add_argument('--page-size', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=10)
+    parser.add_argument('--json', help='write the results to this file')
+    args = parser.parse_args()
+    require_bench_database()
+
+    renderer = ORJSONRenderer()
+    results = []
+    for resource in args.resources:
+        if not args.no_seed:
+            seed(resource, args.rows)
+        builds = variants(resource, args.page_size)
+        expected = {name: json.loads(renderer.render(build())) for name, build in builds.items()}
+        if expected['lean'] != expected['full'] or expected['lean_sparse'] != expected['sparse']:
+            sys.exit(f'{resource}: lean output differs from the serializer output')
+        baseline = None
+        for name, build in builds.items():
+            ms = best_ms(build, args.repeat)
+            baseline = baseline or ms
+            rows = len(expected[name])
+            results.append({
+                'resource': resource, 'variant': name, 'ms_per_page': round(ms, 2),
+                'rows_per_s': round(rows / ms * 1000), 'speedup': f'{baseline / ms:.1f}x',
+                'json_kb': round(len(renderer.render(build())) / 1024, 1),
+            })
+            print(f'{resource} {name}: {results[-1]}', file=sys.stderr)
+
+    print(f'page size {args.page_size}, best of {args.repeat}')
+    print_table(results, COLUMNS)
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
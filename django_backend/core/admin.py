@@ -9,6 +9,9 @@ Current registered models:
 - Employee: Employee records management
 - InventoryItem: Inventory tracking
 - Product: Product catalog management
+- AttendanceEvent: Clock-in/clock-out events
+- PayrollRun: Computed payroll runs
+- Job: Background job queue
 
 How to extend this configuration:
 1. Basic Registration:
@@ -37,7 +40,7 @@ How to extend this configuration:
 """
 
 from django.contrib import admin
-from .models import User, Employee, InventoryItem, Product
+from .models import User, Employee, InventoryItem, Product, AttendanceEvent, PayrollRun, Job, StockMovement
 
 
 # Register your models here.
@@ -45,3 +48,7 @@ admin.site.register(User)
 admin.site.register(Employee)
 admin.site.register(InventoryItem)
 admin.site.register(Product)
+admin.site.register(AttendanceEvent)
+admin.site.register(PayrollRun)
+admin.site.register(Job)
+admin.site.register(StockMovement)
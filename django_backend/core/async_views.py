@@ -0,0 +1,339 @@
+"""
+Django Async_views.py - Purpose and Relationship
+
+Theoretical Understanding
+DRF views are synchronous: under ASGI every request to a ViewSet runs in a worker thread, and a slow
+or long-polling client keeps that thread busy for the whole request. The async_views.py file serves
+the read paths (list and retrieve) of the main resources as native async Django views. Database
+access uses the async ORM (`aiterator`, `aget`) and the token lookup uses the async cache API, so
+while a request waits on the database or a slow client, the event loop serves other requests. One
+ASGI process can therefore hold thousands of open connections:
+
+    uvicorn django_backend.asgi:application --workers 4
+
+The views reuse the configuration of the matching ViewSet (queryset, serializer, permissions,
+filters, page size), so both paths return the same JSON and cursors:
+- list:     keyset pagination on -id with the same ?cursor= / ?page_size= as CoreCursorPagination,
+            ?<field>__<lookup>= filters (FieldFilterBackend) and ?search=
+- retrieve: one row by primary key
+- both:     ?fields= / ?exclude= sparse fieldsets, and lists built from values() (fieldsets.py)
+Responses are cached and validated (ETag / Last-Modified, 304) like CachedResponseMixin does for the
+ViewSets, using the async cache API and `aaggregate`.
+
+Relationship with Other Components
+1. Views (views.py)
+- AsyncReadView.viewset points at EmployeeViewSet, InventoryItemViewSet, ProductViewSet or
+  UserViewSet; writes, ?ordering=, exports and the /changes/ feed stay on those ViewSets
+
+2. Authentication (authentication.py)
+- "Authorization: Token <key>" is checked against the same token cache as CachedTokenAuthentication;
+  requests without a token fall back to the session user
+
+3. URLs (urls.py)
+- /api/async/employees/, /api/async/inventory/, /api/async/products/, /api/async/users/ (+ <id>/)
+
+4. Live updates (live.py)
+- InventoryStreamView: GET /api/inventory/stream/ pushes InventoryItem deltas as server-sent events
+
+5. Benchmarks
+- benchmarks/asgi_vs_wsgi.py compares this path under uvicorn with the ViewSets under gunicorn
+"""
+
+import asyncio
+import json
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Max
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date
+from django.views import View
+from rest_framework import exceptions, filters
+from rest_framework.authtoken.models import Token
+from rest_framework.pagination import Cursor
+from rest_framework.request import Request
+
+from .authentication import token_cache_key
+from .caching import CachedResponseMixin, aget_generation, response_cache_key, response_etag, version_from_stats
+from .fieldsets import SparseFieldsMixin, lean_rows, parse_fieldset, query_columns, readable_fields
+from .filters import FieldFilterBackend
+from .live import hub, live_enabled
+from .renderers import ORJSONRenderer
+from .views import EmployeeViewSet, InventoryItemViewSet, ProductViewSet, UserViewSet
+
+
+def json_response(data, status=200, **headers):
+    response = HttpResponse(ORJSONRenderer().render(data), content_type='application/json', status=status)
+    for name, value in headers.items():
+        response[name] = value
+    return response
+
+
+async def atoken_user(key):
+    cache_key = token_cache_key(key)
+    token = await cache.aget(cache_key)
+    if token is None:
+        try:
+            token = await Token.objects.select_related('user').aget(key=key)
+        except Token.DoesNotExist:
+            raise exceptions.AuthenticationFailed('Invalid token.')
+        await cache.aset(cache_key, token, getattr(settings, 'CORE_TOKEN_CACHE_TTL', 300))
+    if not token.user.is_active:
+        raise exceptions.AuthenticationFailed('User inactive or deleted.')
+    return token.user, token
+
+
+async def aauthenticate(request):
+    """Return (user, token) for a Token header (via the token cache), or (user, None) for the session."""
+    header = request.headers.get('Authorization', '').split()
+    if not header or header[0].lower() != 'token':
+        return await request.auser(), None
+    if len(header) != 2:
+        raise exceptions.AuthenticationFailed('Invalid token header.')
+    return await atoken_user(header[1])
+
+
+def authenticated_request(request, user, auth):
+    """A DRF Request for a client authenticated above.
+
+    Without authenticators, reading request.user or request.auth (throttles read both) cannot run
+    DRF's authentication again, which would replace the user with AnonymousUser.
+    """
+    drf_request = Request(request, authenticators=())
+    drf_request._user, drf_request._auth = user, auth
+    return drf_request
+
+
+class AsyncReadView(View):
+    viewset = None
+    http_method_names = ['get', 'head']
+
+    @property
+    def filter_fields(self):
+        return getattr(self.viewset, 'filter_fields', {})
+
+    @property
+    def search_fields(self):
+        return getattr(self.viewset, 'search_fields', None)
+
+    async def get(self, request, pk=None):
+        try:
+            user, auth = await aauthenticate(request)
+        except exceptions.AuthenticationFailed as exc:
+            return json_response({'detail': exc.detail}, status=401, **{'WWW-Authenticate': 'Token'})
+        drf_request = authenticated_request(request, user, auth)
+        denied = self.check_permissions(drf_request) or await sync_to_async(self.check_throttles)(drf_request)
+        if denied is not None:
+            return denied
+        build = self.list if pk is None else self.retrieve
+        try:
+            if issubclass(self.viewset, CachedResponseMixin):
+                return await self.cached_response(drf_request, build, pk)
+            return json_response(await build(drf_request, pk))
+        except exceptions.APIException as exc:
+            detail = {'detail': exc.detail} if isinstance(exc.detail, str) else exc.detail
+            return json_response(detail, status=exc.status_code)
+
+    async def cached_response(self, request, build, pk):
+        """CachedResponseMixin.cached_response() with async cache and aggregate calls."""
+        model = self.viewset.queryset.model
+        version, changed = await aget_generation(model)
+        updated_field = self.viewset.updated_field
+        if updated_field is None:
+            version = str(version)
+        else:
+            queryset = self.viewset.queryset.filter(pk=pk) if pk is not None else self.get_queryset(request)
+            stats = await queryset.aaggregate(latest=Max(updated_field), count=Count('pk'))
+            version, changed = version_from_stats(stats, changed, pk is not None)
+        action = 'async-list' if pk is None else 'async-retrieve'
+        key = response_cache_key(model, version, action, pk or '', request.user, request.query_params)
+        etag = response_etag(key)
+        response = get_conditional_response(request._request, etag=etag, last_modified=int(changed))
+        if response is None:
+            data = await cache.aget(key)
+            if data is None:
+                data = await build(request, pk)
+                await cache.aset(key, data, self.viewset.response_cache_ttl)
+            response = json_response(data)
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(changed)
+        patch_vary_headers(response, ['Authorization'])
+        return response
+
+    def check_permissions(self, request):
+        for permission in self.viewset.permission_classes:
+            if not permission().has_permission(request, self):
+                if not request.user.is_authenticated:
+                    return json_response(
+                        {'detail': 'Authentication credentials were not provided.'},
+                        status=401, **{'WWW-Authenticate': 'Token'},
+                    )
+                return json_response({'detail': 'You do not have permission to perform this action.'}, status=403)
+        return None
+
+    def check_throttles(self, request):
+        waits = [throttle.wait() for throttle in self.viewset().get_throttles()
+                 if not throttle.allow_request(request, self)]
+        if waits:
+            retry = max((wait for wait in waits if wait is not None), default=None)
+            headers = {'Retry-After': str(int(retry))} if retry else {}
+            return json_response({'detail': 'Request was throttled.'}, status=429, **headers)
+        return None
+
+    def get_fieldset(self, request):
+        if issubclass(self.viewset, SparseFieldsMixin):
+            return parse_fieldset(request.query_params, self.viewset.serializer_class)
+        return None
+
+    def get_queryset(self, request):
+        queryset = self.viewset.queryset.all()
+        for backend in (FieldFilterBackend, filters.SearchFilter):
+            queryset = backend().filter_queryset(request, queryset, self)
+        return queryset
+
+    async def retrieve(self, request, pk):
+        serializer_class, queryset = self.viewset.serializer_class, self.viewset.queryset
+        fieldset = self.get_fieldset(request)
+        kwargs = {}
+        if fieldset is not None:
+            queryset = queryset.only(*query_columns(queryset.model, fieldset, serializer_class))
+            kwargs['fields'] = fieldset
+        try:
+            instance = await queryset.aget(pk=pk)
+        except (queryset.model.DoesNotExist, ValueError):
+            raise exceptions.NotFound(f'No {queryset.model._meta.object_name} matches the given query.')
+        return serializer_class(instance, **kwargs).data
+
+    async def list(self, request, pk=None):
+        paginator = self.viewset.pagination_class()
+        paginator.base_url = request.build_absolute_uri()
+        page_size = paginator.get_page_size(request)
+        cursor = paginator.decode_cursor(request)
+        offset, reverse, position = cursor if cursor is not None else (0, False, None)
+        try:
+            position = int(position) if position is not None else None
+        except ValueError:
+            raise exceptions.NotFound(paginator.invalid_cursor_message)
+
+        queryset = self.get_queryset(request)
+        if reverse:
+            if position is not None:
+                queryset = queryset.filter(pk__gt=position)
+            queryset = queryset.order_by('pk')
+        else:
+            if position is not None:
+                queryset = queryset.filter(pk__lt=position)
+            queryset = queryset.order_by('-pk')
+
+        # Lean path (fieldsets.py): dicts straight from values(), same output as the serializer
+        serializer_class, pk_name = self.viewset.serializer_class, queryset.model._meta.pk.name
+        fieldset = self.get_fieldset(request)
+        lean = None
+        if issubclass(self.viewset, SparseFieldsMixin) and self.viewset.lean_list:
+            lean = lean_rows(serializer_class, readable_fields(serializer_class) if fieldset is None else fieldset)
+        if lean is not None:
+            queryset = queryset.values(*{*lean.columns, pk_name})
+        elif fieldset is not None:
+            queryset = queryset.only(*query_columns(queryset.model, fieldset, serializer_class))
+        rows = [row async for row in queryset[offset:offset + page_size + 1].aiterator(chunk_size=page_size + 1)]
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        if reverse:
+            rows.reverse()
+            has_next, has_previous = position is not None, has_more
+        else:
+            has_next, has_previous = has_more, position is not None
+
+        def position(row):
+            return row[pk_name] if lean is not None else row.pk
+
+        next_url = previous_url = None
+        if rows and has_next:
+            next_url = paginator.encode_cursor(Cursor(offset=0, reverse=False, position=position(rows[-1])))
+        if rows and has_previous:
+            previous_url = paginator.encode_cursor(Cursor(offset=0, reverse=True, position=position(rows[0])))
+        if lean is not None:
+            results = lean(rows)
+        else:
+            kwargs = {'fields': fieldset} if fieldset is not None else {}
+            results = serializer_class(rows, many=True, **kwargs).data
+        return {'next': next_url, 'previous': previous_url, 'results': results}
+
+
+class InventoryStreamView(AsyncReadView):
+    """Server-sent events with InventoryItem deltas (see live.py)."""
+    viewset = InventoryItemViewSet
+    max_ids = 1000
+
+    async def get(self, request):
+        if not live_enabled():
+            return json_response({'detail': 'Live updates are disabled.'}, status=404)
+        if not isinstance(request, ASGIRequest):
+            return json_response({'detail': 'The live stream needs an ASGI server.'}, status=501)
+        try:
+            # EventSource cannot set headers, so browsers may pass ?token= instead
+            token = request.GET.get('token')
+            user, auth = await (atoken_user(token) if token else aauthenticate(request))
+        except exceptions.AuthenticationFailed as exc:
+            return json_response({'detail': exc.detail}, status=401, **{'WWW-Authenticate': 'Token'})
+        drf_request = authenticated_request(request, user, auth)
+        denied = self.check_permissions(drf_request)
+        if denied is not None:
+            return denied
+        ids = None
+        if request.GET.get('ids'):
+            try:
+                ids = {int(value) for value in request.GET['ids'].split(',')}
+            except ValueError:
+                return json_response({'ids': ['Expected comma-separated item ids.']}, status=400)
+            if len(ids) > self.max_ids:
+                return json_response({'ids': [f'At most {self.max_ids} ids per stream.']}, status=400)
+        response = StreamingHttpResponse(self.events(ids), content_type='text/event-stream')
+        response['Cache-Control'] = 'no-cache'
+        response['X-Accel-Buffering'] = 'no'
+        return response
+
+    async def events(self, ids):
+        coalesce = getattr(settings, 'CORE_LIVE_COALESCE_MS', 250) / 1000
+        heartbeat = getattr(settings, 'CORE_LIVE_HEARTBEAT', 15)
+        subscription = hub.subscribe(ids)
+        try:
+            yield sse_event('ready', {'ids': sorted(ids) if ids is not None else None}, retry=3000)
+            while True:
+                try:
+                    await asyncio.wait_for(subscription.wakeup.wait(), heartbeat)
+                except asyncio.TimeoutError:
+                    yield ': keepalive\n\n'
+                    continue
+                await asyncio.sleep(coalesce)
+                events, reset = subscription.drain()
+                if reset:
+                    yield sse_event('reset', {})
+                if events:
+                    yield sse_event('inventory', events)
+        finally:
+            hub.unsubscribe(subscription)
+
+
+def sse_event(name, data, retry=None):
+    prefix = f'retry: {retry}\n' if retry else ''
+    return f'{prefix}event: {name}\ndata: {json.dumps(data, default=str)}\n\n'
+
+
+class AsyncEmployeeView(AsyncReadView):
+    viewset = EmployeeViewSet
+
+
+class AsyncInventoryItemView(AsyncReadView):
+    viewset = InventoryItemViewSet
+
+
+class AsyncProductView(AsyncReadView):
+    viewset = ProductViewSet
+
+
+class AsyncUserView(AsyncReadView):
+    viewset = UserViewSet
@@ -0,0 +1,76 @@
+"""
+Django Attendance.py - Purpose and Relationship
+
+Theoretical Understanding
+At shift change, badge readers send bursts of thousands of clock events per minute. The attendance.py
+file ingests them in batches with a fixed number of queries per batch:
+1. validate every row in memory (AttendanceIngestSerializer, no database access)
+2. one query to check that the referenced employees exist
+3. one query to find idempotency keys that were already stored
+4. one bulk INSERT (ON CONFLICT DO NOTHING) for the new events, in a single transaction
+
+Devices retry failed uploads with the same idempotency keys, so an event is stored at most once.
+Keys repeated inside one batch are collapsed, and the unique constraint on idempotency_key (with
+ignore_conflicts) covers two batches racing each other.
+
+Relationship with Other Components
+1. Views (views.py)
+- AttendanceEventViewSet.ingest exposes POST /attendance/ingest/
+
+2. Models (models.py)
+- AttendanceEvent, indexed on (employee, timestamp) for per-employee range queries
+
+3. Payroll and Rollups (payroll.py, rollups.py)
+- paired_intervals() turns sorted clock events into worked intervals with array operations
+"""
+
+import numpy as np
+from django.db import transaction
+
+from .models import AttendanceEvent, Employee
+from .serializers import AttendanceIngestSerializer
+
+
+def paired_intervals(event_employees, event_is_in, event_seconds):
+    """Match each clock-in with the employee's next event when that event is a clock-out.
+
+    The event arrays must be sorted by (employee, timestamp). Returns (indices of the clock-in
+    events that start an interval, interval lengths in hours).
+    """
+    if len(event_employees) < 2:
+        return np.zeros(0, dtype=np.int64), np.zeros(0)
+    pairs = (
+        event_is_in[:-1]
+        & ~event_is_in[1:]
+        & (event_employees[:-1] == event_employees[1:])
+    )
+    starts = np.flatnonzero(pairs)
+    return starts, (event_seconds[starts + 1] - event_seconds[starts]) / 3600.0
+
+
+def ingest_events(rows, batch_size=1000):
+    """Store a batch of raw event dicts and return a summary dict."""
+    serializer = AttendanceIngestSerializer(data=rows, many=True)
+    valid, errors = serializer.partition(rows)
+
+    employee_ids = {data['employee_id'] for _, data in valid}
+    known = set(Employee.objects.filter(id__in=employee_ids).values_list('id', flat=True))
+    keys = {data['idempotency_key'] for _, data in valid}
+    existing = set(
+        AttendanceEvent.objects.filter(idempotency_key__in=keys).values_list('idempotency_key', flat=True)
+    )
+
+    events, duplicates = {}, 0
+    for index, data in valid:
+        key = data['idempotency_key']
+        if data['employee_id'] not in known:
+            errors.append({'index': index, 'errors': {'employee_id': ['Employee not found.']}})
+        elif key in existing or key in events:
+            duplicates += 1
+        else:
+            events[key] = AttendanceEvent(**data)
+
+    with transaction.atomic():
+        AttendanceEvent.objects.bulk_create(events.values(), batch_size=batch_size, ignore_conflicts=True)
+    errors.sort(key=lambda error: error['index'])
+    return {'accepted': len(events), 'duplicates': duplicates, 'errors': errors}
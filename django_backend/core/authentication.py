@@ -0,0 +1,52 @@
+"""
+Django Authentication.py - Purpose and Relationship
+
+Theoretical Understanding
+DRF's TokenAuthentication runs a `Token JOIN User` query on every authenticated request. The
+CachedTokenAuthentication class below keeps the resolved token (with its user attached) in Django's
+cache framework for a short TTL, so repeated calls with the same token cost no queries. Permission
+checks such as IsManager read `request.user.role` from the cached user and also cost no queries.
+
+Relationship with Other Components
+1. Views (views.py)
+- LogoutView calls invalidate_token() before deleting the token
+
+2. Signals (signals.py)
+- A User save that changes the password, is_active, role or staff flags (a role change, a
+  deactivation) drops that user's cached tokens once the transaction commits
+- Deleting a Token (logout, admin) drops its cache entry
+
+3. Settings (settings.py)
+- REST_FRAMEWORK['DEFAULT_AUTHENTICATION_CLASSES'] enables the class
+- CORE_TOKEN_CACHE_TTL sets how long a lookup is cached (seconds)
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+
+
+def token_cache_key(key):
+    return f'core:auth-token:{key}'
+
+
+def invalidate_token(key):
+    cache.delete(token_cache_key(key))
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    def authenticate_credentials(self, key):
+        cache_key = token_cache_key(key)
+        token = cache.get(cache_key)
+        if token is None:
+            model = self.get_model()
+            try:
+                token = model.objects.select_related('user').get(key=key)
+            except model.DoesNotExist:
+                raise exceptions.AuthenticationFailed(_('Invalid token.'))
+            cache.set(cache_key, token, getattr(settings, 'CORE_TOKEN_CACHE_TTL', 300))
+        if not token.user.is_active:
+            raise exceptions.AuthenticationFailed(_('User inactive or deleted.'))
+        return (token.user, token)
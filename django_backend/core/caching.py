@@ -0,0 +1,153 @@
+"""
+Django Caching.py - Purpose and Relationship
+
+Theoretical Understanding
+Reads far outnumber writes on the catalogue endpoints, so list and detail responses are cached in
+Django's cache framework. Instead of deleting entries when data changes, every model has a
+*generation* counter that is part of each cache key. Any write to the model bumps its generation
+(after the transaction commits), so entries built from old data are never looked up again and simply
+expire on their own.
+
+The cache keys and the ETag/Last-Modified validators also include a *version* read from the
+database with one cheap, index-backed aggregate over the ViewSet's `updated_field`:
+- list:     Max(updated_field) and Count('pk') over the filtered queryset
+- retrieve: the row's own updated_field value
+When a ViewSet has an `updated_field` the database version replaces the generation in the key:
+the generation lives in the cache, which may be per-process (LocMemCache), while the database
+version is the same for every worker. A client that sends a matching If-None-Match /
+If-Modified-Since gets a 304 after that single aggregate, with no serialization.
+
+Relationship with Other Components
+1. Views (views.py)
+- CachedResponseMixin wraps list() and retrieve() of the Employee, InventoryItem and Product ViewSets
+- Each ViewSet names its timestamp column with `updated_field`
+
+2. Signals (signals.py)
+- post_save/post_delete on Employee, InventoryItem and Product call bump_generation()
+- Bulk writes (bulk_create/bulk_update, CSV import) call bump_generation() directly,
+  because Django sends no signals for them
+
+3. Settings (settings.py)
+- CORE_RESPONSE_CACHE_TTL sets how long a cached response lives (seconds)
+"""
+
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date
+from rest_framework.response import Response
+
+
+def _generation_keys(model):
+    label = model._meta.label_lower
+    return f'core:gen:{label}', f'core:gen-time:{label}'
+
+
+def get_generation(model):
+    """Return (generation, last_changed_timestamp) for a model."""
+    gen_key, time_key = _generation_keys(model)
+    values = cache.get_many([gen_key, time_key])
+    if gen_key not in values:
+        now = time.time()
+        cache.add(gen_key, int(now * 1000), None)
+        cache.add(time_key, now, None)
+        values = cache.get_many([gen_key, time_key])
+    return values.get(gen_key), values.get(time_key, time.time())
+
+
+async def aget_generation(model):
+    """get_generation() for async views, using the async cache API."""
+    gen_key, time_key = _generation_keys(model)
+    values = await cache.aget_many([gen_key, time_key])
+    if gen_key not in values:
+        now = time.time()
+        await cache.aadd(gen_key, int(now * 1000), None)
+        await cache.aadd(time_key, now, None)
+        values = await cache.aget_many([gen_key, time_key])
+    return values.get(gen_key), values.get(time_key, time.time())
+
+
+def version_from_stats(stats, changed, detail):
+    """Turn the Max(updated_field)/Count aggregate into (version string, last-modified timestamp)."""
+    latest = stats['latest'].timestamp() if stats['latest'] else 0
+    changed = (latest or changed) if detail else max(latest, changed)
+    return f"{stats['count']}.{latest}", changed
+
+
+def response_cache_key(model, version, action, lookup, user, query_params):
+    role = getattr(user, 'role', 'user') if user.is_authenticated else 'anonymous'
+    query = '&'.join(f'{k}={v}' for k, values in sorted(query_params.lists()) for v in values)
+    return ':'.join(['core:resp', model._meta.label_lower, version, action, str(lookup), role, query])
+
+
+def response_etag(key):
+    return '"%s"' % hashlib.md5(key.encode()).hexdigest()
+
+
+def _bump(model):
+    gen_key, time_key = _generation_keys(model)
+    now = time.time()
+    try:
+        cache.incr(gen_key)
+    except ValueError:
+        cache.set(gen_key, int(now * 1000), None)
+    cache.set(time_key, now, None)
+
+
+def bump_generation(model):
+    """Invalidate every cached response for model once the current transaction commits."""
+    transaction.on_commit(lambda: _bump(model))
+
+
+class CachedResponseMixin:
+    response_cache_ttl = getattr(settings, 'CORE_RESPONSE_CACHE_TTL', 60)
+    updated_field = None
+
+    def get_version(self, request, **kwargs):
+        """Return (version string, last-modified timestamp) for the requested list or row."""
+        generation, changed = get_generation(self.queryset.model)
+        if self.updated_field is None:
+            return str(generation), changed
+        if self.action == 'retrieve':
+            lookup = self.lookup_url_kwarg or self.lookup_field
+            queryset = self.get_queryset().filter(**{self.lookup_field: kwargs[lookup]})
+        else:
+            queryset = self.filter_queryset(self.get_queryset())
+        stats = queryset.aggregate(latest=Max(self.updated_field), count=Count('pk'))
+        return version_from_stats(stats, changed, self.action == 'retrieve')
+
+    def response_cache_key(self, request, version, **kwargs):
+        lookup = kwargs.get(self.lookup_url_kwarg or self.lookup_field, '')
+        return response_cache_key(
+            self.queryset.model, version, self.action, lookup, request.user, request.query_params
+        )
+
+    def cached_response(self, request, build, *args, **kwargs):
+        version, changed = self.get_version(request, **kwargs)
+        key = self.response_cache_key(request, version, **kwargs)
+        etag = response_etag(key)
+        response = get_conditional_response(request._request, etag=etag, last_modified=int(changed))
+        if response is None:
+            data = cache.get(key)
+            if data is None:
+                response = build(request, *args, **kwargs)
+                if response.status_code != 200:
+                    return response
+                cache.set(key, response.data, self.response_cache_ttl)
+            else:
+                response = Response(data)
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(changed)
+        patch_vary_headers(response, ['Authorization'])
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(request, super().list, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(request, super().retrieve, *args, **kwargs)
@@ -0,0 +1,99 @@
+"""
+Django Exports.py - Purpose and Relationship
+
+Theoretical Understanding
+The exports.py file turns querysets into streamed CSV or NDJSON bodies. Rows are read with a
+server-side cursor (`.iterator(chunk_size=...)`) as plain tuples from `values_list`, so no model
+instances or serializers are built and the full table is never held in memory. Each chunk of rows is
+encoded and yielded straight to `StreamingHttpResponse`, which lets the first bytes reach the client
+before the last rows have been read.
+
+Under ASGI, Django consumes a synchronous streaming body with sync_to_async(list), which would
+hold the whole export in memory before sending it. stream_export(asynchronous=True) therefore wraps
+the generator in an async iterator. The iterator fetches one chunk at a time on the request's
+thread-sensitive worker thread, which is the thread that owns the server-side cursor.
+
+Relationship with Other Components
+1. Views (views.py)
+- ExportMixin adds a GET /<resource>/export/ action to the Employee, InventoryItem and Product
+  ViewSets and calls stream_export() with the ViewSet's queryset
+
+2. Models (models.py)
+- The exported columns are the model's concrete fields, in declaration order
+
+Current Implementation
+- export_lines(queryset, fields, output, chunk_size): generator of encoded text chunks
+  (also used by the background "export" job to write files, see jobs.py)
+- stream_export(queryset, fields, output, chunk_size, filename, asynchronous): returns a
+  StreamingHttpResponse (with an async body under ASGI)
+- output='csv' writes a header row followed by one line per record
+- output='ndjson' writes one JSON object per line
+"""
+
+import csv
+import io
+
+from asgiref.sync import sync_to_async
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+
+EXPORT_FORMATS = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson',
+}
+
+
+def _chunks(rows, chunk_size):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _csv_lines(rows, fields, chunk_size):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(fields)
+    yield buffer.getvalue()
+    for chunk in _chunks(rows, chunk_size):
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(chunk)
+        yield buffer.getvalue()
+
+
+def _ndjson_lines(rows, fields, chunk_size):
+    encoder = DjangoJSONEncoder()
+    for chunk in _chunks(rows, chunk_size):
+        yield ''.join(encoder.encode(dict(zip(fields, row))) + '\n' for row in chunk)
+
+
+def export_lines(queryset, fields, output='csv', chunk_size=2000):
+    rows = queryset.values_list(*fields).iterator(chunk_size=chunk_size)
+    if output == 'ndjson':
+        return _ndjson_lines(rows, fields, chunk_size)
+    return _csv_lines(rows, fields, chunk_size)
+
+
+async def aiter_lines(lines):
+    """Yield the chunks of a sync generator, fetching one at a time on the thread-sensitive worker."""
+    done = object()
+    fetch = sync_to_async(next, thread_sensitive=True)
+    try:
+        while (chunk := await fetch(lines, done)) is not done:
+            yield chunk
+    finally:
+        await sync_to_async(lines.close, thread_sensitive=True)()  # releases the server-side cursor
+
+
+def stream_export(queryset, fields, output='csv', chunk_size=2000, filename='export', asynchronous=False):
+    body = export_lines(queryset, fields, output, chunk_size)
+    if asynchronous:
+        body = aiter_lines(body)
+    response = StreamingHttpResponse(body, content_type=EXPORT_FORMATS[output])
+    response['Content-Disposition'] = f'attachment; filename="{filename}.{output}"'
+    return response
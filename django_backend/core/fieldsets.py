@@ -0,0 +1,196 @@
+"""
+Django Fieldsets.py - Purpose and Relationship
+
+Theoretical Understanding
+List screens rarely show every column: the product table shows name and price, yet each row
+carried its full description and image URL from the database through the serializer to the client.
+Sparse fieldsets let the client name what it needs:
+
+    GET /api/products/?fields=id,name,price
+    GET /api/products/?exclude=description,image_url
+
+Both the JSON and the SQL are trimmed: the serializer drops the other fields and the queryset loads
+only the selected columns (plus the primary key, the ordering fields the cursor is built from, and
+the updated field the /changes/ feed needs). Unknown names are a 400, like unknown filter values.
+
+Lean lists
+ModelSerializer does a lot of work per field and row (attribute lookup, SkipField and None checks,
+an OrderedDict per row), which dominates large list responses. For list requests the viewsets below
+read rows with values() and build each dict directly, calling only the to_representation() of the
+fields whose output differs from the database value (datetimes, decimals, choices; a datetime
+field looks up the time zone once per page, not per value). The output is identical to the
+serializer's. A serializer with fields that cannot be read straight from a column
+(SerializerMethodField, dotted sources, nested serializers) falls back to the serializer.
+
+Relationship with Other Components
+1. Serializers (serializers.py)
+- SparseFieldsetSerializer accepts fields=[...] and drops the others
+
+2. Views (views.py, async_views.py)
+- SparseFieldsMixin on the Employee, InventoryItem and Product ViewSets: ?fields= / ?exclude= on
+  list, retrieve, /changes/ and /export/, and the lean list path (lean_list = False turns it off)
+- The async list and detail views apply the same fieldset and lean path
+- Response-cache keys include the query string, so each fieldset is cached separately (caching.py)
+"""
+
+from functools import lru_cache
+
+from django.utils.timezone import is_aware
+from rest_framework import ISO_8601, serializers
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import OrderingFilter
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+from .metrics import timed
+
+# Fields whose to_representation() returns database values unchanged
+PLAIN_FIELDS = (
+    serializers.BooleanField, serializers.CharField, serializers.EmailField, serializers.FloatField,
+    serializers.IntegerField, serializers.SlugField, serializers.URLField,
+)
+
+
+@lru_cache(maxsize=None)
+def readable_fields(serializer_class):
+    return tuple(name for name, field in serializer_class().fields.items() if not field.write_only)
+
+
+def parse_fieldset(query_params, serializer_class):
+    """Names selected by ?fields= and ?exclude= (serializer order), or None when neither is given."""
+    include = [name for name in query_params.get('fields', '').split(',') if name]
+    exclude = [name for name in query_params.get('exclude', '').split(',') if name]
+    if not include and not exclude:
+        return None
+    available = readable_fields(serializer_class)
+    for param, names in (('fields', include), ('exclude', exclude)):
+        unknown = [name for name in names if name not in available]
+        if unknown:
+            raise ValidationError({param: [f'Unknown field(s): {", ".join(unknown)}.']})
+    return tuple(name for name in available if (not include or name in include) and name not in exclude)
+
+
+def page_converter(field):
+    """field.to_representation, with a DateTimeField's timezone looked up once instead of per value."""
+    if not isinstance(field, serializers.DateTimeField):
+        return field.to_representation
+    output_format = getattr(field, 'format', api_settings.DATETIME_FORMAT)
+    field_timezone = field.timezone if hasattr(field, 'timezone') else field.default_timezone()
+    if output_format is None or output_format.lower() != ISO_8601 or field_timezone is None:
+        return field.to_representation
+
+    def convert(value):
+        if not is_aware(value):
+            return field.to_representation(value)
+        value = value.astimezone(field_timezone).isoformat()
+        return value[:-6] + 'Z' if value.endswith('+00:00') else value
+    return convert
+
+
+class LeanRows:
+    """Builds the serializer's output for `names` from values() rows, without serializer instances."""
+
+    def __init__(self, names, columns, fields):
+        self.names = names
+        self.columns = columns
+        self.fields = fields  # None where the column value is already the representation
+
+    def __call__(self, rows):
+        converters = [None if field is None else page_converter(field) for field in self.fields]
+        plan = list(zip(self.names, self.columns, converters))
+        data = []
+        with timed('serialize'):
+            for row in rows:
+                item = {}
+                for name, column, convert in plan:
+                    value = row[column]
+                    item[name] = value if convert is None or value is None else convert(value)
+                data.append(item)
+        return data
+
+
+@lru_cache(maxsize=256)
+def lean_rows(serializer_class, names):
+    """LeanRows for these fields, or None when one of them is not a plain column."""
+    model = serializer_class.Meta.model
+    columns = {field.name for field in model._meta.concrete_fields}
+    fields = serializer_class().fields
+    sources, converters = [], []  # converters: the fields whose values need to_representation()
+    for name in names:
+        field = fields[name]
+        if field.source not in columns or isinstance(field, (serializers.ManyRelatedField, serializers.BaseSerializer)):
+            return None
+        if isinstance(field, serializers.PrimaryKeyRelatedField) and field.pk_field is None:
+            converters.append(None)  # values() already returns the related primary key
+        elif isinstance(field, serializers.RelatedField):
+            return None
+        else:
+            converters.append(None if type(field) in PLAIN_FIELDS else field)
+        sources.append(field.source)
+    return LeanRows(names, tuple(sources), tuple(converters))
+
+
+def query_columns(model, fieldset, serializer_class, extra=()):
+    """Model fields to load for `fieldset`: the selected sources plus the primary key and `extra`."""
+    fields = serializer_class().fields
+    columns = {model._meta.pk.name, *extra}
+    columns.update(fields[name].source for name in fieldset if fields[name].source != '*')
+    concrete = {field.name for field in model._meta.concrete_fields}
+    return [column for column in columns if column in concrete]
+
+
+class SparseFieldsMixin:
+    lean_list = True
+
+    def get_fieldset(self):
+        if self.request is None or self.request.method not in SAFE_METHODS:
+            return None
+        if not hasattr(self, '_fieldset'):
+            self._fieldset = parse_fieldset(self.request.query_params, self.get_serializer_class())
+        return self._fieldset
+
+    def get_fieldset_columns(self, queryset, fieldset):
+        extra = [field.lstrip('-') for field in self.get_cursor_ordering(queryset)]
+        if getattr(self, 'updated_field', None):
+            extra.append(self.updated_field)
+        return query_columns(queryset.model, fieldset, self.get_serializer_class(), extra)
+
+    def get_cursor_ordering(self, queryset):
+        """The ordering the cursor paginator will use; its position is read from the first field."""
+        if OrderingFilter in self.filter_backends:
+            ordering = OrderingFilter().get_ordering(self.request, queryset, self)
+            if ordering:
+                return ordering
+        paginator = self.paginator
+        ordering = getattr(paginator, 'ordering', None) or ()
+        return [ordering] if isinstance(ordering, str) else list(ordering)
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        fieldset = self.get_fieldset()
+        if fieldset is not None:
+            queryset = queryset.only(*self.get_fieldset_columns(queryset, fieldset))
+        return queryset
+
+    def get_serializer(self, *args, **kwargs):
+        fieldset = self.get_fieldset()
+        if fieldset is not None:
+            kwargs.setdefault('fields', fieldset)
+        return super().get_serializer(*args, **kwargs)
+
+    def list(self, request, *args, **kwargs):
+        serializer_class = self.get_serializer_class()
+        fieldset = self.get_fieldset()
+        if fieldset is None:
+            fieldset = readable_fields(serializer_class)
+        lean = lean_rows(serializer_class, fieldset) if self.lean_list else None
+        if lean is None:
+            return super().list(request, *args, **kwargs)
+        queryset = self.filter_queryset(self.get_queryset())
+        columns = set(lean.columns) | set(self.get_fieldset_columns(queryset, fieldset))
+        rows = queryset.values(*columns)
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(lean(page))
+        return Response(lean(rows))
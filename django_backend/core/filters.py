@@ -0,0 +1,49 @@
+"""
+Django Filters.py - Purpose and Relationship
+
+Theoretical Understanding
+The filters.py file moves filtering from the frontend to the database. Instead of downloading whole
+tables and filtering them in the browser, clients pass query parameters and the ViewSet narrows the
+queryset before it is paginated and serialized.
+
+Relationship with Other Components
+1. Views (views.py)
+- ViewSets list the backends in `filter_backends`
+- `filter_fields` maps a model field to the lookups clients may use, e.g.
+      filter_fields = {'name': ['istartswith', 'icontains'], 'price': ['gte', 'lte']}
+  which allows ?name__istartswith=al&price__gte=10
+- DRF's SearchFilter (`search_fields`, ?search=) and OrderingFilter (`ordering_fields`, ?ordering=)
+  are used alongside it
+
+2. Models / Migrations
+- The filtered columns are indexed (db_index); on PostgreSQL migration 0005 adds trigram GIN
+  indexes on UPPER(name) so icontains/istartswith searches use an index
+
+Current Implementation
+- FieldFilterBackend: `<field>` or `<field>__<lookup>` parameters, values converted with the
+  model field's to_python() so bad input returns 400 instead of a database error
+"""
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import BooleanField
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+
+
+class FieldFilterBackend(BaseFilterBackend):
+    def filter_queryset(self, request, queryset, view):
+        allowed = getattr(view, 'filter_fields', {})
+        filters = {}
+        for param, value in request.query_params.items():
+            name, _, lookup = param.partition('__')
+            lookup = lookup or 'exact'
+            if name not in allowed or (lookup != 'exact' and lookup not in allowed[name]):
+                continue
+            field = queryset.model._meta.get_field(name)
+            if isinstance(field, BooleanField):
+                value = value.capitalize()
+            try:
+                filters[f'{name}__{lookup}'] = field.to_python(value)
+            except DjangoValidationError as exc:
+                raise ValidationError({param: exc.messages})
+        return queryset.filter(**filters)
@@ -0,0 +1,194 @@
+"""
+Django Imports.py - Purpose and Relationship
+
+Theoretical Understanding
+The imports.py file loads large stock-count CSVs into InventoryItem without building one ORM object
+per row on the fast path. The file is read as a stream and validated in fixed-size chunks, so memory
+use depends on the chunk size and not on the file size.
+
+On PostgreSQL every valid chunk is written with `COPY ... FROM STDIN` into a temporary staging table.
+When the whole file has been read, the rows are merged into core_inventoryitem with a single
+`INSERT ... ON CONFLICT (id) DO UPDATE`. On other databases (SQLite during local development) each
+chunk is written with `bulk_create(update_conflicts=True)`, which behaves the same way.
+
+last_updated is stamped when the rows are merged (clock_timestamp(), not now(), which is the time
+the transaction began), so the /changes/ feed's overlap (sync.py) only has to cover the merge and
+not the whole upload. The ORM loader restamps its rows the same way once the file has been read.
+
+Relationship with Other Components
+1. Serializers (serializers.py)
+- Each chunk is validated with InventoryItemSerializer's BulkListSerializer.partition(),
+  so the import accepts the same values as the API
+
+2. Views (views.py)
+- InventoryItemViewSet.import_csv exposes POST /inventory/import/ (multipart "file")
+
+3. Management Commands
+- `python manage.py import_inventory <path>` runs the same import from the shell
+
+4. Jobs (jobs.py)
+- The import_inventory job runs the same import in a worker and reports progress after each chunk
+
+Current Implementation
+- CSV columns: id (optional), name, quantity, unit; extra columns are ignored
+- Rows with an id update that item (or create it with that id); rows without an id are inserted
+- When several rows share an id, the last one in the file wins (with both loaders)
+- Invalid rows are skipped and reported with their line number
+"""
+
+import csv
+import io
+
+from django.db import connections, transaction
+from django.utils import timezone
+
+from .caching import bump_generation
+from .live import publish_inventory_reset
+from .models import InventoryItem
+from .serializers import InventoryItemSerializer
+
+MAX_REPORTED_ERRORS = 100
+
+
+def _read_chunks(reader, chunk_size):
+    chunk = []
+    for row in reader:
+        chunk.append((reader.line_num, row))
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _validate_chunk(chunk):
+    errors = []
+    serializer = InventoryItemSerializer(data=[row for _, row in chunk], many=True)
+    valid, invalid = serializer.partition([row for _, row in chunk])
+    for error in invalid:
+        errors.append({'line': chunk[error['index']][0], 'errors': error['errors']})
+    rows = []
+    for index, data in valid:
+        raw_id = (chunk[index][1].get('id') or '').strip()
+        if raw_id and not raw_id.isdigit():
+            errors.append({'line': chunk[index][0], 'errors': {'id': ['A valid integer is required.']}})
+            continue
+        rows.append((int(raw_id) if raw_id else None, data['name'], data['quantity'], data['unit']))
+    errors.sort(key=lambda error: error['line'])
+    return rows, errors
+
+
+class _PostgresLoader:
+    table = InventoryItem._meta.db_table
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.seq = 0  # file order of the staged rows, so the last row for an id wins
+
+    def start(self):
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f'CREATE TEMPORARY TABLE {self.table}_staging '
+                '(seq bigint, id bigint, name varchar(100), quantity integer, unit varchar(20)) ON COMMIT DROP'
+            )
+
+    def load(self, rows):
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows((self.seq + index, *row) for index, row in enumerate(rows))
+        self.seq += len(rows)
+        buffer.seek(0)
+        sql = f'COPY {self.table}_staging (seq, id, name, quantity, unit) FROM STDIN WITH (FORMAT csv)'
+        with self.connection.cursor() as cursor:
+            raw = cursor.cursor
+            if hasattr(raw, 'copy_expert'):
+                raw.copy_expert(sql, buffer)
+            else:
+                with raw.copy(sql) as copy:
+                    copy.write(buffer.read())
+
+    def finish(self):
+        table = self.table
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f'INSERT INTO {table} (id, name, quantity, unit, last_updated) '
+                f'SELECT DISTINCT ON (id) id, name, quantity, unit, clock_timestamp() FROM {table}_staging '
+                'WHERE id IS NOT NULL ORDER BY id, seq DESC '
+                'ON CONFLICT (id) DO UPDATE SET name = EXCLUDED.name, quantity = EXCLUDED.quantity, '
+                'unit = EXCLUDED.unit, last_updated = EXCLUDED.last_updated'
+            )
+            cursor.execute(
+                f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+                f'GREATEST((SELECT MAX(id) FROM {table}), 1))'
+            )
+            cursor.execute(
+                f'INSERT INTO {table} (name, quantity, unit, last_updated) '
+                f'SELECT name, quantity, unit, clock_timestamp() FROM {table}_staging WHERE id IS NULL'
+            )
+
+
+class _OrmLoader:
+    def __init__(self, connection):
+        self.using = connection.alias
+        self.started_at = None
+
+    def start(self):
+        self.started_at = timezone.now()
+
+    def load(self, rows):
+        now = timezone.now()
+        # One row per id, the last one; an upsert may not touch the same row twice (PostgreSQL
+        # refuses it). Later chunks are written later, so the last row wins across chunks too.
+        last = {pk: row for pk, *row in rows if pk is not None}
+        objs = [
+            InventoryItem(id=pk, name=name, quantity=quantity, unit=unit, last_updated=now)
+            for pk, (name, quantity, unit) in last.items()
+        ] + [
+            InventoryItem(name=name, quantity=quantity, unit=unit, last_updated=now)
+            for pk, name, quantity, unit in rows if pk is None
+        ]
+        InventoryItem.objects.using(self.using).bulk_create(
+            objs,
+            update_conflicts=True,
+            unique_fields=['id'],
+            update_fields=['name', 'quantity', 'unit', 'last_updated'],
+        )
+
+    def finish(self):
+        # Restamp the imported rows now that the file has been read (rows changed concurrently in
+        # the meantime are restamped too, which only sends them to /changes/ clients once more)
+        InventoryItem.objects.using(self.using).filter(last_updated__gte=self.started_at).update(
+            last_updated=timezone.now()
+        )
+
+
+def import_inventory_csv(stream, chunk_size=5000, using='default', progress=None):
+    """Import a text CSV stream into InventoryItem and return a summary dict.
+
+    progress(rows), when given, is called with the number of rows read so far after each chunk.
+    """
+    connection = connections[using]
+    loader = _PostgresLoader(connection) if connection.vendor == 'postgresql' else _OrmLoader(connection)
+    reader = csv.DictReader(stream)
+    errors = []
+    total = imported = failed = 0
+    with transaction.atomic(using=using):
+        loader.start()
+        for chunk in _read_chunks(reader, chunk_size):
+            total += len(chunk)
+            rows, chunk_errors = _validate_chunk(chunk)
+            failed += len(chunk_errors)
+            errors.extend(chunk_errors[:MAX_REPORTED_ERRORS - len(errors)])
+            if rows:
+                loader.load(rows)
+                imported += len(rows)
+            if progress is not None:
+                progress(total)
+        loader.finish()
+        bump_generation(InventoryItem)
+        publish_inventory_reset(using)
+    return {
+        'rows': total,
+        'imported': imported,
+        'failed': failed,
+        'errors': errors,
+    }
@@ -0,0 +1,277 @@
+"""
+Django Jobs.py - Purpose and Relationship
+
+Theoretical Understanding
+Heavy operations (payroll runs, imports, exports, rollup rebuilds) should not run inside a WSGI
+request, where they block a worker and run into proxy timeouts. The jobs.py file implements a small
+job queue that uses only the application database:
+
+1. Submit: the API inserts a Job row with status "queued" and returns its id right away
+2. Claim:  `manage.py run_workers` processes pick the oldest queued job. On PostgreSQL the claim
+           uses `SELECT ... FOR UPDATE SKIP LOCKED`, so workers never wait on each other or take
+           the same job twice. On SQLite a conditional UPDATE (status='queued' -> 'running')
+           gives the same guarantee.
+3. Run:    the handler registered for the job's kind runs and reports progress after each chunk
+           of work. The claim leases the job to the worker for CORE_JOB_LEASE_SECONDS
+           (locked_until), and a heartbeat thread renews the lease while the handler runs. The
+           heartbeat thread also writes the progress, on its own connection: payroll and import
+           handlers work inside a transaction, where an update of the job row would stay invisible
+           (and keep the row locked against the heartbeat) until the handler commits.
+4. Finish: the result (JSON) or a short error message is stored on the row; the traceback of a
+           failed job goes to the worker's log, not to the API
+
+Each kind registers a serializer for its params (serializers.py). submit_job() validates the params
+with it, so a bad job is refused with a 400 when it is submitted instead of failing in the worker.
+
+If a worker dies mid-job (killed, OOM, host lost) its lease runs out and the claim query picks the
+job up again like a queued one. A job is tried at most CORE_JOB_MAX_ATTEMPTS times, then failed,
+so a job that keeps killing its worker does not loop forever. Progress and results are written only
+by the worker that holds the job, so a worker that lost its lease cannot overwrite the new run.
+
+Relationship with Other Components
+1. Models (models.py)
+- Job holds kind, params, status, progress, result and error
+
+2. Views (views.py)
+- JobViewSet: POST /jobs/ to submit, GET /jobs/<id>/ for status/progress, GET /jobs/<id>/result/
+- POST /jobs/import/ stores an uploaded CSV in CORE_JOB_FILES_DIR and submits an import_inventory job
+- GET /jobs/<id>/download/ sends the file an export job wrote
+
+3. Management Commands
+- `python manage.py run_workers --processes 4` starts a pool of worker processes
+
+Registered job kinds
+- payroll_run:        {"period_start": "YYYY-MM-DD", "period_end": "YYYY-MM-DD", ...pay rule overrides}
+- refresh_attendance: {"full": false}
+- import_inventory:   {"file": "stock_count.csv"}  (a file inside CORE_JOB_FILES_DIR, see POST /jobs/import/)
+- export:             {"resource": "employees|inventory|products", "output": "csv|ndjson"}
+                      (writes <resource>-<job id>.<output> into CORE_JOB_FILES_DIR and returns its name)
+payroll_run and export read their inputs from a read replica when one is configured (replicas.py).
+"""
+
+import io
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from datetime import date, timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.db import OperationalError, close_old_connections, connection, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .exports import export_lines
+from .imports import import_inventory_csv
+from .models import Employee, InventoryItem, Job, Product
+from .payroll import run_payroll
+from .replicas import use_replica
+from .rollups import refresh_daily_attendance
+from .serializers import (
+    ExportJobParamsSerializer, ImportJobParamsSerializer, PayrollJobParamsSerializer,
+    RefreshAttendanceJobParamsSerializer,
+)
+
+logger = logging.getLogger(__name__)
+
+JOB_HANDLERS = {}
+JOB_PARAMS = {}
+
+
+def job_handler(kind, params):
+    """Register fn(params, progress, job) -> JSON-serializable result for a job kind.
+
+    `params` is the serializer class that validates the kind's params when a job is submitted.
+    """
+    def register(fn):
+        JOB_HANDLERS[kind] = fn
+        JOB_PARAMS[kind] = params
+        return fn
+    return register
+
+
+def clean_params(kind, params):
+    """Validate params for a job kind and return them as they are stored; raises ValidationError."""
+    serializer = JOB_PARAMS[kind](data=params or {})
+    serializer.is_valid(raise_exception=True)
+    return dict(serializer.data)
+
+
+def submit_job(kind, params=None, user=None):
+    if kind not in JOB_HANDLERS:
+        raise ValueError(f'Unknown job kind: {kind}')
+    return Job.objects.create(kind=kind, params=clean_params(kind, params), submitted_by=user)
+
+
+def lease_seconds():
+    return getattr(settings, 'CORE_JOB_LEASE_SECONDS', 60)
+
+
+def claim_job(worker):
+    """Mark the oldest queued (or abandoned) job as running for this worker and return it (or None)."""
+    now = timezone.now()
+    expired = Q(status=Job.RUNNING, locked_until__lt=now)
+    with transaction.atomic():
+        Job.objects.filter(expired, attempts__gte=getattr(settings, 'CORE_JOB_MAX_ATTEMPTS', 3)).update(
+            status=Job.FAILED, error='The worker running this job stopped responding too many times.',
+            finished_at=now, locked_until=None,
+        )
+        claimable = Q(status=Job.QUEUED) | expired
+        queued = Job.objects.filter(claimable).order_by('created_at', 'id')
+        if connection.features.has_select_for_update_skip_locked:
+            queued = queued.select_for_update(skip_locked=True)
+        for job in queued[:5]:
+            claimed = Job.objects.filter(claimable, pk=job.pk).update(
+                status=Job.RUNNING, worker=worker, started_at=now, attempts=F('attempts') + 1,
+                locked_until=now + timedelta(seconds=lease_seconds()),
+            )
+            if claimed:
+                job.refresh_from_db()
+                return job
+    return None
+
+
+def renew_lease(job, **fields):
+    """Extend the worker's lease on a running job (and set `fields`); False when another worker has it."""
+    return bool(Job.objects.filter(pk=job.pk, worker=job.worker, status=Job.RUNNING).update(
+        locked_until=timezone.now() + timedelta(seconds=lease_seconds()), **fields
+    ))
+
+
+def _heartbeat(job, stop, wake, report):
+    try:
+        while True:
+            wake.wait(lease_seconds() / 3)
+            if stop.is_set():
+                return
+            wake.clear()
+            try:
+                renew_lease(job, **report)
+            except OperationalError:
+                pass  # busy database: the next beat retries well before the lease runs out
+    finally:
+        connection.close()  # this thread's own connection
+
+
+def run_job(job):
+    handler = JOB_HANDLERS.get(job.kind)
+    held = Job.objects.filter(pk=job.pk, worker=job.worker, status=Job.RUNNING)
+    stop, wake, report = threading.Event(), threading.Event(), {}
+
+    def progress(fraction, message=''):
+        # Written by the heartbeat thread; reports made faster than it writes are merged into one
+        report.update(progress=min(max(fraction, 0.0), 1.0), message=message[:200])
+        wake.set()
+
+    heartbeat = threading.Thread(
+        target=_heartbeat, args=(job, stop, wake, report), name=f'core-job-{job.pk}', daemon=True,
+    )
+    heartbeat.start()
+    try:
+        if handler is None:
+            raise ValueError(f'Unknown job kind: {job.kind}')
+        result = handler(job.params, progress, job)
+    except Exception as exc:
+        logger.exception('Job %s (%s) failed', job.pk, job.kind)
+        outcome = {'status': Job.FAILED, 'error': f'{type(exc).__name__}: {exc}'[:200]}
+    else:
+        outcome = {'status': Job.SUCCEEDED, 'result': result, 'progress': 1.0}
+    finally:
+        stop.set()
+        wake.set()
+        heartbeat.join()
+    held.update(finished_at=timezone.now(), locked_until=None, **outcome)
+
+
+def worker_loop(poll_interval=1.0, burst=False):
+    """Claim and run jobs until stopped; with burst=True, return once the queue is empty."""
+    worker = f'{socket.gethostname()}:{os.getpid()}'
+    while True:
+        # Workers run outside the request cycle, so apply CONN_MAX_AGE and health checks here
+        close_old_connections()
+        try:
+            job = claim_job(worker)
+        except OperationalError:
+            # SQLite allows one writer at a time; a busy database just means "try again"
+            time.sleep(poll_interval)
+            continue
+        if job is None:
+            if burst:
+                return
+            time.sleep(poll_interval)
+            continue
+        run_job(job)
+
+
+@job_handler('payroll_run', PayrollJobParamsSerializer)
+def _payroll_run(params, progress, job):
+    params = dict(params)
+    start = date.fromisoformat(params.pop('period_start'))
+    end = date.fromisoformat(params.pop('period_end'))
+    with use_replica():
+        run = run_payroll(start, end, params, progress=progress)
+    return {'payroll_run': run.pk, 'employee_count': run.employee_count, 'total_net': run.total_net}
+
+
+@job_handler('refresh_attendance', RefreshAttendanceJobParamsSerializer)
+def _refresh_attendance(params, progress, job):
+    return {'refreshed': refresh_daily_attendance(full=params['full'])}
+
+
+def job_files_dir():
+    directory = Path(getattr(settings, 'CORE_JOB_FILES_DIR', settings.BASE_DIR / 'job_files'))
+    directory.mkdir(parents=True, exist_ok=True)
+    return directory
+
+
+def job_file(name):
+    """Path of an existing file inside CORE_JOB_FILES_DIR; raises ValueError for anything else."""
+    directory = job_files_dir().resolve()
+    path = (directory / name).resolve()
+    if directory not in path.parents:
+        raise ValueError('Job files must be inside CORE_JOB_FILES_DIR.')
+    if not path.is_file():
+        raise ValueError(f'No such file: {name}')
+    return path
+
+
+def store_upload(upload):
+    """Save an uploaded file into CORE_JOB_FILES_DIR under a new name and return the name."""
+    name = f'upload-{uuid.uuid4().hex}.csv'
+    with open(job_files_dir() / name, 'wb') as target:
+        for chunk in upload.chunks():
+            target.write(chunk)
+    return name
+
+
+@job_handler('import_inventory', ImportJobParamsSerializer)
+def _import_inventory(params, progress, job):
+    path = job_file(params['file'])
+    size = path.stat().st_size or 1
+    with open(path, 'rb') as raw, io.TextIOWrapper(raw, encoding='utf-8-sig', newline='') as stream:
+        def rows_read(rows):
+            # raw.tell() runs ahead of the parsed rows by at most one read buffer
+            progress(raw.tell() / size, f'{rows} rows read')
+
+        return import_inventory_csv(stream, getattr(settings, 'CORE_IMPORT_CHUNK_SIZE', 5000), progress=rows_read)
+
+
+EXPORT_RESOURCES = {'employees': Employee, 'inventory': InventoryItem, 'products': Product}
+
+
+@job_handler('export', ExportJobParamsSerializer)
+def _export(params, progress, job):
+    model = EXPORT_RESOURCES[params['resource']]
+    output = params['output']
+    path = job_files_dir() / f"{params['resource']}-{job.pk}.{output}"
+    fields = [field.attname for field in model._meta.concrete_fields]
+    chunk_size = getattr(settings, 'CORE_EXPORT_CHUNK_SIZE', 2000)
+    with use_replica(), open(path, 'w', newline='', encoding='utf-8') as target:
+        total = model.objects.count() or 1
+        for index, chunk in enumerate(export_lines(model.objects.order_by('id'), fields, output, chunk_size)):
+            target.write(chunk)
+            progress(min((index + 1) * chunk_size / total, 1.0), 'Writing rows')
+    return {'file': path.name}
@@ -0,0 +1,225 @@
+"""
+Django Live.py - Purpose and Relationship
+
+Theoretical Understanding
+Dashboards used to poll /api/inventory/ to notice stock changes, so every open screen added load.
+The live.py file pushes item-level deltas instead, over server-sent events (SSE):
+
+1. Publish: when an InventoryItem is saved or deleted, its new state is serialized and published
+   once the transaction commits (transaction.on_commit), so a failed send cannot roll back the
+   save and the serialization is not paid inside the transaction
+2. Fan-out:  an in-process hub hands each change to the subscriptions of that process. On PostgreSQL,
+             changes are sent with NOTIFY on the "core_inventory" channel, in payloads kept under
+             PostgreSQL's 8000-byte limit. Every process with subscribers runs one LISTEN thread, so a
+             save handled by any worker reaches clients connected to any other. On other databases
+             the hub is process-local (fine for a single ASGI process), and nothing is serialized
+             while the process has no subscribers.
+3. Coalesce: a subscription keeps only the latest state per item id. After a wake-up the stream waits
+             CORE_LIVE_COALESCE_MS, then sends everything that is pending as one event. A burst of 100
+             updates to one SKU therefore becomes a single delta. If more than CORE_LIVE_MAX_PENDING
+             items are pending (e.g. a CSV import), the client gets a "reset" event and reloads
+             instead.
+
+Stream format (GET /api/inventory/stream/?ids=1,2,3, ids optional = all items):
+    event: ready       data: {"ids": [1, 2, 3]}
+    event: inventory   data: [{"id": 1, "name": ..., "quantity": 7, "unit": ..., "last_updated": ...}]
+    event: inventory   data: [{"id": 2, "deleted": true}]
+    event: reset       data: {}
+    : keepalive        (every CORE_LIVE_HEARTBEAT seconds)
+After connecting (or reconnecting), clients load the list once, or catch up with
+/api/inventory/changes/, and then apply the deltas.
+
+Relationship with Other Components
+1. Signals (signals.py)
+- post_save/post_delete on InventoryItem call publish_inventory()
+
+2. Views (views.py, async_views.py)
+- InventoryItemViewSet.bulk_saved() publishes bulk writes; CSV imports publish a reset
+- InventoryStreamView serves the stream (needs an ASGI server such as uvicorn)
+
+3. Settings (settings.py)
+- CORE_LIVE_ENABLED (CORE_LIVE=0 turns publishing and the stream off for deployments without live
+  screens), CORE_LIVE_COALESCE_MS, CORE_LIVE_HEARTBEAT, CORE_LIVE_MAX_PENDING
+"""
+
+import asyncio
+import json
+import logging
+import select
+import threading
+import time
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+from .serializers import InventoryItemSerializer
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = 'core_inventory'
+NOTIFY_MAX_BYTES = 7900  # PostgreSQL rejects NOTIFY payloads of 8000 bytes or more
+RESET = {'reset': True}
+
+
+class Subscription:
+    def __init__(self, loop, ids=None):
+        self.loop = loop
+        self.ids = ids
+        self.pending = {}
+        self.reset = False
+        self.wakeup = asyncio.Event()
+        self.max_pending = getattr(settings, 'CORE_LIVE_MAX_PENDING', 1000)
+
+    def offer(self, events):
+        """Queue events (called on the subscription's event loop)."""
+        for event in events:
+            if event.get('reset'):
+                self.pending.clear()
+                self.reset = True
+            elif self.ids is None or event['id'] in self.ids:
+                self.pending[event['id']] = event
+        if len(self.pending) > self.max_pending:
+            self.pending.clear()
+            self.reset = True
+        if self.pending or self.reset:
+            self.wakeup.set()
+
+    def drain(self):
+        events, reset = list(self.pending.values()), self.reset
+        self.pending, self.reset = {}, False
+        self.wakeup.clear()
+        return events, reset
+
+
+class Hub:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscriptions = set()
+        self._listener = None
+
+    def subscribe(self, ids=None):
+        subscription = Subscription(asyncio.get_running_loop(), ids)
+        with self._lock:
+            self._subscriptions.add(subscription)
+            if uses_notify() and self._listener is None:
+                self._listener = threading.Thread(target=self._listen, name='core-live-listener', daemon=True)
+                self._listener.start()
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscriptions.discard(subscription)
+
+    def has_subscribers(self):
+        return bool(self._subscriptions)
+
+    def deliver(self, events):
+        """Hand events to every subscription of this process; safe to call from any thread."""
+        with self._lock:
+            subscriptions = list(self._subscriptions)
+        for subscription in subscriptions:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.offer, events)
+            except RuntimeError:  # the subscriber's loop has closed
+                self.unsubscribe(subscription)
+
+    def _listen(self):
+        while True:
+            try:
+                self._listen_once()
+            except Exception:
+                logger.exception('LISTEN %s failed, reconnecting', CHANNEL)
+                self.deliver([RESET])  # notifications may have been missed
+                time.sleep(1)
+
+    def _listen_once(self):
+        raw = listen_connection()
+        try:
+            raw.autocommit = True
+            raw.cursor().execute(f'LISTEN {CHANNEL}')
+            if callable(getattr(raw, 'notifies', None)):  # psycopg 3
+                for notify in raw.notifies():
+                    self.deliver(json.loads(notify.payload))
+                return
+            while True:  # psycopg2
+                if select.select([raw], [], [], 30) == ([], [], []):
+                    continue
+                raw.poll()
+                while raw.notifies:
+                    self.deliver(json.loads(raw.notifies.pop(0).payload))
+        finally:
+            raw.close()
+
+
+def listen_connection(using=DEFAULT_DB_ALIAS):
+    """A dedicated driver connection for LISTEN, outside Django's connection handling and pool.
+
+    The LISTEN thread holds its connection for the life of the process, so it must not come from the
+    psycopg pool (OPTIONS['pool']): get_new_connection() would take a pool slot that is never
+    returned, and one more on every reconnect.
+    """
+    wrapper = connections[using]
+    params = wrapper.get_connection_params()
+    params.pop('pool', None)
+    return wrapper.Database.connect(**params)
+
+
+hub = Hub()
+
+
+def uses_notify(using=DEFAULT_DB_ALIAS):
+    return connections[using].vendor == 'postgresql'
+
+
+def live_enabled():
+    return getattr(settings, 'CORE_LIVE_ENABLED', True)
+
+
+def notify_payloads(events, max_bytes=NOTIFY_MAX_BYTES):
+    """Split events into JSON arrays of at most max_bytes (UTF-8), one NOTIFY payload each."""
+    batch, size = [], 2  # the brackets
+    for event in events:
+        encoded = json.dumps(event, default=str)
+        length = len(encoded.encode()) + 1  # and the separating comma
+        if length + 2 > max_bytes:  # a single event too large to send: clients reload instead
+            encoded = json.dumps(RESET)
+            length = len(encoded) + 1
+        if batch and size + length > max_bytes:
+            yield '[' + ','.join(batch) + ']'
+            batch, size = [], 2
+        batch.append(encoded)
+        size += length
+    if batch:
+        yield '[' + ','.join(batch) + ']'
+
+
+def _publish(build, using=DEFAULT_DB_ALIAS):
+    """Send the events returned by build() once the current transaction commits."""
+    if not live_enabled() or not (uses_notify(using) or hub.has_subscribers()):
+        return
+
+    def send():
+        events = build()
+        if not uses_notify(using):
+            hub.deliver(events)
+            return
+        with connections[using].cursor() as cursor:
+            for payload in notify_payloads(events):
+                cursor.execute('SELECT pg_notify(%s, %s)', [CHANNEL, payload])
+    transaction.on_commit(send, using=using, robust=True)
+
+
+def publish_inventory(items, deleted=False, using=DEFAULT_DB_ALIAS):
+    """Publish the current state (or the deletion) of InventoryItem instances."""
+    if len(items) > getattr(settings, 'CORE_LIVE_MAX_PENDING', 1000):
+        return publish_inventory_reset(using)
+    if deleted:
+        events = [{'id': item.pk, 'deleted': True} for item in items]  # before delete() clears the pks
+        _publish(lambda: events, using)
+    else:
+        _publish(lambda: [dict(data) for data in InventoryItemSerializer(items, many=True).data], using)
+
+
+def publish_inventory_reset(using=DEFAULT_DB_ALIAS):
+    """Tell every client to reload, for changes too large to send as deltas."""
+    _publish(lambda: [RESET], using)
@@ -0,0 +1,34 @@
+"""
+Import an inventory stock-count CSV.
+
+Usage:
+    python manage.py import_inventory stock_count.csv --chunk-size 10000
+
+Uses COPY + INSERT ... ON CONFLICT on PostgreSQL and a batched bulk_create
+upsert elsewhere (see core/imports.py).
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.imports import import_inventory_csv
+
+
+class Command(BaseCommand):
+    help = 'Stream an InventoryItem CSV (id, name, quantity, unit) into the database'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV file to import')
+        parser.add_argument('--chunk-size', type=int, default=5000, help='Rows validated and loaded per batch')
+        parser.add_argument('--database', default='default', help='Database alias to import into')
+
+    def handle(self, *args, **options):
+        try:
+            with open(options['path'], newline='', encoding='utf-8-sig') as stream:
+                result = import_inventory_csv(stream, options['chunk_size'], options['database'])
+        except OSError as exc:
+            raise CommandError(f"Cannot read {options['path']}: {exc}")
+        for error in result['errors']:
+            self.stderr.write(f"line {error['line']}: {error['errors']}")
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {result['imported']} of {result['rows']} rows ({result['failed']} failed)."
+        ))
@@ -0,0 +1,18 @@
+"""
+Delete tombstones older than CORE_TOMBSTONE_RETENTION_DAYS.
+
+Usage (daily, e.g. from cron):
+    python manage.py prune_tombstones
+"""
+
+from django.core.management.base import BaseCommand
+
+from core.sync import prune_tombstones
+
+
+class Command(BaseCommand):
+    help = 'Delete Tombstone rows older than the /changes/ feed retention period'
+
+    def handle(self, *args, **options):
+        deleted = prune_tombstones()
+        self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} tombstones.'))
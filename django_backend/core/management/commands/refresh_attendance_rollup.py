@@ -0,0 +1,22 @@
+"""
+Refresh the DailyAttendanceSummary rollup.
+
+Usage:
+    python manage.py refresh_attendance_rollup          # only days touched since the last run
+    python manage.py refresh_attendance_rollup --full   # rebuild every day
+"""
+
+from django.core.management.base import BaseCommand
+
+from core.rollups import refresh_daily_attendance
+
+
+class Command(BaseCommand):
+    help = 'Recompute DailyAttendanceSummary rows for days with new clock events'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--full', action='store_true', help='Rebuild every (employee, date) row')
+
+    def handle(self, *args, **options):
+        written = refresh_daily_attendance(full=options['full'])
+        self.stdout.write(self.style.SUCCESS(f'Refreshed {written} daily attendance rows.'))
@@ -0,0 +1,51 @@
+"""
+Run background job workers.
+
+Usage:
+    python manage.py run_workers                 # one worker per CPU
+    python manage.py run_workers --processes 4
+    python manage.py run_workers --burst         # exit when the queue is empty
+
+Each worker process claims queued Job rows from the database (see core/jobs.py).
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from core.jobs import worker_loop
+
+
+def _init_worker():
+    # Under the "spawn" start method (Windows, macOS) the child has to set Django up again.
+    if not apps.ready:
+        django.setup()
+    connections.close_all()
+
+
+class Command(BaseCommand):
+    help = 'Start a pool of processes that run queued background jobs'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--processes', type=int, default=os.cpu_count() or 1, help='Number of worker processes')
+        parser.add_argument('--poll-interval', type=float, default=1.0, help='Seconds to sleep when the queue is empty')
+        parser.add_argument('--burst', action='store_true', help='Exit once the queue is empty')
+
+    def handle(self, *args, **options):
+        processes = max(options['processes'], 1)
+        if processes == 1:
+            worker_loop(options['poll_interval'], options['burst'])
+            return
+        connections.close_all()
+        self.stdout.write(f'Starting {processes} worker processes')
+        with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker) as pool:
+            futures = [
+                pool.submit(worker_loop, options['poll_interval'], options['burst'])
+                for _ in range(processes)
+            ]
+            for future in futures:
+                future.result()
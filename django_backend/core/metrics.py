@@ -0,0 +1,253 @@
+"""
+Django Metrics.py - Purpose and Relationship
+
+Theoretical Understanding
+The metrics.py file measures every request in the process that serves it and exposes the numbers in
+the Prometheus text format at /metrics:
+
+1. Measure: MetricsMiddleware times the request, counts queries with an execute_wrapper kept on
+            every connection (query count and time, per SQL statement), and times the two steps
+            that turn rows into bytes: serialization (BulkListSerializer.to_representation, via
+            timed()) and rendering (the post-render callback of DRF's Response).
+2. Record:  per route (the URL name, e.g. "inventoryitem-list") a latency histogram, a histogram
+            of queries per request, request counts by status and running totals of DB, serialize
+            and render time.
+3. Flag:    a request that runs more than CORE_METRICS_QUERY_THRESHOLD queries is counted as a
+            likely N+1 and logged with the SQL statement it repeated most.
+4. Report:  a Server-Timing header (db, serialize, render, total) lets browser dev tools show the
+            breakdown of a single request; /metrics serves the totals for Prometheus.
+
+The middleware runs natively in both the WSGI and the ASGI stack. Django gives each thread its own
+connections, and async views query from sync_to_async threads, so the query wrapper is installed on
+every connection when it is opened and finds the request being measured through a ContextVar, which
+those threads inherit. The registry lives in process memory, so with several gunicorn/uvicorn
+workers each scrape reads the worker that served it; use rate() over the counters, which tolerates
+that.
+With CORE_METRICS_ENABLED off the middleware removes itself at startup (MiddlewareNotUsed) and
+timed() is a single ContextVar lookup, so a disabled build pays nothing per request.
+
+Relationship with Other Components
+1. Settings (settings.py)
+- MIDDLEWARE (first entry), CORE_METRICS_ENABLED, CORE_METRICS_SERVER_TIMING,
+  CORE_METRICS_QUERY_THRESHOLD, CORE_METRICS_TOKEN (bearer token for /metrics; optional in development,
+  required by settings_production.py)
+
+2. URLs (django_backend/urls.py)
+- /metrics is served by metrics_view()
+
+3. Serializers (serializers.py)
+- BulkListSerializer.to_representation reports its time with timed('serialize')
+"""
+
+import bisect
+import contextvars
+import hmac
+import logging
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.http import HttpResponse
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 250)
+
+_current = contextvars.ContextVar('core_request_metrics', default=None)
+
+
+class RequestMetrics:
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.phases = {}
+        self.statements = Counter()
+
+    def add(self, phase, seconds):
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - started
+            self.queries += 1
+            self.statements[sql] += 1
+
+
+@contextmanager
+def timed(phase):
+    """Add the time spent in the block to the current request's `phase` (no-op outside a request)."""
+    metrics = _current.get()
+    if metrics is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.add(phase, time.perf_counter() - started)
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class Registry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latency = {}
+        self.queries = {}
+        self.requests = Counter()
+        self.totals = Counter()
+        self.n_plus_one = Counter()
+
+    def record(self, route, method, status, duration, metrics, threshold):
+        key = (route, method)
+        with self._lock:
+            self.latency.setdefault(key, Histogram(LATENCY_BUCKETS)).observe(duration)
+            self.queries.setdefault(key, Histogram(QUERY_BUCKETS)).observe(metrics.queries)
+            self.requests[(route, method, str(status))] += 1
+            self.totals[(route, method, 'db')] += metrics.db_time
+            for phase, seconds in metrics.phases.items():
+                self.totals[(route, method, phase)] += seconds
+            if metrics.queries > threshold:
+                self.n_plus_one[key] += 1
+
+    def render(self):
+        with self._lock:
+            lines = []
+            self._histogram(lines, 'core_http_request_duration_seconds', 'Request latency by route.', self.latency)
+            self._histogram(lines, 'core_db_queries_per_request', 'Database queries per request by route.', self.queries)
+            lines += ['# HELP core_http_requests_total Requests by route and status.',
+                      '# TYPE core_http_requests_total counter']
+            for (route, method, status), value in sorted(self.requests.items()):
+                lines.append(f'core_http_requests_total{_labels(route=route, method=method, status=status)} {value}')
+            lines += ['# HELP core_phase_seconds_total Time spent per phase (db, serialize, render) by route.',
+                      '# TYPE core_phase_seconds_total counter']
+            for (route, method, phase), value in sorted(self.totals.items()):
+                lines.append(f'core_phase_seconds_total{_labels(route=route, method=method, phase=phase)} {value:.6f}')
+            lines += ['# HELP core_n_plus_one_total Requests over CORE_METRICS_QUERY_THRESHOLD queries.',
+                      '# TYPE core_n_plus_one_total counter']
+            for (route, method), value in sorted(self.n_plus_one.items()):
+                lines.append(f'core_n_plus_one_total{_labels(route=route, method=method)} {value}')
+        return '\n'.join(lines) + '\n'
+
+    @staticmethod
+    def _histogram(lines, name, help_text, histograms):
+        lines += [f'# HELP {name} {help_text}', f'# TYPE {name} histogram']
+        for (route, method), histogram in sorted(histograms.items()):
+            cumulative = 0
+            for bound, count in zip((*histogram.buckets, '+Inf'), histogram.counts):
+                cumulative += count
+                lines.append(f'{name}_bucket{_labels(route=route, method=method, le=bound)} {cumulative}')
+            lines.append(f'{name}_sum{_labels(route=route, method=method)} {histogram.sum:.6f}')
+            lines.append(f'{name}_count{_labels(route=route, method=method)} {histogram.count}')
+
+
+def _labels(**labels):
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"') for value in labels.values())
+    return '{' + ','.join(f'{name}="{value}"' for name, value in zip(labels, escaped)) + '}'
+
+
+registry = Registry()
+
+
+def record_query(execute, sql, params, many, context):
+    """Execute wrapper on every connection: times the query for the request being measured, if any."""
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    return metrics(execute, sql, params, many, context)
+
+
+def install_query_recorder(sender=None, connection=None, **kwargs):
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+class MetricsMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'CORE_METRICS_ENABLED', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.server_timing = getattr(settings, 'CORE_METRICS_SERVER_TIMING', True)
+        self.threshold = getattr(settings, 'CORE_METRICS_QUERY_THRESHOLD', 20)
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        connection_created.connect(install_query_recorder, dispatch_uid='core.metrics')
+        for connection in connections.all(initialized_only=True):  # opened before the middleware loaded
+            install_query_recorder(connection=connection)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, metrics, time.perf_counter() - started)
+
+    async def __acall__(self, request):
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, metrics, time.perf_counter() - started)
+
+    def finish(self, request, response, metrics, duration):
+        match = request.resolver_match
+        route = (match.view_name or match.route) if match else 'unmatched'
+        registry.record(route, request.method, response.status_code, duration, metrics, self.threshold)
+        if metrics.queries > self.threshold:
+            sql, repeats = metrics.statements.most_common(1)[0]
+            logger.warning('%s %s ran %d queries (possible N+1); repeated %d times: %s',
+                           request.method, request.path, metrics.queries, repeats, sql[:300])
+        if self.server_timing:
+            parts = [f'db;dur={metrics.db_time * 1000:.2f};desc="{metrics.queries} queries"']
+            parts += [f'{phase};dur={seconds * 1000:.2f}' for phase, seconds in metrics.phases.items()]
+            parts.append(f'total;dur={duration * 1000:.2f}')
+            response['Server-Timing'] = ', '.join(parts)
+        return response
+
+    def process_template_response(self, request, response):
+        # DRF responses are rendered right after this hook; the callback runs once rendering is done
+        metrics, started = _current.get(), time.perf_counter()
+        if metrics is not None and hasattr(response, 'add_post_render_callback'):
+            response.add_post_render_callback(lambda r: metrics.add('render', time.perf_counter() - started))
+        return response
+
+
+def metrics_view(request):
+    expected = getattr(settings, 'CORE_METRICS_TOKEN', '')
+    supplied = request.headers.get('Authorization', '')
+    if expected and not hmac.compare_digest(supplied.encode(), f'Bearer {expected}'.encode()):
+        return HttpResponse(status=401)
+    return HttpResponse(registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -0,0 +1,58 @@
+# Generated by Django 5.1.7 on 2026-10-17 16:11
+
+from django.db import migrations, models
+
+TRIGRAM_TABLES = ['core_employee', 'core_inventoryitem', 'core_product']
+
+
+def create_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for table in TRIGRAM_TABLES:
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {table}_name_trgm ON {table} USING gin (UPPER(name) gin_trgm_ops)'
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for table in TRIGRAM_TABLES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS {table}_name_trgm')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_tombstone'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='employee',
+            name='name',
+            field=models.CharField(db_index=True, max_length=100),
+        ),
+        migrations.AlterField(
+            model_name='inventoryitem',
+            name='name',
+            field=models.CharField(db_index=True, max_length=100),
+        ),
+        migrations.AlterField(
+            model_name='inventoryitem',
+            name='quantity',
+            field=models.IntegerField(db_index=True),
+        ),
+        migrations.AlterField(
+            model_name='product',
+            name='name',
+            field=models.CharField(db_index=True, max_length=100),
+        ),
+        migrations.AlterField(
+            model_name='product',
+            name='price',
+            field=models.FloatField(db_index=True),
+        ),
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.1.7 on 2026-10-17 16:12
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_indexes_for_name_filters'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AttendanceEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('event_type', models.CharField(choices=[('in', 'Clock in'), ('out', 'Clock out')], max_length=10)),
+                ('timestamp', models.DateTimeField()),
+                ('source', models.CharField(blank=True, max_length=100)),
+                ('idempotency_key', models.CharField(max_length=64, unique=True)),
+                ('received_at', models.DateTimeField(auto_now_add=True)),
+                ('employee', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='attendance_events', to='core.employee')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['employee', 'timestamp'], name='core_attend_employe_2d7dcb_idx')],
+            },
+        ),
+    ]
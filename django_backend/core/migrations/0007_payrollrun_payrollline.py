@@ -0,0 +1,46 @@
+# Generated by Django 5.1.7 on 2026-10-17 16:13
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_attendanceevent'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PayrollRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period_start', models.DateField()),
+                ('period_end', models.DateField()),
+                ('standard_hours', models.FloatField()),
+                ('overtime_multiplier', models.FloatField()),
+                ('deduction_rate', models.FloatField()),
+                ('employee_count', models.IntegerField(default=0)),
+                ('total_gross', models.FloatField(default=0)),
+                ('total_net', models.FloatField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='PayrollLine',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('base_salary', models.FloatField()),
+                ('hours', models.FloatField()),
+                ('overtime_hours', models.FloatField()),
+                ('gross', models.FloatField()),
+                ('deductions', models.FloatField()),
+                ('net', models.FloatField()),
+                ('employee', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='payroll_lines', to='core.employee')),
+                ('run', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='lines', to='core.payrollrun')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('run', 'employee'), name='unique_payroll_line')],
+            },
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.1.7 on 2026-10-17 16:14
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_payrollrun_payrollline'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RollupCheckpoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+                ('refreshed_at', models.DateTimeField()),
+            ],
+        ),
+        migrations.CreateModel(
+            name='DailyAttendanceSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(db_index=True)),
+                ('first_in', models.DateTimeField(null=True)),
+                ('last_out', models.DateTimeField(null=True)),
+                ('hours', models.FloatField(default=0)),
+                ('event_count', models.IntegerField(default=0)),
+                ('late', models.BooleanField(default=False)),
+                ('refreshed_at', models.DateTimeField(auto_now=True)),
+                ('employee', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_attendance', to='core.employee')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('employee', 'date'), name='unique_daily_attendance')],
+            },
+        ),
+    ]
@@ -33,31 +33,106 @@ Current Implementation
 
 2. Employee Model
     class Employee(models.Model):
-        name = models.CharField(max_length=100)
+        name = models.CharField(max_length=100, db_index=True)
         base_salary = models.FloatField()
+        updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
 - Basic employee information
 - Tracks name and salary
+- updated_at drives the ETag/Last-Modified validators of the API
+- name is indexed for the ?name__istartswith= / ?search= API filters
 
 3. InventoryItem Model
     class InventoryItem(models.Model):
-        name = models.CharField(max_length=100)
-        quantity = models.IntegerField()
+        name = models.CharField(max_length=100, db_index=True)
+        quantity = models.IntegerField(db_index=True)
         unit = models.CharField(max_length=20)
-        last_updated = models.DateTimeField(auto_now=True)
+        last_updated = models.DateTimeField(auto_now=True, db_index=True)
 
 - Inventory tracking system
-- Automated timestamp updates
+- Automated timestamp updates (indexed so Max('last_updated') is cheap)
+- name and quantity are indexed for the search and stock-threshold API filters
 
 4. Product Model
     class Product(models.Model):
-        name = models.CharField(max_length=100)
-        price = models.FloatField()
+        name = models.CharField(max_length=100, db_index=True)
+        price = models.FloatField(db_index=True)
         description = models.TextField(blank=True)
         image_url = models.URLField(blank=True)
+        updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
 - Product catalog information
 - Optional description and image
+- name and price are indexed for the search and price-range API filters
+
+On PostgreSQL, migration 0005 also adds pg_trgm GIN indexes on UPPER(name) for all three models,
+which is the expression Django uses for icontains/istartswith lookups.
+
+5. Tombstone Model
+    class Tombstone(models.Model):
+        model = models.CharField(max_length=100)
+        object_id = models.BigIntegerField()
+        deleted_at = models.DateTimeField(auto_now_add=True)
+
+- Written by a post_delete signal for Employee, InventoryItem and Product
+- Lets the /changes/ feed report deletions to incremental sync clients
+
+6. AttendanceEvent Model
+    class AttendanceEvent(models.Model):
+        employee = models.ForeignKey(Employee, on_delete=models.CASCADE)
+        event_type = models.CharField(max_length=10, choices=EVENT_TYPES)
+        timestamp = models.DateTimeField()
+        source = models.CharField(max_length=100, blank=True)
+        idempotency_key = models.CharField(max_length=64, unique=True)
+
+- One clock-in or clock-out from a badge reader or other device
+- Append-only; idempotency_key lets devices retry a batch without creating duplicates
+- Composite (employee, timestamp) index for per-employee range queries
+
+7. PayrollRun / PayrollLine Models
+    class PayrollRun(models.Model):
+        period_start = models.DateField()
+        period_end = models.DateField()
+        ...totals...
+
+    class PayrollLine(models.Model):
+        run = models.ForeignKey(PayrollRun, on_delete=models.CASCADE)
+        employee = models.ForeignKey(Employee, on_delete=models.CASCADE)
+        hours, overtime_hours, gross, deductions, net
+
+- One PayrollRun per computation, one PayrollLine per employee (computed in payroll.py)
+
+8. DailyAttendanceSummary / RollupCheckpoint Models
+    class DailyAttendanceSummary(models.Model):
+        employee = models.ForeignKey(Employee, on_delete=models.CASCADE)
+        date = models.DateField()
+        first_in, last_out, hours, event_count, late
+
+- Precomputed per (employee, date) rollup of AttendanceEvent, maintained by rollups.py
+- RollupCheckpoint remembers when the rollup was last refreshed so that a refresh only
+  recomputes the days touched by events received since then
+
+9. Job Model
+    class Job(models.Model):
+        kind = models.CharField(max_length=50)
+        params = models.JSONField(default=dict)
+        status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='queued')
+        progress = models.FloatField(default=0)
+        result = models.JSONField(null=True)
+
+- A unit of background work (payroll run, import, export) claimed by `manage.py run_workers`
+- The queue lives in the database; no external broker is needed (jobs.py)
+- A running job is leased to its worker until locked_until; the worker renews the lease while it
+  runs, and a job whose lease ran out (worker killed) is claimed again, up to CORE_JOB_MAX_ATTEMPTS
+
+10. StockMovement Model
+    class StockMovement(models.Model):
+        item = models.ForeignKey(InventoryItem, on_delete=models.CASCADE)
+        delta = models.IntegerField()
+        quantity_after = models.IntegerField()
+        reason, reference, user, created_at
+
+- Append-only ledger of the signed stock adjustments applied by POST /inventory/adjust/ (stock.py)
 
 How to extend:
 1. Add new fields to existing models:
@@ -94,21 +169,135 @@ class User(AbstractUser):
     role = models.CharField(max_length=20, choices=ROLE_CHOICES, default='employee')
 
 class Employee(models.Model):
-    name = models.CharField(max_length=100)
+    name = models.CharField(max_length=100, db_index=True)
     #position = models.CharField(max_length=100)
     base_salary = models.FloatField()
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
     
     def __str__(self):
         return self.name
 
 class InventoryItem(models.Model):
-    name = models.CharField(max_length=100)
-    quantity = models.IntegerField()
+    name = models.CharField(max_length=100, db_index=True)
+    quantity = models.IntegerField(db_index=True)
     unit = models.CharField(max_length=20)
-    last_updated = models.DateTimeField(auto_now=True)
+    last_updated = models.DateTimeField(auto_now=True, db_index=True)
 
 class Product(models.Model):
-    name = models.CharField(max_length=100)
-    price = models.FloatField()
+    name = models.CharField(max_length=100, db_index=True)
+    price = models.FloatField(db_index=True)
     description = models.TextField(blank=True)
     image_url = models.URLField(blank=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+class Tombstone(models.Model):
+    model = models.CharField(max_length=100)
+    object_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [models.Index(fields=['model', 'deleted_at'])]
+
+class AttendanceEvent(models.Model):
+    CLOCK_IN = 'in'
+    CLOCK_OUT = 'out'
+    EVENT_TYPES = (
+        (CLOCK_IN, 'Clock in'),
+        (CLOCK_OUT, 'Clock out'),
+    )
+    employee = models.ForeignKey(Employee, on_delete=models.CASCADE, related_name='attendance_events')
+    event_type = models.CharField(max_length=10, choices=EVENT_TYPES)
+    timestamp = models.DateTimeField()
+    source = models.CharField(max_length=100, blank=True)
+    idempotency_key = models.CharField(max_length=64, unique=True)
+    received_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [models.Index(fields=['employee', 'timestamp'])]
+
+class PayrollRun(models.Model):
+    period_start = models.DateField()
+    period_end = models.DateField()
+    standard_hours = models.FloatField()
+    overtime_multiplier = models.FloatField()
+    deduction_rate = models.FloatField()
+    employee_count = models.IntegerField(default=0)
+    total_gross = models.FloatField(default=0)
+    total_net = models.FloatField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+class PayrollLine(models.Model):
+    run = models.ForeignKey(PayrollRun, on_delete=models.CASCADE, related_name='lines')
+    employee = models.ForeignKey(Employee, on_delete=models.CASCADE, related_name='payroll_lines')
+    base_salary = models.FloatField()
+    hours = models.FloatField()
+    overtime_hours = models.FloatField()
+    gross = models.FloatField()
+    deductions = models.FloatField()
+    net = models.FloatField()
+
+    class Meta:
+        constraints = [models.UniqueConstraint(fields=['run', 'employee'], name='unique_payroll_line')]
+
+class DailyAttendanceSummary(models.Model):
+    employee = models.ForeignKey(Employee, on_delete=models.CASCADE, related_name='daily_attendance')
+    date = models.DateField(db_index=True)
+    first_in = models.DateTimeField(null=True)
+    last_out = models.DateTimeField(null=True)
+    hours = models.FloatField(default=0)
+    event_count = models.IntegerField(default=0)
+    late = models.BooleanField(default=False)
+    refreshed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [models.UniqueConstraint(fields=['employee', 'date'], name='unique_daily_attendance')]
+
+class RollupCheckpoint(models.Model):
+    name = models.CharField(max_length=100, unique=True)
+    refreshed_at = models.DateTimeField()
+
+class Job(models.Model):
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    SUCCEEDED = 'succeeded'
+    FAILED = 'failed'
+    STATUS_CHOICES = (
+        (QUEUED, 'Queued'),
+        (RUNNING, 'Running'),
+        (SUCCEEDED, 'Succeeded'),
+        (FAILED, 'Failed'),
+    )
+    kind = models.CharField(max_length=50)
+    params = models.JSONField(default=dict)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=QUEUED)
+    progress = models.FloatField(default=0)
+    message = models.CharField(max_length=200, blank=True)
+    result = models.JSONField(null=True)
+    error = models.TextField(blank=True)
+    worker = models.CharField(max_length=100, blank=True)
+    locked_until = models.DateTimeField(null=True)
+    attempts = models.IntegerField(default=0)
+    submitted_by = models.ForeignKey(User, null=True, on_delete=models.SET_NULL, related_name='jobs')
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True)
+    finished_at = models.DateTimeField(null=True)
+
+    class Meta:
+        indexes = [models.Index(fields=['status', 'created_at'])]
+
+class StockMovement(models.Model):
+    item = models.ForeignKey(InventoryItem, on_delete=models.CASCADE, related_name='movements')
+    delta = models.IntegerField()
+    quantity_after = models.IntegerField()
+    reason = models.CharField(max_length=100, blank=True)
+    reference = models.CharField(max_length=100, blank=True)
+    user = models.ForeignKey(User, null=True, on_delete=models.SET_NULL, related_name='stock_movements')
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        indexes = [models.Index(fields=['item', 'created_at'])]
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            raise ValueError('Stock movements are append-only.')
+        super().save(*args, **kwargs)
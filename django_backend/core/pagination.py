@@ -0,0 +1,33 @@
+"""
+Django Pagination.py - Purpose and Relationship
+
+Theoretical Understanding
+The pagination.py file controls how list endpoints split large querysets into pages. Instead of
+LIMIT/OFFSET (which makes the database walk and discard every skipped row), the classes here use
+keyset/cursor pagination: each page remembers the last ordering value it returned and the next
+query starts with `WHERE id < <last id>`. Deep pages therefore cost the same as the first page.
+
+Relationship with Other Components
+1. Views (views.py)
+- ViewSets pick a paginator through `pagination_class`
+- The paginator slices the ViewSet's queryset before it is serialized
+
+2. Settings (settings.py)
+- REST_FRAMEWORK['PAGE_SIZE'] sets the default page size
+- CORE_MAX_PAGE_SIZE caps the `?page_size=` query parameter
+
+Current Implementation
+1. CoreCursorPagination
+- Orders by `-id` (unique and indexed, so the ordering is stable)
+- Returns opaque `next`/`previous` cursor links
+- Clients may ask for a different page size with `?page_size=`
+"""
+
+from django.conf import settings
+from rest_framework.pagination import CursorPagination
+
+
+class CoreCursorPagination(CursorPagination):
+    ordering = '-id'
+    page_size_query_param = 'page_size'
+    max_page_size = getattr(settings, 'CORE_MAX_PAGE_SIZE', 1000)
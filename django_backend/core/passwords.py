@@ -0,0 +1,138 @@
+"""
+Django Passwords.py - Purpose and Relationship
+
+Theoretical Understanding
+Checking a password means recomputing a deliberately slow hash (PBKDF2 with 1,000,000 iterations by
+default, tens to hundreds of milliseconds of CPU). When hundreds of employees log in at shift start,
+every request thread hashes at once: the CPU is oversubscribed, every login gets slower together and
+the other endpoints stall behind them. The login pipeline in this file:
+
+1. Bounds the hashing: checks run in a pool of CORE_LOGIN_WORKERS threads (hashlib and argon2-cffi
+   release the GIL while hashing, so threads use all cores). Up to CORE_LOGIN_QUEUE more logins wait
+   for a free worker; beyond that a login waits at most CORE_LOGIN_QUEUE_TIMEOUT seconds for a slot
+   and then fails fast with LoginBusy (503 + Retry-After) instead of piling up.
+2. Rehashes on login: settings.PASSWORD_HASHERS lists the preferred hasher (CORE_PASSWORD_HASHER:
+   pbkdf2, scrypt or argon2) first. A correct password stored with another hasher, or with weaker
+   parameters, is rehashed with the preferred one in the same pool task and saved, so stored hashes
+   move to the new algorithm as users log in.
+3. Saves queries: the user is loaded together with their API token (select_related on the reverse
+   one-to-one), so a login that reuses its token costs one query.
+
+Unknown usernames still pay for one hash, as with Django's ModelBackend, so response times do not
+reveal which usernames exist.
+
+Relationship with Other Components
+1. Settings (settings.py)
+- AUTHENTICATION_BACKENDS uses PooledModelBackend, so authenticate() (LoginView, admin login, Basic
+  auth) goes through the pool
+- PASSWORD_HASHERS, CORE_PASSWORD_HASHER, CORE_LOGIN_WORKERS, CORE_LOGIN_QUEUE,
+  CORE_LOGIN_QUEUE_TIMEOUT
+
+2. Views (views.py) and middleware
+- LoginView returns the token loaded with the user
+- LoginBusy is a DRF APIException (503, Retry-After: 1), so DRF views answer it the same way wherever
+  authenticate() runs (LoginView, Basic auth); LoginBusyMiddleware does the same for plain Django
+  views such as the admin login
+
+3. Benchmarks (benchmarks/logins.py)
+- Logins per second per core for each hasher, and queries per login
+"""
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.hashers import check_password, make_password
+from django.http import HttpResponse
+from django.utils.deprecation import MiddlewareMixin
+from rest_framework.exceptions import APIException
+
+
+class LoginBusy(APIException):
+    """Every hashing worker and queue slot is taken; the client should retry shortly."""
+    status_code = 503
+    default_detail = 'Too many logins in progress, retry shortly.'
+    default_code = 'login_busy'
+    wait = 1  # Retry-After, set by DRF's exception handler
+
+
+class LoginBusyMiddleware(MiddlewareMixin):
+    """503 + Retry-After for LoginBusy raised outside DRF (the admin login, Django's auth views)."""
+
+    def process_exception(self, request, exception):
+        if not isinstance(exception, LoginBusy):
+            return None
+        response = HttpResponse(LoginBusy.default_detail, status=503, content_type='text/plain; charset=utf-8')
+        response['Retry-After'] = str(LoginBusy.wait)
+        return response
+
+
+class HashPool:
+    def __init__(self, workers, queue_size=0, timeout=0.0):
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='core-login')
+        self.slots = threading.BoundedSemaphore(workers + queue_size)
+        self.timeout = timeout
+
+    def run(self, fn, *args):
+        """Run fn(*args) on a pool thread and return its result; raise LoginBusy if no slot frees up."""
+        if not self.slots.acquire(timeout=self.timeout):
+            raise LoginBusy
+        try:
+            future = self.executor.submit(fn, *args)
+        except BaseException:
+            self.slots.release()
+            raise
+        future.add_done_callback(lambda _: self.slots.release())
+        return future.result()
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = HashPool(
+                    getattr(settings, 'CORE_LOGIN_WORKERS', None) or os.cpu_count() or 1,
+                    getattr(settings, 'CORE_LOGIN_QUEUE', 64),
+                    getattr(settings, 'CORE_LOGIN_QUEUE_TIMEOUT', 2.0),
+                )
+    return _pool
+
+
+def verify_password(password, encoded):
+    """Return (valid, new encoded hash or None); the rehash is computed here, on the same thread."""
+    rehashed = []
+    valid = check_password(password, encoded, setter=lambda raw: rehashed.append(make_password(raw)))
+    return valid, (rehashed[0] if rehashed else None)
+
+
+class PooledModelBackend(ModelBackend):
+    """ModelBackend that hashes in the login pool and loads the user's token with the user."""
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        UserModel = get_user_model()
+        if username is None:
+            username = kwargs.get(UserModel.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+        try:
+            user = UserModel._default_manager.select_related('auth_token').get(
+                **{UserModel.USERNAME_FIELD: username}
+            )
+        except UserModel.DoesNotExist:
+            get_pool().run(make_password, password)  # same cost as a real check
+            return None
+        valid, rehashed = get_pool().run(verify_password, password, user.password)
+        if rehashed:
+            user.password = rehashed
+            user.save(update_fields=['password'])
+        if valid and self.user_can_authenticate(user):
+            return user
+        return None
@@ -0,0 +1,157 @@
+"""
+Django Payroll.py - Purpose and Relationship
+
+Theoretical Understanding
+The payroll.py file computes gross and net pay for every employee in one pass. The inputs are
+loaded as columns with `values_list` (no model instances) and turned into NumPy arrays, and every
+rule is an array expression over all employees at once. There is no per-employee Python loop, so a
+run over 100k employees and millions of clock events takes seconds.
+
+Pay rules (per run, defaults from settings.CORE_PAYROLL)
+- hours:           sum of clock-in -> next clock-out intervals inside the period
+- hourly rate:     base_salary / standard_hours
+- overtime hours:  max(hours - standard_hours, 0)
+- gross:           base_salary + overtime_hours * hourly rate * overtime_multiplier
+- deductions:      gross * deduction_rate
+- net:             gross - deductions
+
+Consistency
+Salaries and clock events are read by separate queries. Both run in one transaction, at
+REPEATABLE READ on PostgreSQL (SQLite transactions are serializable), so they see the same
+snapshot and a salary change or event committed between them cannot end up half in the run. The
+snapshot is taken on the database reads are routed to (a replica inside use_replica(), see the
+payroll_run job); the run is then written to the primary in a transaction of its own.
+
+Relationship with Other Components
+1. Models (models.py)
+- Reads Employee.base_salary and AttendanceEvent rows, writes PayrollRun and PayrollLine
+
+2. Views (views.py)
+- PayrollRunViewSet exposes POST /payroll/runs/ and GET /payroll/runs/<id>/lines/
+
+3. Jobs (jobs.py)
+- The payroll_run job calls run_payroll() with a progress callback
+"""
+
+from contextlib import contextmanager
+from datetime import datetime, time, timedelta
+from itertools import islice
+
+import numpy as np
+from django.conf import settings
+from django.db import connections, router, transaction
+from django.utils import timezone
+
+from .attendance import paired_intervals
+from .models import AttendanceEvent, Employee, PayrollLine, PayrollRun
+
+def payroll_parameters(overrides=None):
+    """settings.CORE_PAYROLL, with the keys it defines replaced by `overrides`."""
+    params = dict(settings.CORE_PAYROLL)
+    params.update({key: float(value) for key, value in (overrides or {}).items() if key in params})
+    return params
+
+
+def worked_hours(employee_ids, event_employees, event_is_in, event_seconds):
+    """Sum clock-in -> clock-out intervals per employee.
+
+    employee_ids must be sorted; the event arrays must be sorted by (employee, timestamp).
+    """
+    starts, durations = paired_intervals(event_employees, event_is_in, event_seconds)
+    positions = np.searchsorted(employee_ids, event_employees[starts])
+    return np.bincount(positions, weights=durations, minlength=len(employee_ids))
+
+
+def compute_pay(base_salary, hours, params):
+    standard_hours = params['standard_hours']
+    rate = base_salary / standard_hours
+    overtime_hours = np.maximum(hours - standard_hours, 0.0)
+    gross = base_salary + overtime_hours * rate * params['overtime_multiplier']
+    deductions = gross * params['deduction_rate']
+    return {
+        'overtime_hours': overtime_hours,
+        'gross': gross,
+        'deductions': deductions,
+        'net': gross - deductions,
+    }
+
+
+@contextmanager
+def read_snapshot(using):
+    """A transaction on `using` whose queries all read the same snapshot."""
+    connection = connections[using]
+    outermost = not connection.in_atomic_block
+    with transaction.atomic(using=using):
+        if outermost and connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:  # must be the transaction's first statement
+                cursor.execute('SET TRANSACTION ISOLATION LEVEL REPEATABLE READ')
+        yield
+
+
+def _load_events(period_start, period_end, using='default'):
+    start = timezone.make_aware(datetime.combine(period_start, time.min))
+    end = timezone.make_aware(datetime.combine(period_end + timedelta(days=1), time.min))
+    rows = (
+        AttendanceEvent.objects.using(using)
+        .filter(timestamp__gte=start, timestamp__lt=end)
+        .order_by('employee_id', 'timestamp')
+        .values_list('employee_id', 'event_type', 'timestamp')
+    )
+    employees, kinds, stamps = [], [], []
+    for employee_id, event_type, timestamp in rows.iterator(chunk_size=10000):
+        employees.append(employee_id)
+        kinds.append(event_type == AttendanceEvent.CLOCK_IN)
+        stamps.append(timestamp.timestamp())
+    return (
+        np.asarray(employees, dtype=np.int64),
+        np.asarray(kinds, dtype=bool),
+        np.asarray(stamps, dtype=np.float64),
+    )
+
+
+def run_payroll(period_start, period_end, overrides=None, batch_size=5000, progress=None):
+    """Compute and store a PayrollRun for every employee; returns the run.
+
+    progress(fraction, message), when given, is called after the load and after each batch of lines.
+    """
+    progress = progress or (lambda fraction, message='': None)
+    params = payroll_parameters(overrides)
+    progress(0.0, 'Loading salaries and clock events')
+    source = router.db_for_read(Employee)
+    with read_snapshot(source):
+        columns = list(Employee.objects.using(source).order_by('id').values_list('id', 'base_salary'))
+        events = _load_events(period_start, period_end, source)
+    employee_ids = np.asarray([row[0] for row in columns], dtype=np.int64)
+    base_salary = np.asarray([row[1] for row in columns], dtype=np.float64)
+
+    progress(0.3, 'Computing pay')
+    hours = worked_hours(employee_ids, *events)
+    pay = compute_pay(base_salary, hours, params)
+    progress(0.4, 'Writing payroll lines')
+
+    with transaction.atomic():
+        run = PayrollRun.objects.create(
+            period_start=period_start,
+            period_end=period_end,
+            employee_count=len(employee_ids),
+            total_gross=float(pay['gross'].sum()),
+            total_net=float(pay['net'].sum()),
+            **params,
+        )
+        rows = zip(
+            employee_ids.tolist(), base_salary.tolist(), hours.tolist(),
+            pay['overtime_hours'].tolist(), pay['gross'].tolist(),
+            pay['deductions'].tolist(), pay['net'].tolist(),
+        )
+        written = 0
+        while batch := list(islice(rows, batch_size)):
+            PayrollLine.objects.bulk_create([
+                PayrollLine(
+                    run=run, employee_id=employee_id, base_salary=salary, hours=worked,
+                    overtime_hours=overtime, gross=gross, deductions=deductions, net=net,
+                )
+                for employee_id, salary, worked, overtime, gross, deductions, net in batch
+            ])
+            written += len(batch)
+            progress(0.4 + 0.6 * written / len(employee_ids), 'Writing payroll lines')
+    return run
@@ -0,0 +1,65 @@
+"""
+Django Renderers.py - Purpose and Relationship
+
+Theoretical Understanding
+DRF's JSONRenderer encodes responses with the standard library's json module, which is written
+largely in Python for the object walk; on a 10k-row list the encoding can cost more than the query.
+orjson does the same work in Rust, several times faster. The renderer and parser in this file use
+orjson when it is installed (pip install orjson) and fall back to DRF's stdlib classes otherwise, so
+the output does not depend on which one ran:
+
+- compact separators and UTF-8 output, like DRF's defaults (COMPACT_JSON, UNICODE_JSON)
+- datetime/date/time values are passed to DRF's encoder, so they keep DRF's format (ISO 8601,
+  milliseconds, "Z" for UTC); serializer output already holds strings for these fields
+- floats (Employee.base_salary, Product.price) use the shortest round-trip representation, as
+  json.dumps does. NaN and Infinity are not valid JSON: DRF raises on them, orjson writes null.
+- anything orjson cannot encode (e.g. integers wider than 64 bits) is retried with the stdlib path
+- a request for indented output (?format=json with indent in the Accept header) uses the stdlib path
+
+Relationship with Other Components
+1. Settings (settings_production.py)
+- DEFAULT_RENDERER_CLASSES / DEFAULT_PARSER_CLASSES select these classes in production
+
+2. Views (async_views.py)
+- The async read views render with ORJSONRenderer
+
+3. Benchmarks
+- benchmarks/json_rendering.py compares both renderers on a 10k-row payload
+"""
+
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+_default = JSONEncoder().default
+
+
+class ORJSONRenderer(JSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+        if data is None:
+            return b''
+        try:
+            return orjson.dumps(
+                data, default=_default, option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS,
+            )
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+
+
+class ORJSONParser(JSONParser):
+    def parse(self, stream, media_type=None, parser_context=None):
+        encoding = (parser_context or {}).get('encoding', 'utf-8')
+        if orjson is None or encoding.lower().replace('-', '') != 'utf8':
+            return super().parse(stream, media_type, parser_context)
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f'JSON parse error - {exc}')
@@ -0,0 +1,168 @@
+"""
+Django Replicas.py - Purpose and Relationship
+
+Theoretical Understanding
+List, export and report reads are most of the database load, and on a single connection they compete
+with writes. The replicas.py file sends safe reads of the core API to read replicas listed in
+settings.CORE_READ_REPLICAS, and everything else to the primary (`default`):
+
+1. Route:   ReplicaMiddleware marks a request as "replica" when it is a GET/HEAD/OPTIONS served by a
+            core view that is not primary-only. ReplicaRouter then sends reads of core models made
+            during that request to a random replica. Writes always go to the primary.
+2. Stick:   replicas lag behind the primary, so a client that has just written could read its old
+            data back. After any other method, the client (identified by its Authorization header or
+            session cookie) is pinned to the primary for CORE_REPLICA_PIN_SECONDS. The pin is stored
+            in Django's cache, so it needs a cache shared by all workers to hold across processes.
+3. Opt out: views whose reads must be current are marked with @primary_only (a ViewSet class, one
+            action, or a plain view). use_primary()/use_replica() set the route for code that runs
+            outside a request, such as background jobs.
+
+Without CORE_READ_REPLICAS every read goes to the primary, as before. The middleware runs natively in
+both the WSGI and the ASGI stack, so async views are not pushed through a sync adapter.
+
+Relationship with Other Components
+1. Settings (settings.py)
+- DATABASES holds the replica aliases, DATABASE_ROUTERS and MIDDLEWARE enable the routing
+- CORE_READ_REPLICAS, CORE_REPLICA_PIN_SECONDS
+
+2. Views (views.py, async_views.py)
+- GETs on the core ViewSets and async views read from replicas; ExportMixin binds its queryset to
+  the chosen database before streaming, because the body is produced after the middleware returns
+
+3. Jobs (jobs.py)
+- The payroll_run and export jobs read their inputs from a replica. The attendance rollup stays on
+  the primary: its checkpoint must not skip events that have not reached a replica yet.
+"""
+
+import contextvars
+import hashlib
+import random
+from contextlib import contextmanager
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+_use_replica = contextvars.ContextVar('core_use_replica', default=False)
+
+
+def replica_aliases():
+    return [alias for alias in getattr(settings, 'CORE_READ_REPLICAS', []) if alias in settings.DATABASES]
+
+
+@contextmanager
+def use_replica():
+    """Read core models from a replica inside the block."""
+    token = _use_replica.set(True)
+    try:
+        yield
+    finally:
+        _use_replica.reset(token)
+
+
+@contextmanager
+def use_primary():
+    """Read core models from the primary inside the block."""
+    token = _use_replica.set(False)
+    try:
+        yield
+    finally:
+        _use_replica.reset(token)
+
+
+def primary_only(view):
+    """Mark a view, ViewSet or ViewSet action as always reading from the primary."""
+    view.primary_only = True
+    return view
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if model._meta.app_label != 'core' or not _use_replica.get():
+            return None
+        replicas = replica_aliases()
+        return random.choice(replicas) if replicas else None
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True  # the replicas hold the same data as the primary
+
+
+def _pin_key(request):
+    credential = request.META.get('HTTP_AUTHORIZATION') or request.COOKIES.get(settings.SESSION_COOKIE_NAME)
+    if not credential:
+        return None
+    return 'core:pin:' + hashlib.sha256(credential.encode()).hexdigest()
+
+
+def _is_primary_only(view_func, method):
+    view_class = getattr(view_func, 'cls', None) or getattr(view_func, 'view_class', None)
+    owner = view_class or view_func
+    app = apps.get_containing_app_config(owner.__module__)
+    if app is None or app.label != 'core':
+        return True
+    if getattr(view_func, 'primary_only', False) or getattr(view_class, 'primary_only', False):
+        return True
+    actions = getattr(view_func, 'actions', None) or {}
+    handler = getattr(view_class, actions.get(method.lower(), method.lower()), None)
+    return getattr(handler, 'primary_only', False)
+
+
+class ReplicaMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.pin_seconds = getattr(settings, 'CORE_REPLICA_PIN_SECONDS', 5)
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        token = _use_replica.set(False)
+        try:
+            response = self.get_response(request)
+        finally:
+            _use_replica.reset(token)
+        key = self.pin_key(request)
+        if key:
+            cache.set(key, True, self.pin_seconds)
+        return response
+
+    async def __acall__(self, request):
+        token = _use_replica.set(False)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _use_replica.reset(token)
+        key = self.pin_key(request)
+        if key:
+            await cache.aset(key, True, self.pin_seconds)
+        return response
+
+    @staticmethod
+    def pin_key(request):
+        """The cache key to pin the client to the primary with, or None when no pin is needed."""
+        if request.method in SAFE_METHODS or not replica_aliases():
+            return None
+        return _pin_key(request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if request.method not in SAFE_METHODS or not replica_aliases():
+            return None
+        if _is_primary_only(view_func, request.method):
+            return None
+        key = _pin_key(request)
+        if key and cache.get(key):
+            return None
+        _use_replica.set(True)
+        return None
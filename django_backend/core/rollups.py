@@ -0,0 +1,190 @@
+"""
+Django Rollups.py - Purpose and Relationship
+
+Theoretical Understanding
+Reports such as "hours per employee per day" or "late arrivals this week" would otherwise scan raw
+clock events on every request. The rollups.py file maintains DailyAttendanceSummary, a precomputed
+table keyed by (employee, date), and refreshes it incrementally:
+
+1. read the RollupCheckpoint (the time of the previous refresh)
+2. find the (employee, date) pairs touched by events *received* since then
+   (the previous day is included too, because an overnight clock-out changes the hours of the day
+   the shift started)
+3. load the events of those pairs as NumPy columns and recompute only the touched pairs. Each
+   employee's touched days are merged into date ranges, and employees with the same range share
+   one `employee_id IN (...) AND timestamp in range` clause. A backfilled event from months ago
+   therefore loads only that employee's days, not every event since.
+4. upsert them with bulk_create(update_conflicts=True), which compiles to
+   INSERT ... ON CONFLICT (employee_id, date) DO UPDATE on both PostgreSQL and SQLite
+
+The first refresh (no checkpoint) rebuilds every day. The checkpoint is moved back by
+CORE_CHANGES_OVERLAP seconds, so events committed late by slow transactions are picked up by the next
+refresh.
+
+Relationship with Other Components
+1. Models (models.py)
+- Reads AttendanceEvent, writes DailyAttendanceSummary and RollupCheckpoint
+
+2. Views (views.py)
+- DailyAttendanceSummaryViewSet reads the rollup; POST /attendance/daily/refresh/ runs a refresh
+
+3. Management Commands
+- `python manage.py refresh_attendance_rollup` (schedule it with cron)
+"""
+
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+from functools import reduce
+from operator import or_
+
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .attendance import paired_intervals
+from .models import AttendanceEvent, DailyAttendanceSummary, RollupCheckpoint
+
+CHECKPOINT_NAME = 'daily_attendance'
+DAY_FACTOR = 1_000_000  # date ordinals are < 1e6, so employee_id * DAY_FACTOR + ordinal is unique
+WINDOW_CLAUSES = 200  # (date range, employees) clauses OR-ed into one query
+WINDOW_EMPLOYEES = 1000  # employee ids per clause
+
+
+def _local_ordinal(moment):
+    return timezone.localtime(moment).date().toordinal()
+
+
+def _touched_keys(since):
+    events = AttendanceEvent.objects.all()
+    if since is not None:
+        events = events.filter(received_at__gte=since)
+    keys = set()
+    for employee_id, timestamp in events.values_list('employee_id', 'timestamp').iterator(chunk_size=10000):
+        key = employee_id * DAY_FACTOR + _local_ordinal(timestamp)
+        keys.add(key)
+        keys.add(key - 1)
+    return keys
+
+
+def _event_windows(touched):
+    """Map (first_day, last_day) ranges to the employees whose touched days form that range."""
+    days_by_employee = defaultdict(list)
+    for key in touched:
+        employee_id, ordinal = divmod(key, DAY_FACTOR)
+        days_by_employee[employee_id].append(ordinal)
+    windows = defaultdict(list)
+    for employee_id, ordinals in days_by_employee.items():
+        ordinals.sort()
+        first = previous = ordinals[0]
+        for ordinal in ordinals[1:]:
+            if ordinal > previous + 1:
+                windows[(first, previous)].append(employee_id)
+                first = ordinal
+            previous = ordinal
+        windows[(first, previous)].append(employee_id)
+    return windows
+
+
+def _window_clauses(windows):
+    for (first_day, last_day), employee_ids in windows.items():
+        # up to the start of the day after last_day, where an overnight shift's clock-out lands
+        start = timezone.make_aware(datetime.combine(date.fromordinal(first_day), time.min))
+        end = timezone.make_aware(datetime.combine(date.fromordinal(last_day + 2), time.min))
+        for index in range(0, len(employee_ids), WINDOW_EMPLOYEES):
+            ids = employee_ids[index:index + WINDOW_EMPLOYEES]
+            yield Q(employee_id__in=ids, timestamp__gte=start, timestamp__lt=end)
+
+
+def _load_events(windows=None):
+    """Event columns sorted by (employee, timestamp): all events, or only those inside `windows`."""
+    events = AttendanceEvent.objects.all()
+    if windows is None:
+        querysets = [events]
+    else:
+        clauses = list(_window_clauses(windows))
+        querysets = [events.filter(reduce(or_, clauses[index:index + WINDOW_CLAUSES]))
+                     for index in range(0, len(clauses), WINDOW_CLAUSES)]
+    employees, kinds, stamps, days = [], [], [], []
+    for queryset in querysets:
+        rows = queryset.order_by('employee_id', 'timestamp').values_list('employee_id', 'event_type', 'timestamp')
+        for employee_id, event_type, timestamp in rows.iterator(chunk_size=10000):
+            employees.append(employee_id)
+            kinds.append(event_type == AttendanceEvent.CLOCK_IN)
+            stamps.append(timestamp.timestamp())
+            days.append(_local_ordinal(timestamp))
+    columns = (
+        np.asarray(employees, dtype=np.int64),
+        np.asarray(kinds, dtype=bool),
+        np.asarray(stamps, dtype=np.float64),
+        np.asarray(days, dtype=np.int64),
+    )
+    if len(querysets) > 1:  # each query is sorted, the concatenation is not
+        order = np.lexsort((columns[2], columns[0]))
+        columns = tuple(column[order] for column in columns)
+    return columns
+
+
+def summarize(employees, is_in, seconds, days):
+    """Aggregate sorted event columns per (employee, day) key with array operations."""
+    keys, groups = np.unique(employees * DAY_FACTOR + days, return_inverse=True)
+    counts = np.bincount(groups, minlength=len(keys))
+    starts, durations = paired_intervals(employees, is_in, seconds)
+    hours = np.bincount(groups[starts], weights=durations, minlength=len(keys))
+    first_in = np.full(len(keys), np.inf)
+    np.minimum.at(first_in, groups[is_in], seconds[is_in])
+    last_out = np.full(len(keys), -np.inf)
+    np.maximum.at(last_out, groups[~is_in], seconds[~is_in])
+    return keys, counts, hours, first_in, last_out
+
+
+def _is_late(first_in):
+    shift_start = time.fromisoformat(getattr(settings, 'CORE_SHIFT_START', '09:00'))
+    grace = timedelta(minutes=getattr(settings, 'CORE_LATE_GRACE_MINUTES', 5))
+    local = timezone.localtime(first_in)
+    return local > timezone.make_aware(datetime.combine(local.date(), shift_start)) + grace
+
+
+def _as_datetime(value):
+    return datetime.fromtimestamp(value, tz=timezone.get_current_timezone()) if np.isfinite(value) else None
+
+
+def refresh_daily_attendance(full=False, batch_size=5000):
+    """Recompute the summary rows touched since the last refresh; returns the number of rows written."""
+    started = timezone.now()
+    overlap = timedelta(seconds=getattr(settings, 'CORE_CHANGES_OVERLAP', 5))
+    with transaction.atomic():
+        checkpoint, created = RollupCheckpoint.objects.select_for_update().get_or_create(
+            name=CHECKPOINT_NAME, defaults={'refreshed_at': started}
+        )
+        since = None if full or created else checkpoint.refreshed_at - overlap
+        touched = _touched_keys(since)
+        written = 0
+        if touched:
+            windows = None if since is None else _event_windows(touched)
+            keys, counts, hours, first_in, last_out = summarize(*_load_events(windows))
+            rows = []
+            for index in np.flatnonzero(np.isin(keys, np.fromiter(touched, dtype=np.int64))).tolist():
+                employee_id, ordinal = divmod(int(keys[index]), DAY_FACTOR)
+                first = _as_datetime(first_in[index])
+                rows.append(DailyAttendanceSummary(
+                    employee_id=employee_id,
+                    date=date.fromordinal(ordinal),
+                    first_in=first,
+                    last_out=_as_datetime(last_out[index]),
+                    hours=float(hours[index]),
+                    event_count=int(counts[index]),
+                    late=first is not None and _is_late(first),
+                ))
+            DailyAttendanceSummary.objects.bulk_create(
+                rows,
+                batch_size=batch_size,
+                update_conflicts=True,
+                unique_fields=['employee', 'date'],
+                update_fields=['first_in', 'last_out', 'hours', 'event_count', 'late', 'refreshed_at'],
+            )
+            written = len(rows)
+        checkpoint.refreshed_at = started
+        checkpoint.save(update_fields=['refreshed_at'])
+    return written
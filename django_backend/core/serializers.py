@@ -32,25 +32,83 @@ Current Implementation
 - ProductSerializer: Manages product catalog data
 - UserSerializer: Limited user field exposure for security
 - RegisterSerializer: Special handling for user registration with password protection
+
+2. List Serializers
+- BulkListSerializer: Validates a batch of rows one by one so that invalid rows are
+  reported by index instead of rejecting the whole batch (used by the /bulk/ endpoints)
+- SparseFieldsetSerializer: Base of the Employee, InventoryItem and Product serializers; keeps only
+  the fields a request selected with ?fields= / ?exclude= (fieldsets.py)
+
+3. Attendance
+- AttendanceEventSerializer: Read representation of clock events
+- DailyAttendanceSummarySerializer: Read-only rollup rows (hours/late per employee per day)
+- AttendanceIngestSerializer: Plain Serializer for batched ingestion; takes employee_id as an integer
+  so a batch of thousands of events does not run one Employee lookup per row
+
+4. Payroll
+- PayrollRunSerializer: Period and optional rule overrides in, run totals out
+- PayrollLineSerializer: One employee's computed pay
+
+5. Jobs
+- JobSerializer: kind and params in; status, progress and timestamps out (result via /result/)
+- PayrollJobParamsSerializer, RefreshAttendanceJobParamsSerializer, ImportJobParamsSerializer,
+  ExportJobParamsSerializer: the params each job kind accepts, checked when the job is submitted
+
+6. Stock
+- StockAdjustmentSerializer: Plain Serializer for one signed adjustment {"id", "delta", ...}
+- StockMovementSerializer: Read representation of the stock ledger
 """
 
 from rest_framework import serializers
-from .models import Employee, InventoryItem, Product, User
 
-class EmployeeSerializer(serializers.ModelSerializer):
+from .exports import EXPORT_FORMATS
+from .metrics import timed
+from .models import (
+    AttendanceEvent, DailyAttendanceSummary, Employee, InventoryItem, Job, PayrollLine, PayrollRun, Product,
+    StockMovement, User,
+)
+
+class BulkListSerializer(serializers.ListSerializer):
+    def to_representation(self, data):
+        with timed('serialize'):
+            return super().to_representation(data)
+
+    def partition(self, data):
+        """Split raw rows into ([(index, validated_data)], [{'index', 'errors'}])."""
+        valid, errors = [], []
+        for index, row in enumerate(data):
+            try:
+                valid.append((index, self.child.run_validation(row)))
+            except serializers.ValidationError as exc:
+                errors.append({'index': index, 'errors': exc.detail})
+        return valid, errors
+
+class SparseFieldsetSerializer(serializers.ModelSerializer):
+    """ModelSerializer that keeps only the fields named by `fields` (?fields= / ?exclude=, see fieldsets.py)."""
+
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+class EmployeeSerializer(SparseFieldsetSerializer):
     class Meta:
         model = Employee
         fields = '__all__'
+        list_serializer_class = BulkListSerializer
 
-class InventoryItemSerializer(serializers.ModelSerializer):
+class InventoryItemSerializer(SparseFieldsetSerializer):
     class Meta:
         model = InventoryItem
         fields = '__all__'
+        list_serializer_class = BulkListSerializer
 
-class ProductSerializer(serializers.ModelSerializer):
+class ProductSerializer(SparseFieldsetSerializer):
     class Meta:
         model = Product
         fields = '__all__'
+        list_serializer_class = BulkListSerializer
 
 class UserSerializer(serializers.ModelSerializer):
     class Meta:
@@ -66,3 +124,117 @@ class RegisterSerializer(serializers.ModelSerializer):
     def create(self, validated_data):
         user = User.objects.create_user(**validated_data)
         return user
+
+class AttendanceEventSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = AttendanceEvent
+        fields = '__all__'
+
+class DailyAttendanceSummarySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = DailyAttendanceSummary
+        fields = '__all__'
+
+class AttendanceIngestSerializer(serializers.Serializer):
+    employee_id = serializers.IntegerField(min_value=1)
+    event_type = serializers.ChoiceField(choices=AttendanceEvent.EVENT_TYPES)
+    timestamp = serializers.DateTimeField()
+    source = serializers.CharField(max_length=100, required=False, allow_blank=True, default='')
+    idempotency_key = serializers.CharField(max_length=64)
+
+    class Meta:
+        list_serializer_class = BulkListSerializer
+
+class PayrollRunSerializer(serializers.ModelSerializer):
+    standard_hours = serializers.FloatField(min_value=1, required=False)
+    overtime_multiplier = serializers.FloatField(min_value=0, required=False)
+    deduction_rate = serializers.FloatField(min_value=0, max_value=1, required=False)
+
+    class Meta:
+        model = PayrollRun
+        fields = '__all__'
+        read_only_fields = ['employee_count', 'total_gross', 'total_net', 'created_at']
+
+    def validate(self, attrs):
+        if attrs['period_end'] < attrs['period_start']:
+            raise serializers.ValidationError({'period_end': 'Must not be before period_start.'})
+        return attrs
+
+class PayrollLineSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = PayrollLine
+        exclude = ['run']
+
+class JobSerializer(serializers.ModelSerializer):
+    params = serializers.DictField(required=False)
+
+    class Meta:
+        model = Job
+        exclude = ['result']
+        read_only_fields = [
+            'status', 'progress', 'message', 'error', 'worker', 'submitted_by',
+            'created_at', 'started_at', 'finished_at',
+        ]
+
+    def validate_kind(self, value):
+        from .jobs import JOB_HANDLERS
+        if value not in JOB_HANDLERS:
+            raise serializers.ValidationError(f'Unknown job kind. Choose from: {", ".join(sorted(JOB_HANDLERS))}.')
+        return value
+
+    def validate(self, attrs):
+        from .jobs import clean_params
+        try:
+            attrs['params'] = clean_params(attrs['kind'], attrs.get('params'))
+        except serializers.ValidationError as exc:
+            raise serializers.ValidationError({'params': exc.detail})
+        return attrs
+
+class PayrollJobParamsSerializer(serializers.Serializer):
+    period_start = serializers.DateField()
+    period_end = serializers.DateField()
+    standard_hours = serializers.FloatField(min_value=1, required=False)
+    overtime_multiplier = serializers.FloatField(min_value=0, required=False)
+    deduction_rate = serializers.FloatField(min_value=0, max_value=1, required=False)
+
+    def validate(self, attrs):
+        if attrs['period_end'] < attrs['period_start']:
+            raise serializers.ValidationError({'period_end': 'Must not be before period_start.'})
+        return attrs
+
+class RefreshAttendanceJobParamsSerializer(serializers.Serializer):
+    full = serializers.BooleanField(default=False)
+
+class ImportJobParamsSerializer(serializers.Serializer):
+    file = serializers.CharField(max_length=255)
+
+    def validate_file(self, value):
+        from .jobs import job_file
+        try:
+            job_file(value)
+        except ValueError as exc:
+            raise serializers.ValidationError(str(exc))
+        return value
+
+class ExportJobParamsSerializer(serializers.Serializer):
+    resource = serializers.ChoiceField(choices=['employees', 'inventory', 'products'])
+    output = serializers.ChoiceField(choices=list(EXPORT_FORMATS), default='csv')
+
+class StockAdjustmentSerializer(serializers.Serializer):
+    id = serializers.IntegerField(min_value=1)
+    delta = serializers.IntegerField()
+    reason = serializers.CharField(max_length=100, required=False, allow_blank=True, default='')
+    reference = serializers.CharField(max_length=100, required=False, allow_blank=True, default='')
+
+    class Meta:
+        list_serializer_class = BulkListSerializer
+
+    def validate_delta(self, value):
+        if value == 0:
+            raise serializers.ValidationError('Delta must not be zero.')
+        return value
+
+class StockMovementSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = StockMovement
+        fields = '__all__'
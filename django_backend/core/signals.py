@@ -0,0 +1,92 @@
+"""
+Django Signals.py - Purpose and Relationship
+
+Theoretical Understanding
+The signals.py file holds receivers that keep derived state (caches) consistent with the database.
+Receivers are connected when the app registry is ready (CoreConfig.ready in apps.py).
+
+Current Receivers
+- User post_init/post_save: when a save changes a field the cached lookup depends on (password,
+  is_active, role, is_staff, is_superuser), drop every cached token lookup for that user once the
+  transaction commits. Other saves (last_login on every login, profile edits) leave the cache alone.
+- Token post_delete: drop the cached lookup for the deleted token
+- Employee/InventoryItem/Product post_save and post_delete: bump the model's cache generation
+  so cached API responses for it are no longer served (caching.py)
+- Employee/InventoryItem/Product post_delete: record a Tombstone for the /changes/ feed (sync.py;
+  gathered into one bulk_create inside collect_tombstones())
+- InventoryItem post_save and post_delete: push the change to live stream subscribers (live.py)
+"""
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from .authentication import invalidate_token
+from .caching import bump_generation
+from .live import publish_inventory
+from .models import Employee, InventoryItem, Product
+from .sync import record_tombstone
+
+
+# User fields that authentication and permission checks read from the cached token's user
+TOKEN_USER_FIELDS = ('password', 'is_active', 'role', 'is_staff', 'is_superuser')
+
+
+def _token_user_state(instance):
+    # __dict__, not getattr: reading a deferred field would cost a query per instance
+    return tuple(instance.__dict__.get(name) for name in TOKEN_USER_FIELDS)
+
+
+@receiver(post_init, sender=settings.AUTH_USER_MODEL)
+def remember_token_user_state(sender, instance, **kwargs):
+    instance._token_user_state = _token_user_state(instance)
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def invalidate_user_tokens(sender, instance, created, update_fields=None, using=None, **kwargs):
+    if update_fields is not None and not set(update_fields) & set(TOKEN_USER_FIELDS):
+        return
+    state = _token_user_state(instance)
+    changed = state != instance._token_user_state
+    instance._token_user_state = state
+    if created or not changed:
+        return
+
+    def invalidate():
+        for key in Token.objects.filter(user_id=instance.pk).values_list('key', flat=True):
+            invalidate_token(key)
+    transaction.on_commit(invalidate, using=using)
+
+
+@receiver(post_delete, sender=Token)
+def invalidate_deleted_token(sender, instance, **kwargs):
+    invalidate_token(instance.key)
+
+
+@receiver(post_save, sender=Employee)
+@receiver(post_save, sender=InventoryItem)
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Employee)
+@receiver(post_delete, sender=InventoryItem)
+@receiver(post_delete, sender=Product)
+def invalidate_cached_responses(sender, **kwargs):
+    bump_generation(sender)
+
+
+@receiver(post_save, sender=InventoryItem)
+def publish_inventory_change(sender, instance, **kwargs):
+    publish_inventory([instance])
+
+
+@receiver(post_delete, sender=InventoryItem)
+def publish_inventory_delete(sender, instance, **kwargs):
+    publish_inventory([instance], deleted=True)
+
+
+@receiver(post_delete, sender=Employee)
+@receiver(post_delete, sender=InventoryItem)
+@receiver(post_delete, sender=Product)
+def tombstone_deleted(sender, instance, **kwargs):
+    record_tombstone(sender, instance.pk)
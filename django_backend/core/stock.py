@@ -0,0 +1,100 @@
+"""
+Django Stock.py - Purpose and Relationship
+
+Theoretical Understanding
+Changing stock by PATCHing an absolute `quantity` is a read-modify-write done by the client: two
+scanners that read 10 and each remove one both write 9, and one of the removals is lost. The stock.py
+file applies signed deltas on the server instead, as one `UPDATE ... SET quantity = quantity + delta`
+for the whole batch, and records every applied delta in the append-only StockMovement ledger.
+
+A batch runs in one transaction with a fixed number of statements, whatever its size:
+1. validate every row in memory (StockAdjustmentSerializer, no database access)
+2. SELECT ... FOR UPDATE the touched items, in id order
+3. one UPDATE with `F('quantity') + CASE id WHEN ... THEN net_delta END` for every accepted item
+4. one bulk INSERT of the StockMovement rows
+
+Locking the rows before the UPDATE lets the guard and `quantity_after` use the real current value,
+and taking the locks in id order means two batches touching the same items wait for each other
+instead of deadlocking. Validation happens before the transaction starts and cache/live updates are
+sent on commit, so a hot SKU is locked only for the three statements above.
+
+Relationship with Other Components
+1. Views (views.py)
+- InventoryItemViewSet.adjust exposes POST /inventory/adjust/
+- InventoryItemViewSet.movements lists the ledger of one item at /inventory/<id>/movements/
+
+2. Models (models.py)
+- StockMovement, indexed on (item, created_at)
+
+3. Caching and Live Stream (caching.py, live.py)
+- QuerySet.update() sends no post_save signals, so adjust_stock() bumps the cache generation and
+  publishes the changed items itself
+
+Current Implementation
+- Rows: {"id": <item id>, "delta": <non-zero int>, "reason": "", "reference": ""}
+- Rows are applied in request order; several rows for the same item each get their own movement
+- guard=True (default) rejects a row that would take the item below zero; the other rows still apply
+- atomic=True writes nothing if any row is rejected
+"""
+
+from django.db import transaction
+from django.db.models import Case, F, IntegerField, Value, When
+from django.utils import timezone
+
+from .caching import bump_generation
+from .live import publish_inventory
+from .models import InventoryItem, StockMovement
+from .serializers import StockAdjustmentSerializer
+
+
+def adjust_stock(rows, user=None, guard=True, atomic=False):
+    """Apply a batch of raw adjustment dicts and return (movements, errors)."""
+    serializer = StockAdjustmentSerializer(data=rows, many=True)
+    valid, errors = serializer.partition(rows)
+    ids = sorted({data['id'] for _, data in valid})
+    if atomic and errors:
+        return [], errors
+
+    with transaction.atomic():
+        items = {
+            item.pk: item
+            for item in InventoryItem.objects.select_for_update().filter(pk__in=ids).order_by('pk')
+        }
+        quantities = {pk: item.quantity for pk, item in items.items()}
+        movements = []
+        for index, data in valid:
+            item = items.get(data['id'])
+            if item is None:
+                errors.append({'index': index, 'errors': {'id': ['Not found.']}})
+                continue
+            after = quantities[item.pk] + data['delta']
+            if guard and after < 0:
+                errors.append({'index': index, 'errors': {
+                    'delta': [f'Would take quantity below zero (available: {quantities[item.pk]}).']
+                }})
+                continue
+            quantities[item.pk] = after
+            movements.append(StockMovement(
+                item=item, delta=data['delta'], quantity_after=after,
+                reason=data['reason'], reference=data['reference'], user=user,
+            ))
+        errors.sort(key=lambda error: error['index'])
+        if atomic and errors:
+            return [], errors
+
+        changed = [item for pk, item in items.items() if quantities[pk] != item.quantity]
+        if changed:
+            now = timezone.now()
+            net = Case(
+                *[When(pk=item.pk, then=Value(quantities[item.pk] - item.quantity)) for item in changed],
+                output_field=IntegerField(),
+            )
+            InventoryItem.objects.filter(pk__in=[item.pk for item in changed]).update(
+                quantity=F('quantity') + net, last_updated=now,
+            )
+            for item in changed:
+                item.quantity, item.last_updated = quantities[item.pk], now
+            bump_generation(InventoryItem)
+            publish_inventory(changed)
+        StockMovement.objects.bulk_create(movements)
+    return movements, errors
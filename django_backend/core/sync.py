@@ -0,0 +1,125 @@
+"""
+Django Sync.py - Purpose and Relationship
+
+Theoretical Understanding
+The sync.py file implements the "changes since" feed used for incremental sync. A client keeps an
+opaque cursor and asks only for the rows changed after it, instead of reloading whole tables.
+
+The cursor encodes a keyset position (timestamp, id) on the model's `updated_field`. Changed rows
+are read with `WHERE (ts > t) OR (ts = t AND id > i) ORDER BY ts, id` against the timestamp index, so
+rows that share a timestamp (bulk updates, CSV imports) are never skipped or repeated across pages.
+Deleted rows are reported from the Tombstone table written by the post_delete signal. Deletes of
+many rows (the /bulk/ endpoint) gather their tombstones with collect_tombstones() and write them
+with one bulk_create instead of one INSERT per row.
+
+A row's timestamp is taken when it is saved, but it only becomes visible when its transaction
+commits. So once a client has caught up, the next cursor is moved back by CORE_CHANGES_OVERLAP
+seconds, which must exceed the longest time between stamping a row and committing it. Saves and
+bulk writes commit right after stamping; the CSV import stamps its rows in its final statement,
+not when each chunk is read, so a long upload does not need a long overlap. A few rows may be sent
+twice, and clients are expected to apply changes idempotently (upsert by id).
+
+Tombstones are kept for CORE_TOMBSTONE_RETENTION_DAYS (`python manage.py prune_tombstones` deletes
+older ones, run it daily). A cursor older than that could miss deletions, so the feed answers it
+with 410 Gone and the client starts again without `since`.
+
+Relationship with Other Components
+1. Views (views.py)
+- ChangesMixin exposes GET /<resource>/changes/?since=<cursor-or-ISO-timestamp>
+
+2. Models (models.py)
+- Tombstone rows mark deletions of Employee, InventoryItem and Product
+
+3. Signals (signals.py)
+- post_delete calls record_tombstone()
+"""
+
+import base64
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .models import Tombstone
+
+EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+
+_pending_tombstones = ContextVar('core_pending_tombstones', default=None)
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def record_tombstone(model, pk):
+    tombstone = Tombstone(model=model._meta.label_lower, object_id=pk)
+    pending = _pending_tombstones.get()
+    if pending is None:
+        tombstone.save()
+    else:
+        pending.append(tombstone)
+
+
+@contextmanager
+def collect_tombstones():
+    """Write the tombstones of the deletes inside the block with one bulk_create when it exits."""
+    pending = []
+    token = _pending_tombstones.set(pending)
+    try:
+        yield
+    finally:
+        _pending_tombstones.reset(token)
+    Tombstone.objects.bulk_create(pending, batch_size=1000)
+
+
+def tombstone_cutoff():
+    """Deletions before this moment may have been pruned."""
+    return timezone.now() - timedelta(days=getattr(settings, 'CORE_TOMBSTONE_RETENTION_DAYS', 30))
+
+
+def cursor_expired(since):
+    return since[0] != EPOCH and since[0] < tombstone_cutoff()
+
+
+def prune_tombstones():
+    """Delete tombstones older than the retention period; return how many were deleted."""
+    deleted, _ = Tombstone.objects.filter(deleted_at__lt=tombstone_cutoff()).delete()
+    return deleted
+
+
+def encode_cursor(timestamp, pk=0):
+    raw = f'{timestamp.isoformat()}|{pk}'
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(value):
+    """Return (timestamp, pk) from an opaque cursor or a plain ISO-8601 timestamp."""
+    if not value:
+        return EPOCH, 0
+    moment = parse_datetime(value.replace(' ', '+'))
+    if moment is not None:
+        pk = 0
+    else:
+        try:
+            raw, pk = base64.urlsafe_b64decode(value.encode()).decode().rsplit('|', 1)
+            moment, pk = parse_datetime(raw), int(pk)
+        except (ValueError, UnicodeDecodeError):
+            raise InvalidCursor(value)
+        if moment is None:
+            raise InvalidCursor(value)
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment, dt_timezone.utc)
+    return moment, pk
+
+
+def next_cursor(rows, field, since, has_more, overlap):
+    if has_more:
+        last = rows[-1]
+        return encode_cursor(getattr(last, field), last.pk)
+    caught_up = timezone.now() - timedelta(seconds=overlap)
+    if caught_up <= since[0]:
+        return encode_cursor(*since)
+    return encode_cursor(caught_up)
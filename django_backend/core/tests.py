@@ -1,3 +1,1133 @@
-from django.test import TestCase
+import base64
+import csv
+import hmac
+import importlib
+import importlib.util
+import io
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from unittest import mock, skipUnless
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+from django.contrib.auth.models import update_last_login
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import F
+from django.http import HttpResponse
+from django.test import AsyncClient, RequestFactory, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from . import metrics, rollups, throttling, views
+from .authentication import token_cache_key
+from .imports import import_inventory_csv
+from .jobs import JOB_HANDLERS, claim_job, renew_lease, run_job, store_upload, submit_job, worker_loop
+from .live import NOTIFY_MAX_BYTES, hub, listen_connection, notify_payloads
+from .models import (
+    AttendanceEvent, DailyAttendanceSummary, Employee, InventoryItem, Job, Product, StockMovement, Tombstone, User,
+)
+from .pagination import CoreCursorPagination
+from .passwords import LoginBusy
+from .payroll import payroll_parameters, run_payroll
+from .renderers import ORJSONParser, ORJSONRenderer
+from .replicas import ReplicaMiddleware, ReplicaRouter
+from .rollups import refresh_daily_attendance
+from .stock import adjust_stock
+from .throttling import SlidingWindowThrottle
 
 # Create your tests here.
+
+
+class CoreTestCase(TestCase):
+    """Fresh throttle counters for every test, so budgets don't carry over between tests."""
+
+    def setUp(self):
+        throttling._store = None
+        self.client = APIClient()
+
+
+class CursorPaginationTests(CoreTestCase):
+    def test_next_links_walk_every_row_once(self):
+        ids = [Employee.objects.create(name=f'E{i}', base_salary=1000).id for i in range(5)]
+        seen, url = [], '/api/employees/?page_size=2'
+        while url:
+            page = self.client.get(url).json()
+            self.assertLessEqual(len(page['results']), 2)
+            seen += [row['id'] for row in page['results']]
+            url = page['next']
+        self.assertEqual(seen, sorted(ids, reverse=True))
+
+    def test_previous_link_returns_the_earlier_page(self):
+        for i in range(4):
+            Employee.objects.create(name=f'E{i}', base_salary=1000)
+        first = self.client.get('/api/employees/?page_size=2').json()
+        second = self.client.get(first['next']).json()
+        self.assertIsNone(first['previous'])
+        self.assertEqual(self.client.get(second['previous']).json()['results'], first['results'])
+
+    def test_page_size_is_capped(self):
+        for i in range(5):
+            Employee.objects.create(name=f'E{i}', base_salary=1000)
+        with mock.patch.object(CoreCursorPagination, 'max_page_size', 3):
+            page = self.client.get('/api/employees/?page_size=1000').json()
+        self.assertEqual(len(page['results']), 3)
+
+
+class BulkEndpointTests(CoreTestCase):
+    def test_create_keeps_valid_rows_and_reports_invalid_ones(self):
+        response = self.client.post('/api/employees/bulk/', [
+            {'name': 'Ann', 'base_salary': 3000},
+            {'name': 'Bob'},
+            {'name': 'Cy', 'base_salary': 2500},
+        ], format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual([row['name'] for row in response.json()['created']], ['Ann', 'Cy'])
+        self.assertEqual([error['index'] for error in response.json()['errors']], [1])
+        self.assertEqual(Employee.objects.count(), 2)
+
+    def test_update_changes_only_the_given_fields(self):
+        ann = Employee.objects.create(name='Ann', base_salary=3000)
+        bob = Employee.objects.create(name='Bob', base_salary=2000)
+        response = self.client.patch('/api/employees/bulk/', [
+            {'id': ann.id, 'base_salary': 3100}, {'id': 999999, 'name': 'Ghost'},
+        ], format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['errors'], [{'index': 1, 'errors': {'id': ['Not found.']}}])
+        ann.refresh_from_db()
+        bob.refresh_from_db()
+        self.assertEqual((ann.name, ann.base_salary), ('Ann', 3100))
+        self.assertEqual(bob.base_salary, 2000)
+
+    def test_delete_by_id(self):
+        ids = [Employee.objects.create(name=f'E{i}', base_salary=1000).id for i in range(3)]
+        response = self.client.delete('/api/employees/bulk/', [ids[0], ids[1], 'x'], format='json')
+        self.assertEqual(response.json()['deleted'], 2)
+        self.assertEqual(response.json()['errors'][0]['index'], 2)
+        self.assertEqual(list(Employee.objects.values_list('id', flat=True)), [ids[2]])
+
+    def test_row_limit(self):
+        with mock.patch.object(views.EmployeeViewSet, 'bulk_max_rows', 2):
+            response = self.client.post('/api/employees/bulk/', [{'name': 'E', 'base_salary': 1}] * 3, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Employee.objects.exists())
+
+
+class ExportTests(CoreTestCase):
+    def setUp(self):
+        super().setUp()
+        self.ann = Employee.objects.create(name='Ann, Sr.', base_salary=3000)
+        self.bob = Employee.objects.create(name='Bob', base_salary=2000)
+
+    def export(self, query):
+        response = self.client.get(f'/api/employees/export/?{query}')
+        self.assertEqual(response.status_code, 200)
+        return b''.join(response.streaming_content).decode()
+
+    def test_csv_has_a_header_and_every_matching_row(self):
+        rows = list(csv.reader(io.StringIO(self.export('output=csv'))))
+        self.assertEqual(rows[0], ['id', 'name', 'base_salary', 'updated_at'])
+        self.assertEqual([row[:2] for row in rows[1:]], [[str(self.ann.id), 'Ann, Sr.'], [str(self.bob.id), 'Bob']])
+
+    def test_ndjson_honours_filters_and_fieldsets(self):
+        lines = self.export('output=ndjson&name__istartswith=b&fields=id,name').splitlines()
+        self.assertEqual([json.loads(line) for line in lines], [{'id': self.bob.id, 'name': 'Bob'}])
+
+    def test_unknown_output(self):
+        self.assertEqual(self.client.get('/api/employees/export/?output=xml').status_code, 400)
+
+    async def test_asgi_body_is_streamed_chunk_by_chunk(self):
+        with mock.patch.object(views.EmployeeViewSet, 'export_chunk_size', 1):
+            response = await AsyncClient().get('/api/employees/export/?output=ndjson')
+        self.assertTrue(response.is_async)  # a sync body would be buffered whole with sync_to_async(list)
+        chunks = [chunk async for chunk in response.streaming_content]
+        self.assertEqual([json.loads(chunk)['name'] for chunk in chunks], ['Ann, Sr.', 'Bob'])
+
+
+class InventoryImportTests(CoreTestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user('clerk', password='pw')
+        self.client.force_authenticate(self.user)
+
+    def upload(self, text):
+        upload = SimpleUploadedFile('counts.csv', text.encode(), content_type='text/csv')
+        return self.client.post('/api/inventory/import/', {'file': upload}, format='multipart')
+
+    def test_upserts_rows_and_reports_invalid_lines(self):
+        item = InventoryItem.objects.create(name='Bolt', quantity=1, unit='pcs')
+        response = self.upload(f'id,name,quantity,unit\n{item.id},Bolt,40,pcs\n,Nut,7,pcs\n,Washer,lots,pcs\n')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.json()['imported'], response.json()['failed']), (2, 1))
+        self.assertEqual(response.json()['errors'][0]['line'], 4)
+        self.assertEqual(dict(InventoryItem.objects.values_list('name', 'quantity')), {'Bolt': 40, 'Nut': 7})
+
+    def test_last_row_wins_for_duplicate_ids(self):
+        item = InventoryItem.objects.create(name='Bolt', quantity=1, unit='pcs')
+        rows = [f'{item.id},Bolt,{quantity},pcs' for quantity in (10, 20, 30)]
+        # within one chunk, and across chunks
+        for chunk_size in (10, 1):
+            stream = io.StringIO('id,name,quantity,unit\n' + '\n'.join(rows) + '\n')
+            import_inventory_csv(stream, chunk_size=chunk_size)
+            item.refresh_from_db()
+            self.assertEqual(item.quantity, 30)
+
+
+class TokenCacheTests(CoreTestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.user = User.objects.create_user('clerk', password='pw')
+        self.token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+
+    def token_queries(self):
+        with CaptureQueriesContext(connection) as captured:
+            self.assertEqual(self.client.get('/api/inventory/').status_code, 200)
+        return [query for query in captured if 'authtoken_token' in query['sql']]
+
+    def test_second_request_skips_the_token_query(self):
+        self.assertEqual(len(self.token_queries()), 1)
+        self.assertEqual(self.token_queries(), [])
+
+    def test_last_login_save_keeps_the_cached_lookup(self):
+        self.token_queries()
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            update_last_login(None, User.objects.get(pk=self.user.pk))
+            user = User.objects.get(pk=self.user.pk)
+            user.first_name = 'Ann'
+            user.save()
+        self.assertEqual(callbacks, [])
+        self.assertEqual(self.token_queries(), [])
+
+    def test_deactivation_is_applied_after_commit(self):
+        self.token_queries()
+        user = User.objects.get(pk=self.user.pk)
+        user.is_active = False
+        with self.captureOnCommitCallbacks() as callbacks:
+            user.save()
+            self.assertIsNotNone(cache.get(token_cache_key(self.token.key)))
+        for callback in callbacks:
+            callback()
+        self.assertEqual(self.client.get('/api/inventory/').status_code, 401)
+
+    def test_role_change_refreshes_the_cached_user(self):
+        self.token_queries()
+        with self.captureOnCommitCallbacks(execute=True):
+            user = User.objects.get(pk=self.user.pk)
+            user.role = 'manager'
+            user.save(update_fields=['role'])
+        self.assertEqual(len(self.token_queries()), 1)
+
+
+class LogoutTests(CoreTestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user('picker', password='pw')
+        self.token = Token.objects.create(user=self.user)
+
+    def test_logout_revokes_the_request_token(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        self.client.get('/api/products/')  # warm the token cache
+        with self.assertNumQueries(1):  # just the DELETE
+            self.assertEqual(self.client.post('/api/logout/').status_code, 200)
+        self.assertFalse(Token.objects.filter(user=self.user).exists())
+        self.assertEqual(self.client.get('/api/employees/').status_code, 401)
+
+    def test_session_and_basic_auth_get_400(self):
+        self.client.force_login(self.user)
+        self.assertEqual(self.client.post('/api/logout/').status_code, 400)
+        self.client.logout()
+        credentials = base64.b64encode(b'picker:pw').decode()
+        self.assertEqual(self.client.post('/api/logout/', HTTP_AUTHORIZATION=f'Basic {credentials}').status_code, 400)
+        self.assertTrue(Token.objects.filter(user=self.user).exists())
+
+class ResponseCacheTests(CoreTestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.product = Product.objects.create(name='Lamp', price=20)
+
+    def test_repeated_list_is_served_from_the_cache(self):
+        self.client.get('/api/products/')
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get('/api/products/')
+        self.assertEqual(response.json()['results'][0]['name'], 'Lamp')
+        self.assertEqual(len(captured), 1)  # the version aggregate only
+
+    def test_writes_invalidate_cached_lists(self):
+        self.client.get('/api/products/')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(f'/api/products/{self.product.id}/', {'price': 25}, format='json')
+        self.assertEqual(self.client.get('/api/products/').json()['results'][0]['price'], 25)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch('/api/products/bulk/', [{'id': self.product.id, 'price': 30}], format='json')
+        self.assertEqual(self.client.get('/api/products/').json()['results'][0]['price'], 30)
+
+    def test_query_strings_are_cached_separately(self):
+        Product.objects.create(name='Desk', price=90)
+        cheap = self.client.get('/api/products/?price__lte=50').json()['results']
+        self.assertEqual([row['name'] for row in cheap], ['Lamp'])
+        self.assertEqual(len(self.client.get('/api/products/').json()['results']), 2)
+
+
+class ConditionalGetTests(CoreTestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.product = Product.objects.create(name='Lamp', price=20)
+
+    def test_etag_round_trip(self):
+        first = self.client.get('/api/products/')
+        etag = first['ETag']
+        with CaptureQueriesContext(connection) as captured:
+            cached = self.client.get('/api/products/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(cached.status_code, 304)
+        self.assertEqual(cached.content, b'')
+        self.assertEqual(len(captured), 1)
+        self.product.price = 25
+        self.product.save()
+        changed = self.client.get('/api/products/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(changed.status_code, 200)
+        self.assertNotEqual(changed['ETag'], etag)
+
+    def test_detail_if_modified_since(self):
+        first = self.client.get(f'/api/products/{self.product.id}/')
+        again = self.client.get(f'/api/products/{self.product.id}/', HTTP_IF_MODIFIED_SINCE=first['Last-Modified'])
+        self.assertEqual(again.status_code, 304)
+
+    def test_deleting_a_row_changes_the_list_etag(self):
+        other = Product.objects.create(name='Desk', price=90)
+        etag = self.client.get('/api/products/')['ETag']
+        other.delete()
+        self.assertEqual(self.client.get('/api/products/', HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+
+class ChangesFeedTests(CoreTestCase):
+    def changes(self, since=None):
+        response = self.client.get('/api/employees/changes/', {'since': since} if since else {})
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def sync(self, since=None):
+        """Follow the feed until it has caught up; return ({id: row}, deleted ids, cursor)."""
+        changed, deleted = {}, set()
+        while True:
+            page = self.changes(since)
+            changed.update((row['id'], row) for row in page['changed'])
+            deleted.update(page['deleted'])
+            since = page['next']
+            if not page['has_more']:
+                return changed, deleted, since
+
+    def test_pages_cover_every_row(self):
+        ids = {Employee.objects.create(name=f'E{i}', base_salary=1000).id for i in range(7)}
+        with mock.patch.object(views.EmployeeViewSet, 'changes_page_size', 2):
+            changed, _, _ = self.sync()
+        self.assertEqual(set(changed), ids)
+
+    def test_updates_and_deletes_after_a_sync_are_reported(self):
+        rows = [Employee.objects.create(name=f'E{i}', base_salary=1000) for i in range(5)]
+        _, _, cursor = self.sync()
+        rows[0].base_salary = 1100
+        rows[0].save()
+        removed = {rows[1].id, rows[2].id, rows[3].id}
+        rows[1].delete()
+        self.client.delete('/api/employees/bulk/', [rows[2].id, rows[3].id], format='json')
+        changed, deleted, _ = self.sync(cursor)
+        self.assertEqual(changed[rows[0].id]['base_salary'], 1100)
+        self.assertEqual(deleted, removed)
+        self.assertFalse(deleted & set(changed))
+
+    def test_bulk_delete_writes_tombstones_in_one_insert(self):
+        ids = [Employee.objects.create(name=f'E{i}', base_salary=1000).id for i in range(20)]
+        with CaptureQueriesContext(connection) as captured:
+            self.client.delete('/api/employees/bulk/', ids, format='json')
+        inserts = [query for query in captured if query['sql'].startswith('INSERT INTO "core_tombstone"')]
+        self.assertEqual(len(inserts), 1)
+        self.assertEqual(Tombstone.objects.filter(model='core.employee').count(), 20)
+
+    def test_cursor_older_than_the_retention_is_gone(self):
+        old = (timezone.now() - timedelta(days=31)).isoformat()
+        with self.settings(CORE_TOMBSTONE_RETENTION_DAYS=30):
+            self.assertEqual(self.client.get('/api/employees/changes/', {'since': old}).status_code, 410)
+            self.assertEqual(self.client.get('/api/employees/changes/').status_code, 200)
+
+    def test_prune_keeps_recent_tombstones(self):
+        Tombstone.objects.create(model='core.employee', object_id=1)
+        Tombstone.objects.create(model='core.employee', object_id=2)
+        Tombstone.objects.filter(object_id=1).update(deleted_at=timezone.now() - timedelta(days=31))
+        with self.settings(CORE_TOMBSTONE_RETENTION_DAYS=30):
+            call_command('prune_tombstones', stdout=io.StringIO())
+        self.assertEqual(list(Tombstone.objects.values_list('object_id', flat=True)), [2])
+
+    def test_import_stamps_rows_when_merged(self):
+        started = timezone.now()
+        with mock.patch('core.imports.timezone') as clock:
+            clock.now.side_effect = [started, started, started + timedelta(minutes=10)]
+            import_inventory_csv(io.StringIO('name,quantity,unit\nBolt,4,pcs\n'))
+        self.assertEqual(InventoryItem.objects.get().last_updated, started + timedelta(minutes=10))
+
+
+class FilterTests(CoreTestCase):
+    def setUp(self):
+        super().setUp()
+        for name, price in (('Desk lamp', 20), ('Desk', 90), ('Floor lamp', 45)):
+            Product.objects.create(name=name, price=price)
+
+    def names(self, query):
+        response = self.client.get(f'/api/products/?{query}')
+        self.assertEqual(response.status_code, 200)
+        return [row['name'] for row in response.json()['results']]
+
+    def test_name_lookups_and_ranges(self):
+        self.assertEqual(sorted(self.names('name__istartswith=desk')), ['Desk', 'Desk lamp'])
+        self.assertEqual(sorted(self.names('name__icontains=LAMP&price__lte=30')), ['Desk lamp'])
+
+    def test_search_and_ordering(self):
+        self.assertEqual(sorted(self.names('search=lamp')), ['Desk lamp', 'Floor lamp'])
+        self.assertEqual(self.names('ordering=price'), ['Desk lamp', 'Floor lamp', 'Desk'])
+
+    def test_unlisted_lookups_are_ignored_and_bad_values_rejected(self):
+        self.assertEqual(len(self.names('description__icontains=x')), 3)
+        response = self.client.get('/api/products/?price__gte=cheap')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('price__gte', response.json())
+
+
+class AttendanceIngestTests(CoreTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client.force_authenticate(User.objects.create_user('kiosk', password='pw'))
+        self.employee = Employee.objects.create(name='Ann', base_salary=3000)
+
+    def event(self, key, event_type='in', employee_id=None):
+        return {'employee_id': employee_id or self.employee.id, 'event_type': event_type,
+                'timestamp': '2026-03-02T09:00:00Z', 'idempotency_key': key}
+
+    def test_accepts_valid_events_and_reports_the_rest(self):
+        response = self.client.post('/api/attendance/ingest/', [
+            self.event('a'), self.event('b', 'out'), self.event('c', 'lunch'), self.event('d', employee_id=999999),
+        ], format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()['accepted'], 2)
+        self.assertEqual([error['index'] for error in response.json()['errors']], [2, 3])
+
+    def test_retried_batches_are_idempotent(self):
+        batch = [self.event('a'), self.event('a'), self.event('b', 'out')]
+        self.client.post('/api/attendance/ingest/', batch, format='json')
+        retry = self.client.post('/api/attendance/ingest/', batch, format='json').json()
+        self.assertEqual((retry['accepted'], retry['duplicates']), (0, 3))
+        self.assertEqual(AttendanceEvent.objects.count(), 2)
+
+
+class PayrollTests(CoreTestCase):
+    """A run over a small hand-computed fixture (standard_hours=8, overtime x1.5, 10% deductions)."""
+
+    def setUp(self):
+        super().setUp()
+        self.manager = User.objects.create_user('boss', password='pw', role='manager')
+        self.client.force_authenticate(self.manager)
+        self.ann = Employee.objects.create(name='Ann', base_salary=1600)
+        self.bob = Employee.objects.create(name='Bob', base_salary=800)
+        self.cy = Employee.objects.create(name='Cy', base_salary=1000)
+        events = [
+            (self.ann, 'in', '2026-03-02T09:00'), (self.ann, 'out', '2026-03-02T19:00'),  # 10h
+            (self.bob, 'out', '2026-03-03T08:00'),  # no clock-in before it: ignored
+            (self.bob, 'in', '2026-03-03T09:00'), (self.bob, 'out', '2026-03-03T13:00'),  # 4h
+            (self.bob, 'in', '2026-03-03T14:00'),  # never clocked out: ignored
+            (self.cy, 'in', '2026-02-27T09:00'), (self.cy, 'out', '2026-02-27T17:00'),  # before the period
+        ]
+        AttendanceEvent.objects.bulk_create(
+            AttendanceEvent(employee=employee, event_type=kind, idempotency_key=f'{employee.id}-{at}',
+                            timestamp=datetime.fromisoformat(at).replace(tzinfo=dt_timezone.utc))
+            for employee, kind, at in events
+        )
+
+    def test_run_matches_the_hand_computed_pay(self):
+        response = self.client.post('/api/payroll/runs/', {
+            'period_start': '2026-03-01', 'period_end': '2026-03-31', 'standard_hours': 8,
+        }, format='json')
+        self.assertEqual(response.status_code, 201)
+        run = response.json()
+        self.assertEqual((run['employee_count'], run['total_gross'], run['total_net']), (3, 4000, 3600))
+        lines = self.client.get(f"/api/payroll/runs/{run['id']}/lines/").json()['results']
+        columns = ('hours', 'overtime_hours', 'gross', 'deductions', 'net')
+        pay = {line['employee']: tuple(line[name] for name in columns) for line in lines}
+        # Ann: rate 1600 / 8 = 200, 2h overtime at 1.5 -> 1600 + 600
+        self.assertEqual(pay[self.ann.id], (10, 2, 2200, 220, 1980))
+        self.assertEqual(pay[self.bob.id], (4, 0, 800, 80, 720))
+        self.assertEqual(pay[self.cy.id], (0, 0, 1000, 100, 900))
+
+    def test_managers_only(self):
+        self.client.force_authenticate(User.objects.create_user('clerk', password='pw'))
+        response = self.client.post('/api/payroll/runs/', {'period_start': '2026-03-01', 'period_end': '2026-03-31'})
+        self.assertEqual(response.status_code, 403)
+
+
+    @override_settings(CORE_PAYROLL={'standard_hours': 120.0, 'overtime_multiplier': 2.0, 'deduction_rate': 0.2})
+    def test_parameters_come_from_settings(self):
+        params = payroll_parameters({'deduction_rate': '0.25', 'bonus': 1})
+        self.assertEqual(params, {'standard_hours': 120.0, 'overtime_multiplier': 2.0, 'deduction_rate': 0.25})
+
+class DailyAttendanceRollupTests(CoreTestCase):
+    def setUp(self):
+        super().setUp()
+        self.ann = Employee.objects.create(name='Ann', base_salary=1600)
+        self.bob = Employee.objects.create(name='Bob', base_salary=800)
+        self.clock(self.ann, 'in', '2026-03-02T09:10')  # after the 09:00 shift start + 5 min grace
+        self.clock(self.ann, 'out', '2026-03-02T17:10')
+        self.clock(self.bob, 'in', '2026-03-02T08:55')
+        self.clock(self.bob, 'out', '2026-03-02T12:55')
+        AttendanceEvent.objects.update(received_at=timezone.now() - timedelta(hours=1))
+
+    def clock(self, employee, kind, at):
+        AttendanceEvent.objects.create(employee=employee, event_type=kind, idempotency_key=f'{employee.id}-{at}',
+                                       timestamp=datetime.fromisoformat(at).replace(tzinfo=dt_timezone.utc))
+
+    def summary(self, employee, day):
+        row = DailyAttendanceSummary.objects.get(employee=employee, date=day)
+        return row.hours, row.event_count, row.late
+
+    def test_refresh_summarizes_each_employee_day(self):
+        self.assertEqual(refresh_daily_attendance(), 2)
+        self.assertEqual(self.summary(self.ann, date(2026, 3, 2)), (8, 2, True))
+        self.assertEqual(self.summary(self.bob, date(2026, 3, 2)), (4, 2, False))
+
+    def test_incremental_refresh_only_recomputes_touched_days(self):
+        refresh_daily_attendance()
+        self.assertEqual(refresh_daily_attendance(), 0)
+        self.clock(self.ann, 'in', '2026-03-03T09:00')
+        self.clock(self.ann, 'out', '2026-03-03T10:00')
+        self.assertEqual(refresh_daily_attendance(), 2)  # the new day and the day before it
+        self.assertEqual(self.summary(self.ann, date(2026, 3, 3)), (1, 2, False))
+        self.assertEqual(refresh_daily_attendance(full=True), 3)
+
+    def test_backfill_loads_only_the_touched_employee_days(self):
+        refresh_daily_attendance()
+        self.clock(self.bob, 'in', '2026-01-05T09:00')  # backfilled months late
+        self.clock(self.ann, 'in', '2026-03-03T09:00')
+        with mock.patch('core.rollups.summarize', wraps=rollups.summarize) as summarize, \
+                mock.patch('core.rollups.WINDOW_CLAUSES', 1):  # one query per range, merged in order
+            refresh_daily_attendance()
+        employees, _, seconds, _ = summarize.call_args.args
+        loaded = [(int(employee), datetime.fromtimestamp(second, dt_timezone.utc).isoformat()[:16])
+                  for employee, second in zip(employees, seconds)]
+        # Bob's March events lie between the two touched ranges and are not read
+        self.assertEqual(sorted(loaded), sorted([
+            (self.ann.id, '2026-03-02T09:10'), (self.ann.id, '2026-03-02T17:10'), (self.ann.id, '2026-03-03T09:00'),
+            (self.bob.id, '2026-01-05T09:00'),
+        ]))
+        self.assertEqual(loaded, sorted(loaded))
+        self.assertEqual(self.summary(self.bob, date(2026, 1, 5)), (0, 1, False))
+
+
+class JobQueueTests(CoreTestCase):
+    def setUp(self):
+        super().setUp()
+        Employee.objects.create(name='Ann', base_salary=1600)
+
+    def test_worker_runs_queued_jobs_in_order(self):
+        first = submit_job('export', {'resource': 'employees', 'output': 'ndjson'})
+        second = submit_job('export', {'resource': 'employees', 'output': 'ndjson'})
+        self.assertEqual(claim_job('w1').pk, first.pk)
+        self.assertEqual(claim_job('w2').pk, second.pk)
+        self.assertIsNone(claim_job('w3'))
+
+    def test_export_files_are_named_after_the_job(self):
+        jobs = [submit_job('export', {'resource': 'employees', 'output': 'csv'}) for _ in range(2)]
+        worker_loop(burst=True)
+        paths = set()
+        for job in jobs:
+            job.refresh_from_db()
+            self.assertEqual(job.status, Job.SUCCEEDED, job.error)
+            self.assertEqual(job.result['file'], f'employees-{job.pk}.csv')
+            paths.add(job.result['file'])
+        self.assertEqual(len(paths), 2)
+
+    def test_export_file_is_downloaded_through_the_api(self):
+        manager = User.objects.create_user('boss', password='pw', role='manager')
+        self.client.force_authenticate(manager)
+        job = submit_job('export', {'resource': 'employees', 'output': 'csv'})
+        self.assertEqual(self.client.get(f'/api/jobs/{job.pk}/download/').status_code, 409)
+        worker_loop(burst=True)
+        result = self.client.get(f'/api/jobs/{job.pk}/result/').json()
+        self.assertTrue(result['download'].endswith(f'/jobs/{job.pk}/download/'))
+        response = self.client.get(result['download'])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        self.assertIn(f'employees-{job.pk}.csv', response['Content-Disposition'])
+        rows = list(csv.DictReader(io.StringIO(b''.join(response.streaming_content).decode())))
+        self.assertEqual([row['name'] for row in rows], ['Ann'])
+
+    def test_uploaded_csv_is_imported_by_a_job(self):
+        manager = User.objects.create_user('boss', password='pw', role='manager')
+        self.client.force_authenticate(manager)
+        self.assertEqual(self.client.post('/api/jobs/import/', {}, format='multipart').status_code, 400)
+        upload = SimpleUploadedFile('count.csv', b'name,quantity,unit\nBolt,4,pcs\nNut,x,pcs\n', 'text/csv')
+        response = self.client.post('/api/jobs/import/', {'file': upload}, format='multipart')
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.json()['kind'], 'import_inventory')
+        worker_loop(burst=True)
+        result = self.client.get(f"/api/jobs/{response.json()['id']}/result/").json()
+        self.assertEqual((result['imported'], result['failed']), (1, 1))
+        self.assertEqual(InventoryItem.objects.get().name, 'Bolt')
+
+    @override_settings(CORE_IMPORT_CHUNK_SIZE=2)
+    def test_import_reports_progress_after_each_chunk(self):
+        upload = SimpleUploadedFile('count.csv', b'name,quantity,unit\n' + b'Bolt,4,pcs\n' * 5)
+        job = submit_job('import_inventory', {'file': store_upload(upload)})
+        progress = mock.Mock()
+        JOB_HANDLERS['import_inventory'](job.params, progress, job)
+        reports = [call.args for call in progress.call_args_list]
+        self.assertEqual([message for _, message in reports], ['2 rows read', '4 rows read', '5 rows read'])
+        self.assertEqual(reports[-1][0], 1.0)
+
+    def test_payroll_reports_progress_after_each_batch(self):
+        Employee.objects.create(name='Bob', base_salary=1600)
+        progress = mock.Mock()
+        run_payroll(date(2024, 1, 1), date(2024, 1, 31), batch_size=1, progress=progress)
+        self.assertEqual([call.args for call in progress.call_args_list][-2:],
+                         [(0.7, 'Writing payroll lines'), (1.0, 'Writing payroll lines')])
+
+    def test_expired_lease_is_reclaimed(self):
+        job = submit_job('refresh_attendance')
+        claim_job('dead-worker')
+        self.assertIsNone(claim_job('w2'))  # still leased
+        Job.objects.filter(pk=job.pk).update(locked_until=timezone.now() - timedelta(seconds=1))
+        reclaimed = claim_job('w2')
+        self.assertEqual((reclaimed.pk, reclaimed.worker, reclaimed.attempts), (job.pk, 'w2', 2))
+        self.assertFalse(renew_lease(Job(pk=job.pk, worker='dead-worker')))
+        self.assertTrue(renew_lease(reclaimed))
+
+    def test_stale_worker_cannot_overwrite_a_reclaimed_job(self):
+        job = submit_job('refresh_attendance')
+        stale = claim_job('dead-worker')
+        Job.objects.filter(pk=job.pk).update(locked_until=timezone.now() - timedelta(seconds=1))
+        claim_job('w2')
+        run_job(stale)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.worker), (Job.RUNNING, 'w2'))
+
+    def test_params_are_validated_per_kind_on_submit(self):
+        manager = User.objects.create_user('boss', password='pw', role='manager')
+        self.client.force_authenticate(manager)
+        bad = [
+            ({'kind': 'payroll_run', 'params': {}}, 'period_start'),
+            ({'kind': 'payroll_run', 'params': {'period_start': '2024-02-01', 'period_end': '2024-01-01'}},
+             'period_end'),
+            ({'kind': 'export', 'params': {'resource': 'nope'}}, 'resource'),
+            ({'kind': 'export', 'params': {'resource': 'employees', 'output': 'xml'}}, 'output'),
+            ({'kind': 'import_inventory', 'params': {'file': '../settings.py'}}, 'file'),
+            ({'kind': 'import_inventory', 'params': {'file': 'missing.csv'}}, 'file'),
+        ]
+        for body, field in bad:
+            response = self.client.post('/api/jobs/', body, format='json')
+            self.assertEqual(response.status_code, 400, body)
+            self.assertIn(field, response.json()['params'], body)
+        self.assertFalse(Job.objects.exists())
+        response = self.client.post('/api/jobs/', {'kind': 'export', 'params': {'resource': 'employees'}},
+                                    format='json')
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(Job.objects.get().params, {'resource': 'employees', 'output': 'csv'})
+
+    def test_failed_job_keeps_the_traceback_out_of_the_api(self):
+        job = submit_job('refresh_attendance')
+        with mock.patch('core.jobs.refresh_daily_attendance', side_effect=RuntimeError('disk full')), \
+                self.assertLogs('core.jobs', 'ERROR') as logs:
+            worker_loop(burst=True)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.error), (Job.FAILED, 'RuntimeError: disk full'))
+        self.assertIn('Traceback', logs.output[0])
+
+    @override_settings(CORE_JOB_MAX_ATTEMPTS=2)
+    def test_job_fails_after_max_attempts(self):
+        job = submit_job('refresh_attendance')
+        for worker in ('w1', 'w2'):
+            claim_job(worker)
+            Job.objects.filter(pk=job.pk).update(locked_until=timezone.now() - timedelta(seconds=1))
+        self.assertIsNone(claim_job('w3'))
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.FAILED)
+
+
+class AsyncReadViewTests(CoreTestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.products = [Product.objects.create(name=f'P{i}', price=i) for i in range(5)]
+        self.user = User.objects.create_user('clerk', password='pw')
+        self.token = Token.objects.create(user=self.user)
+        self.async_client = AsyncClient()
+
+    async def test_list_pages_match_the_viewset(self):
+        url, async_url = '/api/products/?page_size=2', '/api/async/products/?page_size=2'
+        while url:
+            expected = (await sync_to_async(self.client.get)(url)).json()
+            page = (await self.async_client.get(async_url)).json()
+            self.assertEqual(page['results'], expected['results'])
+            url, async_url = expected['next'], page['next']
+            self.assertEqual(bool(url), bool(async_url))
+
+    async def test_detail_and_fieldsets(self):
+        product = self.products[0]
+        response = await self.async_client.get(f'/api/async/products/{product.id}/?fields=id,name')
+        self.assertEqual(response.json(), {'id': product.id, 'name': 'P0'})
+        self.assertEqual((await self.async_client.get('/api/async/products/999999/')).status_code, 404)
+
+    async def test_token_authentication(self):
+        self.assertEqual((await self.async_client.get('/api/async/inventory/')).status_code, 401)
+        auth = {'Authorization': f'Token {self.token.key}'}
+        response = await self.async_client.get('/api/async/inventory/', headers=auth)
+        self.assertEqual(response.status_code, 200)
+        response = await self.async_client.get('/api/async/inventory/', headers={'Authorization': 'Token wrong'})
+        self.assertEqual(response.status_code, 401)
+
+    async def test_conditional_get(self):
+        first = await self.async_client.get('/api/async/products/')
+        again = await self.async_client.get('/api/async/products/', headers={'If-None-Match': first['ETag']})
+        self.assertEqual(again.status_code, 304)
+
+
+class LivePublishTests(CoreTestCase):
+    def test_notify_payloads_stay_under_the_byte_limit(self):
+        events = [{'id': i, 'name': 'é' * 90, 'quantity': i} for i in range(200)]
+        payloads = list(notify_payloads(events))
+        self.assertGreater(len(payloads), 1)
+        self.assertTrue(all(len(payload.encode()) <= NOTIFY_MAX_BYTES for payload in payloads))
+        self.assertEqual([event for payload in payloads for event in json.loads(payload)], events)
+
+    def test_an_oversized_event_becomes_a_reset(self):
+        payloads = list(notify_payloads([{'id': 1}, {'id': 2, 'name': 'x' * 9000}]))
+        self.assertEqual(json.loads(payloads[0]), [{'id': 1}, {'reset': True}])
+
+    def test_changes_are_serialized_and_delivered_after_commit(self):
+        with mock.patch.object(hub, 'has_subscribers', return_value=True), \
+                mock.patch.object(hub, 'deliver') as deliver:
+            with self.captureOnCommitCallbacks(execute=True):
+                item = InventoryItem.objects.create(name='Bolt', quantity=3, unit='pcs')
+                item.quantity = 4
+                item.save()
+                item_id = item.id
+                deleted = InventoryItem.objects.create(name='Nut', quantity=1, unit='pcs')
+                deleted_id = deleted.id
+                deleted.delete()
+                deliver.assert_not_called()
+        delivered = [event for call in deliver.call_args_list for event in call.args[0]]
+        self.assertIn({'id': deleted_id, 'deleted': True}, delivered)
+        self.assertEqual([event['quantity'] for event in delivered if event.get('id') == item_id], [4, 4])
+
+    def test_nothing_is_published_without_subscribers_or_when_disabled(self):
+        for subscribed, enabled in ((False, True), (True, False)):
+            with mock.patch.object(hub, 'has_subscribers', return_value=subscribed), \
+                    self.settings(CORE_LIVE_ENABLED=enabled), \
+                    self.captureOnCommitCallbacks() as callbacks:
+                InventoryItem.objects.create(name='Bolt', quantity=3, unit='pcs')
+            self.assertFalse([callback for callback in callbacks if callback.__qualname__.startswith('_publish')])
+
+    def test_listen_connection_bypasses_the_pool(self):
+        wrapper = mock.Mock()
+        wrapper.get_connection_params.return_value = {'dbname': 'core', 'pool': {'min_size': 2}}
+        with mock.patch('core.live.connections', {'default': wrapper}):
+            self.assertIs(listen_connection(), wrapper.Database.connect.return_value)
+        wrapper.Database.connect.assert_called_once_with(dbname='core')
+        wrapper.get_new_connection.assert_not_called()
+
+
+class StockAdjustmentTests(CoreTestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user('scanner', password='pw')
+        self.client.force_authenticate(self.user)
+        self.item = InventoryItem.objects.create(name='Bolt', quantity=10, unit='pcs')
+
+    def adjust(self, rows, query=''):
+        return self.client.post(f'/api/inventory/adjust/{query}', rows, format='json')
+
+    def test_deltas_are_applied_and_recorded(self):
+        response = self.adjust([
+            {'id': self.item.id, 'delta': -3}, {'id': self.item.id, 'delta': 5, 'reason': 'count'},
+        ])
+        self.assertEqual([row['quantity_after'] for row in response.json()['applied']], [7, 12])
+        self.item.refresh_from_db()
+        self.assertEqual(self.item.quantity, 12)
+        self.assertEqual(StockMovement.objects.filter(item=self.item, user=self.user).count(), 2)
+
+    def test_no_lost_update_when_another_write_lands_first(self):
+        real_now = timezone.now
+
+        def concurrent_scan():
+            # another scanner's decrement commits after this batch read the quantity
+            InventoryItem.objects.filter(pk=self.item.pk).update(quantity=F('quantity') - 3)
+            return real_now()
+        with mock.patch('core.stock.timezone') as clock:
+            clock.now.side_effect = concurrent_scan
+            self.adjust([{'id': self.item.id, 'delta': -2}])
+        self.item.refresh_from_db()
+        self.assertEqual(self.item.quantity, 5)
+
+    def test_guard_and_atomic_batches(self):
+        other = InventoryItem.objects.create(name='Nut', quantity=1, unit='pcs')
+        rows = [{'id': self.item.id, 'delta': -4}, {'id': other.id, 'delta': -2}]
+        rejected = self.adjust(rows, '?atomic=1')
+        self.assertEqual((rejected.status_code, rejected.json()['errors'][0]['index']), (409, 1))
+        self.item.refresh_from_db()
+        self.assertEqual(self.item.quantity, 10)
+        partial = self.adjust(rows)
+        self.assertEqual((partial.status_code, len(partial.json()['applied'])), (200, 1))
+        self.assertEqual(self.adjust(rows[1:], '?allow_negative=1').json()['applied'][0]['quantity_after'], -1)
+
+
+class JobProgressTests(TransactionTestCase):
+    def test_heartbeat_writes_progress_while_the_handler_runs(self):
+        submit_job('refresh_attendance')
+        job = claim_job('w1')
+        seen = []
+
+        def handler(params, progress, job):
+            progress(0.5, 'Halfway')
+            for _ in range(200):
+                row = Job.objects.get(pk=job.pk)
+                if row.progress:
+                    break
+                time.sleep(0.01)
+            seen.append((row.progress, row.message))
+            return {}
+
+        with mock.patch.dict(JOB_HANDLERS, {'refresh_attendance': handler}):
+            run_job(job)
+        self.assertEqual(seen, [(0.5, 'Halfway')])
+        self.assertEqual(Job.objects.get(pk=job.pk).status, Job.SUCCEEDED)
+
+
+@skipUnless(connection.vendor == 'postgresql', 'needs concurrent writers (PostgreSQL)')
+class ConcurrentStockAdjustmentTests(TransactionTestCase):
+    def test_concurrent_adjustments_are_all_applied(self):
+        item = InventoryItem.objects.create(name='Bolt', quantity=100, unit='pcs')
+
+        def scan(_):
+            try:
+                adjust_stock([{'id': item.id, 'delta': -1}])
+            finally:
+                connection.close()
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(scan, range(40)))
+        item.refresh_from_db()
+        self.assertEqual(item.quantity, 60)
+        self.assertEqual(sorted(StockMovement.objects.values_list('quantity_after', flat=True)), list(range(60, 100)))
+
+
+@override_settings(CORE_READ_REPLICAS=['default'])
+class ReplicaMiddlewareTests(CoreTestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.factory = RequestFactory(headers={'Authorization': 'Token abc'})
+        self.list_view = views.EmployeeViewSet.as_view({'get': 'list'})
+
+    def routed(self, middleware, request):
+        """get_response for `middleware` that runs its process_view and reports where reads go."""
+        def view():
+            middleware.process_view(request, self.list_view, (), {})
+            return HttpResponse(ReplicaRouter().db_for_read(Employee) or 'primary')
+        return view
+
+    def test_sync_reads_go_to_replica_until_a_write_pins_the_client(self):
+        request = self.factory.get('/api/employees/')
+        middleware = ReplicaMiddleware(lambda r: self.routed(middleware, request)())
+        self.assertEqual(middleware(request).content, b'default')
+        middleware(self.factory.post('/api/employees/'))
+        self.assertEqual(middleware(request).content, b'primary')
+
+    async def test_async_chain(self):
+        request = self.factory.get('/api/employees/')
+
+        async def get_response(r):
+            return await sync_to_async(self.routed(middleware, request))()
+        middleware = ReplicaMiddleware(get_response)
+        self.assertTrue(iscoroutinefunction(middleware))
+        self.assertEqual((await middleware(request)).content, b'default')
+        self.assertIsNone(ReplicaRouter().db_for_read(Employee))
+        await middleware(self.factory.post('/api/employees/'))
+        self.assertEqual((await middleware(request)).content, b'primary')
+
+
+class ConnectionSettingsTests(CoreTestCase):
+    def load(self, **env):
+        """Execute settings.py afresh with `env` and return the default database settings."""
+        spec = importlib.util.spec_from_file_location('settings_probe', settings.BASE_DIR / 'django_backend' / 'settings.py')
+        module = importlib.util.module_from_spec(spec)
+        with mock.patch.dict(os.environ, env):
+            for name in ('DB_POOL', 'DB_CONN_MAX_AGE', 'DB_CONN_HEALTH_CHECKS'):
+                if name not in env:
+                    os.environ.pop(name, None)
+            spec.loader.exec_module(module)
+        return module.DATABASES['default']
+
+    def test_persistent_connections_by_default(self):
+        database = self.load()
+        self.assertEqual((database['CONN_MAX_AGE'], database['CONN_HEALTH_CHECKS']), (60, True))
+        self.assertNotIn('pool', database['OPTIONS'])
+        self.assertIsNone(self.load(DB_CONN_MAX_AGE='none')['CONN_MAX_AGE'])
+
+    def test_pool_replaces_persistent_connections(self):
+        database = self.load(DB_POOL='1', DB_POOL_MAX_SIZE='20', DB_CONN_MAX_AGE='600')
+        self.assertEqual(database['CONN_MAX_AGE'], 0)
+        self.assertEqual(database['OPTIONS']['pool'], {'min_size': 2, 'max_size': 20, 'timeout': 10.0})
+
+class ProductionSettingsTests(CoreTestCase):
+    REQUIRED = {
+        'DJANGO_SECRET_KEY': 'secret',
+        'CACHE_BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'CACHE_LOCATION': 'redis://127.0.0.1:6379/1',
+        'CORE_METRICS_TOKEN': 'scrape',
+    }
+
+    @classmethod
+    def load(cls, **env):
+        """Import settings_production afresh with the required variables overridden by `env` (None unsets)."""
+        env = {**cls.REQUIRED, **env}
+        with mock.patch.dict(os.environ, {name: value for name, value in env.items() if value is not None}):
+            for name in [name for name, value in env.items() if value is None]:
+                os.environ.pop(name, None)
+            sys.modules.pop('django_backend.settings_production', None)
+            try:
+                return importlib.import_module('django_backend.settings_production')
+            finally:
+                sys.modules.pop('django_backend.settings_production', None)
+
+    def test_shared_cache_is_required(self):
+        production = self.load()
+        self.assertEqual(production.CACHES['default']['LOCATION'], 'redis://127.0.0.1:6379/1')
+        for name in ('CACHE_BACKEND', 'CACHE_LOCATION'):
+            with self.subTest(name), self.assertRaisesMessage(ImproperlyConfigured, name):
+                self.load(**{name: None})
+
+
+class ORJSONTests(CoreTestCase):
+    PAYLOAD = {
+        'results': [{
+            'id': 1, 'name': 'Zoë', 'price': 19.99, 'cost': Decimal('4.50'), 'active': True, 'notes': None,
+            'updated': datetime(2026, 3, 1, 8, 30, 15, 123456, tzinfo=dt_timezone.utc), 'day': date(2026, 3, 1),
+        }],
+        'next': None,
+    }
+
+    def test_renderer_output_matches_drf(self):
+        self.assertEqual(ORJSONRenderer().render(self.PAYLOAD), JSONRenderer().render(self.PAYLOAD))
+        for data in ({'big': 2 ** 70}, {'id': 1}):  # too wide for orjson; plain
+            self.assertEqual(ORJSONRenderer().render(data), JSONRenderer().render(data))
+        indented = ORJSONRenderer().render({'id': 1}, 'application/json; indent=2')
+        self.assertEqual(indented, JSONRenderer().render({'id': 1}, 'application/json; indent=2'))
+        self.assertEqual(ORJSONRenderer().render(None), b'')
+
+    def test_parser_round_trip_and_errors(self):
+        body = JSONRenderer().render(self.PAYLOAD)
+        self.assertEqual(ORJSONParser().parse(io.BytesIO(body)), JSONParser().parse(io.BytesIO(body)))
+        with self.assertRaises(ParseError):
+            ORJSONParser().parse(io.BytesIO(b'{"id": '))
+
+    def test_stdlib_fallback_without_orjson(self):
+        with mock.patch('core.renderers.orjson', None):
+            self.assertEqual(ORJSONRenderer().render(self.PAYLOAD), JSONRenderer().render(self.PAYLOAD))
+            self.assertEqual(ORJSONParser().parse(io.BytesIO(b'{"id": 1}')), {'id': 1})
+
+
+class BenchmarkDatabaseGuardTests(CoreTestCase):
+    def setUp(self):
+        super().setUp()
+        with mock.patch.object(sys, 'path', [str(settings.BASE_DIR / 'benchmarks'), *sys.path]):
+            self.datasets = importlib.import_module('datasets')
+
+    def test_only_benchmark_rows_are_accepted(self):
+        self.datasets.seed('products', 3)
+        self.datasets.bench_token()
+        self.datasets.require_bench_database()
+        Employee.objects.create(name='Alice', base_salary=3000)
+        with self.assertRaisesMessage(SystemExit, 'employees'):
+            self.datasets.require_bench_database()
+
+class MetricsTests(CoreTestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user('viewer', password='pw')
+        self.token = Token.objects.create(user=self.user)
+        Product.objects.create(name='Widget', description='', price=5)
+
+    @staticmethod
+    def requests_recorded(route):
+        return sum(count for (name, _, _), count in metrics.registry.requests.items() if name == route)
+
+    async def test_async_requests_are_measured(self):
+        before = self.requests_recorded('core.async_views.AsyncProductView')  # unnamed routes use the view path
+        headers = {'Authorization': f'Token {self.token.key}'}
+        response = await AsyncClient().get('/api/async/products/', headers=headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertRegex(response['Server-Timing'], r'db;dur=[\d.]+;desc="[1-9]\d* queries"')
+        self.assertEqual(self.requests_recorded('core.async_views.AsyncProductView'), before + 1)
+
+    def test_metrics_token(self):
+        with self.settings(CORE_METRICS_TOKEN='scrape'):
+            self.assertEqual(self.client.get('/metrics').status_code, 401)
+            self.assertEqual(self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer scrapf').status_code, 401)
+            with mock.patch('core.metrics.hmac.compare_digest', wraps=hmac.compare_digest) as compare:
+                response = self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer scrape')
+        self.assertContains(response, 'core_http_requests_total')
+        compare.assert_called_once_with(b'Bearer scrape', b'Bearer scrape')  # constant-time comparison
+
+    def test_production_requires_a_metrics_token(self):
+        with self.assertRaisesMessage(ImproperlyConfigured, 'CORE_METRICS_TOKEN'):
+            ProductionSettingsTests.load(CORE_METRICS_TOKEN=None)
+        self.assertEqual(ProductionSettingsTests.load().CORE_METRICS_TOKEN, 'scrape')
+
+
+class ThrottleKeyingTests(CoreTestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user('picker', password='pw')
+        self.token = Token.objects.create(user=self.user)
+        User.objects.create_user('colleague', password='pw')
+
+    async def test_async_user_budget_is_keyed_by_user_id(self):
+        token_client, session_client = AsyncClient(), AsyncClient()
+        await session_client.aforce_login(self.user)
+        headers = {token_client: {'Authorization': f'Token {self.token.key}'}, session_client: {}}
+        statuses = []
+        # with the user budget falling back to the anonymous one, the second request would be refused
+        with mock.patch.dict(SlidingWindowThrottle.THROTTLE_RATES, {'user': '3/min', 'anon': '1/min'}):
+            for client in (token_client, session_client, token_client, session_client):
+                statuses.append((await client.get('/api/async/products/', headers=headers[client])).status_code)
+        self.assertEqual(statuses, [200, 200, 200, 429])
+        self.assertIn(f'throttle_user_user:{self.user.pk}', throttling.get_store()._counters)
+
+    def test_login_budget_is_per_username(self):
+        with mock.patch.dict(SlidingWindowThrottle.THROTTLE_RATES, {'login': '2/min'}):
+            attempts = [self.client.post('/api/login/', {'username': 'picker', 'password': 'wrong'}).status_code
+                        for _ in range(3)]
+            colleague = self.client.post('/api/login/', {'username': 'colleague', 'password': 'pw'})
+        self.assertEqual(attempts, [400, 400, 429])
+        self.assertEqual(colleague.status_code, 200)
+
+    def test_there_is_no_unthrottled_password_login(self):
+        # DRF's obtain_auth_token sets throttle_classes = (), so it must not be routed
+        response = self.client.post('/api/api-token-auth/', {'username': 'picker', 'password': 'pw'})
+        self.assertEqual(response.status_code, 404)
+
+
+class SlidingWindowThrottleTests(CoreTestCase):
+    def test_previous_window_is_weighted_by_its_overlap(self):
+        store = throttling.LocalMemoryStore()
+        for _ in range(10):
+            store.hit('client', 1, 60, 10, 1.0)
+        # half of the previous window's 10 requests still count, so 5 more fit in window 2
+        allowed = [store.hit('client', 2, 60, 10, 0.5)[0] for _ in range(6)]
+        self.assertEqual(allowed, [True] * 5 + [False])
+        self.assertTrue(store.hit('client', 4, 60, 10, 1.0)[0])  # an idle window resets the count
+
+    def test_refusal_says_when_to_retry(self):
+        with mock.patch.dict(SlidingWindowThrottle.THROTTLE_RATES, {'anon': '2/min'}):
+            statuses = [self.client.get('/api/products/') for _ in range(3)]
+        self.assertEqual([response.status_code for response in statuses], [200, 200, 429])
+        self.assertTrue(1 <= int(statuses[2]['Retry-After']) <= 60)
+
+class LoginBusyTests(CoreTestCase):
+    def setUp(self):
+        super().setUp()
+        User.objects.create_user('picker', password='pw')
+        pool = mock.Mock()
+        pool.run.side_effect = LoginBusy
+        patcher = mock.patch('core.passwords.get_pool', return_value=pool)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def assertBusy(self, response):
+        self.assertEqual((response.status_code, response['Retry-After']), (503, '1'))
+
+    def test_login_view(self):
+        self.assertBusy(self.client.post('/api/login/', {'username': 'picker', 'password': 'pw'}))
+
+    def test_basic_auth(self):
+        credentials = base64.b64encode(b'picker:pw').decode()
+        self.assertBusy(self.client.get('/api/products/', HTTP_AUTHORIZATION=f'Basic {credentials}'))
+
+    def test_admin_login(self):
+        self.assertBusy(self.client.post('/admin/login/', {'username': 'picker', 'password': 'pw'}))
+
+
+class SparseFieldsetTests(CoreTestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        for i in range(3):
+            Product.objects.create(name=f'Lamp {i}', price=10.5 + i, description='long text ' * 50, image_url='')
+
+    def get(self, query):
+        response = self.client.get(f'/api/products/?{query}')
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_fields_trim_the_rows_and_the_select(self):
+        with CaptureQueriesContext(connection) as queries:
+            rows = self.get('fields=id,name')['results']
+        self.assertEqual([set(row) for row in rows], [{'id', 'name'}] * 3)
+        select = next(query['sql'] for query in queries if '"core_product"."name"' in query['sql'])
+        self.assertNotIn('description', select)
+        excluded = self.get('exclude=description,image_url')['results'][0]
+        self.assertEqual(set(excluded), {'id', 'name', 'price', 'updated_at'})
+
+    def test_unknown_fields_are_rejected(self):
+        response = self.client.get('/api/products/?fields=id,secret')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('secret', response.json()['fields'][0])
+
+    def test_lean_list_matches_the_serializer(self):
+        lean = self.get('ordering=-price')
+        cache.clear()
+        with mock.patch.object(views.ProductViewSet, 'lean_list', False):
+            self.assertEqual(self.get('ordering=-price'), lean)
+
+    def test_cursor_pages_without_the_ordering_field(self):
+        first = self.get('fields=name&ordering=price&page_size=2')
+        second = self.client.get(first['next']).json()
+        self.assertEqual([row['name'] for row in first['results'] + second['results']], ['Lamp 0', 'Lamp 1', 'Lamp 2'])
+
+
+@override_settings(PASSWORD_HASHERS=[
+    'django.contrib.auth.hashers.MD5PasswordHasher', 'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+])
+class PooledLoginTests(CoreTestCase):
+    def setUp(self):
+        super().setUp()
+        legacy = PBKDF2PasswordHasher().encode('pw', 'salt', iterations=1)  # older algorithm, cheap to check
+        self.user = User.objects.create(username='picker', password=legacy)
+        self.token = Token.objects.create(user=self.user)
+
+    def login(self, password='pw'):
+        return self.client.post('/api/login/', {'username': 'picker', 'password': password})
+
+    def test_login_rehashes_with_the_preferred_hasher(self):
+        self.assertEqual(self.login().json(), {'token': self.token.key})
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith('md5$'))
+        self.assertTrue(self.user.check_password('pw'))
+
+    def test_login_with_an_existing_token_costs_one_query(self):
+        self.login()
+        with self.assertNumQueries(1):
+            self.assertEqual(self.login().status_code, 200)
+        with self.assertNumQueries(1):
+            self.assertEqual(self.login('wrong').status_code, 400)
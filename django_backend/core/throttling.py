@@ -0,0 +1,171 @@
+"""
+Django Throttling.py - Purpose and Relationship
+
+Theoretical Understanding
+DRF's built-in throttles keep a list of request timestamps per client in the cache and rewrite the
+whole list on every request, so the cost grows with the rate being enforced. The throttles in this
+file use a sliding-window counter instead: two integers per client (this window's count and the
+previous window's count), and the request rate is estimated as
+
+    previous * (share of the previous window still inside the sliding window) + current
+
+which is O(1) per request and stays within a few percent of an exact sliding log. Only allowed
+requests are counted.
+
+Clients are identified by their user id when authenticated (all of a user's tokens and sessions
+share one budget), else by their IP address (BaseThrottle.get_ident, which honours NUM_PROXIES for
+X-Forwarded-For). A view can narrow its scoped budget with get_throttle_ident(request): LoginView
+counts logins per username and IP address, because the staff of a site log in from one address at
+shift start and a per-IP login budget would lock all of them out. The per-IP "anon" budget still
+bounds attempts across usernames.
+
+Counter storage (settings.CORE_THROTTLE_STORE, a dotted path):
+- LocalMemoryStore: a dict behind a lock in each process; no I/O, a few microseconds per request.
+  Budgets are per process, so use it for single-process deployments (or divide the rates).
+- CacheStore: Django's cache (get_many + add/incr). Shared by all workers when the cache is
+  (Redis, Memcached); one round trip to read, one to count.
+
+Relationship with Other Components
+1. Settings (settings.py)
+- REST_FRAMEWORK['DEFAULT_THROTTLE_CLASSES'] enables the three classes below for every DRF view
+- REST_FRAMEWORK['DEFAULT_THROTTLE_RATES'] holds the budgets: "anon", "user" and one per scope
+- CORE_THROTTLE_STORE selects the storage
+
+2. Views (views.py, async_views.py)
+- Per-route budgets: `throttle_scope` on a view, or on an action via @action(throttle_scope=...)
+  (LoginView "login", RegisterView "register", the /bulk/ and /import/ actions)
+- The async read views run the same throttles before serving a request
+"""
+
+import math
+import threading
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.module_loading import import_string
+from rest_framework.throttling import SimpleRateThrottle
+
+
+class LocalMemoryStore:
+    max_keys = 100_000
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {}  # key -> (window, current count, previous count)
+
+    def hit(self, key, window, duration, limit, weight):
+        """Count a request if the estimate is under limit; return (allowed, previous, current)."""
+        with self._lock:
+            entry = self._counters.get(key)
+            if entry is None or entry[0] < window - 1:
+                previous, current = 0, 0
+            elif entry[0] == window - 1:
+                previous, current = entry[1], 0
+            else:
+                previous, current = entry[2], entry[1]
+            if previous * weight + current >= limit:
+                return False, previous, current
+            self._counters[key] = (window, current + 1, previous)
+            if len(self._counters) > self.max_keys:
+                self._sweep(window)
+            return True, previous, current + 1
+
+    def _sweep(self, window):
+        self._counters = {key: entry for key, entry in self._counters.items() if entry[0] >= window - 1}
+
+
+class CacheStore:
+    def hit(self, key, window, duration, limit, weight):
+        current_key, previous_key = f'core:throttle:{key}:{window}', f'core:throttle:{key}:{window - 1}'
+        values = cache.get_many([current_key, previous_key])
+        previous, current = values.get(previous_key, 0), values.get(current_key, 0)
+        if previous * weight + current >= limit:
+            return False, previous, current
+        if not cache.add(current_key, 1, duration * 2):
+            try:
+                cache.incr(current_key)
+            except ValueError:  # expired between add() and incr()
+                cache.set(current_key, 1, duration * 2)
+        return True, previous, current + 1
+
+
+_store = None
+
+
+def get_store():
+    global _store
+    if _store is None:
+        _store = import_string(getattr(settings, 'CORE_THROTTLE_STORE', 'core.throttling.LocalMemoryStore'))()
+    return _store
+
+
+class SlidingWindowThrottle(SimpleRateThrottle):
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+        window, offset = divmod(self.timer(), self.duration)
+        weight = 1 - offset / self.duration
+        allowed, previous, current = get_store().hit(self.key, int(window), self.duration, self.num_requests, weight)
+        if not allowed:
+            self._retry_after = self._seconds_until_allowed(previous, current, offset)
+        return allowed
+
+    def _seconds_until_allowed(self, previous, current, offset):
+        # The previous window's share shrinks linearly until the current window ends
+        if current < self.num_requests and previous:
+            needed = previous * (1 - offset / self.duration) + current - self.num_requests + 1
+            return min(needed * self.duration / previous, self.duration - offset)
+        return self.duration - offset
+
+    def wait(self):
+        return math.ceil(getattr(self, '_retry_after', 0)) or None
+
+    def client_ident(self, request):
+        if request.user and request.user.is_authenticated:
+            return f'user:{request.user.pk}'
+        return f'ip:{self.get_ident(request)}'
+
+
+class AnonSlidingWindowThrottle(SlidingWindowThrottle):
+    """Budget "anon" per IP address for unauthenticated requests."""
+    scope = 'anon'
+
+    def get_cache_key(self, request, view):
+        if request.user and request.user.is_authenticated:
+            return None
+        return self.cache_format % {'scope': self.scope, 'ident': self.client_ident(request)}
+
+
+class UserSlidingWindowThrottle(SlidingWindowThrottle):
+    """Budget "user" per user id for authenticated requests."""
+    scope = 'user'
+
+    def get_cache_key(self, request, view):
+        if not (request.user and request.user.is_authenticated):
+            return None
+        return self.cache_format % {'scope': self.scope, 'ident': self.client_ident(request)}
+
+
+class ScopedSlidingWindowThrottle(SlidingWindowThrottle):
+    """Budget named by the view's `throttle_scope`, per client; views without a scope are not limited."""
+    scope_attr = 'throttle_scope'
+
+    def __init__(self):
+        pass  # the rate depends on the view, see allow_request
+
+    def allow_request(self, request, view):
+        self.scope = getattr(view, self.scope_attr, None)
+        if not self.scope:
+            return True
+        self.rate = self.get_rate()
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+        return super().allow_request(request, view)
+
+    def get_cache_key(self, request, view):
+        ident = self.client_ident(request)
+        if hasattr(view, 'get_throttle_ident'):
+            ident = f'{view.get_throttle_ident(request)}:{ident}'
+        return self.cache_format % {'scope': self.scope, 'ident': ident}
@@ -30,18 +30,35 @@ Current Implementation
         - /inventory/ - Inventory items
         - /products/ - Product catalog
         - /users/ - User information
+        - /attendance/ - Clock events (POST /attendance/ingest/ for batches)
+        - /attendance/daily/ - Daily attendance rollup (POST /attendance/daily/refresh/)
+        - /payroll/runs/ - Payroll runs (POST to compute, /<id>/lines/ for results)
+        - /jobs/ - Background jobs (POST to submit, /<id>/ for progress, /<id>/result/)
+        - /jobs/import/ - Upload a CSV for an inventory import job, /jobs/<id>/download/ for export files
+   - Bulk endpoints are generated by the router from BulkMixin:
+        - /employees/bulk/, /inventory/bulk/, /products/bulk/
+   - Streaming export endpoints are generated from ExportMixin:
+        - /employees/export/, /inventory/export/, /products/export/
+   - /inventory/import/ - Stock-count CSV upload
+   - /inventory/adjust/ - Signed stock adjustments, /inventory/<id>/movements/ - stock ledger (stock.py)
+   - /inventory/stream/ - Live InventoryItem deltas as server-sent events (ASGI only, live.py);
+     routed before the router so "stream" is not taken for an item id
+   - Changes feeds are generated from ChangesMixin:
+        - /employees/changes/, /inventory/changes/, /products/changes/
+   - Async read paths for ASGI servers (async_views.py), list and <id>/ detail:
+        - /async/employees/, /async/inventory/, /async/products/, /async/users/
         
 2. Authentication URLs
    - /register/ - New user registration
    - /logout/ - User logout
-   - /api-token-auth/ - Token authentication
-   - /login/ - User login
+   - /login/ - User login (the only password login, so every attempt counts against the "login" throttle)
 """
 
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from .views import EmployeeViewSet, InventoryItemViewSet, ProductViewSet, UserViewSet, RegisterView, LogoutView, LoginView
-from rest_framework.authtoken.views import obtain_auth_token
+from .views import AttendanceEventViewSet, PayrollRunViewSet, DailyAttendanceSummaryViewSet, JobViewSet
+from .async_views import AsyncEmployeeView, AsyncInventoryItemView, AsyncProductView, AsyncUserView, InventoryStreamView
 
 import logging
 
@@ -50,18 +67,30 @@ logger = logging.getLogger(__name__)
 router = DefaultRouter()
 logger.debug("Registering EmployeeViewSet at /employees/")
 router.register(r'employees', EmployeeViewSet)
-print("Debug: Registering InventoryItemViewSet at /inventory/")  # Debug print
+logger.debug("Registering InventoryItemViewSet at /inventory/")
 router.register(r'inventory', InventoryItemViewSet)
-print("Debug: Registering ProductViewSet at /products/")  # Debug print
+logger.debug("Registering ProductViewSet at /products/")
 router.register(r'products', ProductViewSet)
-print("Debug: Registering UserViewSet at /users/")  # Debug print
+logger.debug("Registering UserViewSet at /users/")
 router.register(r'users', UserViewSet)
+router.register(r'attendance/daily', DailyAttendanceSummaryViewSet)
+router.register(r'attendance', AttendanceEventViewSet)
+router.register(r'payroll/runs', PayrollRunViewSet)
+router.register(r'jobs', JobViewSet)
 
 urlpatterns = [
+    path('inventory/stream/', InventoryStreamView.as_view()),
     path('', include(router.urls)),
+    path('async/employees/', AsyncEmployeeView.as_view()),
+    path('async/employees/<int:pk>/', AsyncEmployeeView.as_view()),
+    path('async/inventory/', AsyncInventoryItemView.as_view()),
+    path('async/inventory/<int:pk>/', AsyncInventoryItemView.as_view()),
+    path('async/products/', AsyncProductView.as_view()),
+    path('async/products/<int:pk>/', AsyncProductView.as_view()),
+    path('async/users/', AsyncUserView.as_view()),
+    path('async/users/<int:pk>/', AsyncUserView.as_view()),
     path('register/', RegisterView.as_view()),
     path('logout/', LogoutView.as_view(), name='logout'),
-    path('api-token-auth/', obtain_auth_token),
     path('login/', LoginView.as_view(), name='login'),
     
 ]
@@ -66,11 +66,77 @@ Current Views:
    - InventoryItemViewSet: Inventory management endpoints
    - ProductViewSet: Product catalog endpoints
    - UserViewSet: Read-only user information
+   - All four list endpoints use cursor pagination (pagination.py)
 
-3. Authentication Views
+3. Bulk Endpoints (BulkMixin)
+   - POST   /<resource>/bulk/  [{...}, ...]              -> bulk_create
+   - PATCH  /<resource>/bulk/  [{"id": 1, ...}, ...]     -> bulk_update
+   - DELETE /<resource>/bulk/  [1, 2, 3]                 -> one DELETE ... WHERE id IN
+   - Each batch runs in one transaction; invalid rows are returned in "errors"
+     with their index and do not stop the valid rows from being written
+   - bulk_saved() runs after each bulk write (cache invalidation; InventoryItemViewSet also
+     pushes the changed items to the live stream, live.py)
+
+4. Streaming Export (ExportMixin)
+   - GET /<resource>/export/?output=csv|ndjson streams the whole table (exports.py)
+
+5. Inventory Import
+   - POST /inventory/import/ (multipart "file") streams a stock-count CSV into
+     InventoryItem with COPY + upsert on PostgreSQL (imports.py)
+   - POST /inventory/adjust/ [{"id": 1, "delta": -2, "reason": ...}, ...] applies signed stock
+     deltas in one UPDATE and records them in the StockMovement ledger (stock.py);
+     ?allow_negative=1 drops the non-negative guard, ?atomic=1 writes nothing if a row is rejected
+   - GET /inventory/<id>/movements/ lists the ledger of one item
+
+6. Response Caching (CachedResponseMixin)
+   - list/retrieve responses of the Employee, InventoryItem and Product ViewSets are cached
+     per query string and role, and carry ETag/Last-Modified headers (caching.py)
+   - Validators come from Max(updated_field) + Count over the filtered queryset (list) or the
+     row's own timestamp (detail), so unchanged polls get a 304 without serialization
+
+7. Changes Feed (ChangesMixin)
+   - GET /<resource>/changes/?since=<cursor or ISO timestamp> returns rows changed after the
+     cursor, ids deleted after it (tombstones) and the cursor for the next call (sync.py);
+     410 for a cursor older than the tombstone retention (CORE_TOMBSTONE_RETENTION_DAYS)
+
+8. Filtering, Search and Ordering
+   - ?name__istartswith= / ?name__icontains=, ?search=, ?ordering= on all three resources
+   - ?price__gte= / ?price__lte= on products, ?quantity__lte= / ?quantity__gte= on inventory
+   - ?fields=id,name,price / ?exclude=description select the fields returned and the columns
+     queried (list, detail, /changes/, /export/); lists are built from values() without
+     serializer instances (SparseFieldsMixin, fieldsets.py)
+
+9. Attendance
+   - AttendanceEventViewSet: read clock events (?employee=, ?timestamp__gte=, ?timestamp__lt=)
+   - POST /attendance/ingest/ accepts a batch of events and deduplicates them by
+     idempotency_key (attendance.py)
+   - DailyAttendanceSummaryViewSet: per (employee, date) rollup at /attendance/daily/
+     (?employee=, ?date__gte=, ?date__lte=, ?late=); POST /attendance/daily/refresh/ updates
+     the days touched since the last refresh (rollups.py)
+
+10. Payroll
+   - POST /payroll/runs/ computes pay for every employee for a period (payroll.py)
+   - GET /payroll/runs/<id>/lines/ lists the per-employee results
+
+11. Background Jobs
+   - POST /jobs/ {"kind": ..., "params": {...}} queues work for `manage.py run_workers` (jobs.py)
+   - GET /jobs/<id>/ reports status and progress, GET /jobs/<id>/result/ returns the result
+   - POST /jobs/import/ (multipart "file") uploads a CSV and queues an import_inventory job
+   - GET /jobs/<id>/download/ sends the file an export job wrote
+
+12. Read Replicas
+   - GETs on these ViewSets read from CORE_READ_REPLICAS unless the client wrote recently
+     (replicas.py); JobViewSet is @primary_only so job progress is never stale
+
+13. Throttling
+   - Every view is limited per client by the "anon"/"user" budgets; LoginView, RegisterView and the
+     /bulk/ and /import/ actions have their own budgets via throttle_scope (throttling.py)
+
+14. Authentication Views
    - RegisterView: User registration
-   - LoginView: User authentication with token generation
-   - LogoutView: Token deletion on logout
+   - LoginView: User authentication with token generation; password checks run in a bounded pool
+     and a full pool answers 503 (passwords.py)
+   - LogoutView: Token deletion on logout (also drops the cached token lookup)
 
 How to extend:
 1. Add Custom Permissions:
@@ -95,61 +161,392 @@ How to extend:
        return Response({'status': 'order processed'})
 
 4. Add Filtering and Search:
-   filter_backends = [filters.SearchFilter]
+   filter_backends = [FieldFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+   filter_fields = {'name': ['istartswith', 'icontains']}
    search_fields = ['name', 'description']
+   ordering_fields = ['id', 'name']
 """
 
 # default imports
-from django.shortcuts import render
+import hashlib
+import io
 
-from rest_framework import viewsets, permissions, generics
-from .models import Employee, InventoryItem, Product, User
-from .serializers import EmployeeSerializer, InventoryItemSerializer, ProductSerializer, UserSerializer, RegisterSerializer
+from django.conf import settings
+from django.contrib.auth import authenticate
+from django.core.handlers.asgi import ASGIRequest
+from django.db import transaction
+from django.db.models import Q
+from django.http import FileResponse
+from django.shortcuts import render
+from django.utils import timezone
+from rest_framework import filters, generics, permissions, status, viewsets
 from rest_framework.authtoken.models import Token
+from rest_framework.decorators import action, api_view
+from rest_framework.parsers import MultiPartParser
 from rest_framework.response import Response
+from rest_framework.reverse import reverse
 from rest_framework.views import APIView
-from django.contrib.auth import authenticate
-from rest_framework.decorators import api_view
+
+from .attendance import ingest_events
+from .authentication import invalidate_token
+from .caching import CachedResponseMixin, bump_generation
+from .exports import EXPORT_FORMATS, stream_export
+from .fieldsets import SparseFieldsMixin
+from .filters import FieldFilterBackend
+from .imports import import_inventory_csv
+from .jobs import job_file, store_upload, submit_job
+from .live import publish_inventory
+from .models import (
+    AttendanceEvent, DailyAttendanceSummary, Employee, InventoryItem, Job, PayrollRun, Product, Tombstone, User,
+)
+from .pagination import CoreCursorPagination
+from .passwords import LoginBusy
+from .payroll import run_payroll
+from .replicas import primary_only
+from .rollups import refresh_daily_attendance
+from .serializers import (
+    AttendanceEventSerializer, DailyAttendanceSummarySerializer, EmployeeSerializer, InventoryItemSerializer,
+    JobSerializer, PayrollLineSerializer, PayrollRunSerializer, ProductSerializer, RegisterSerializer,
+    StockMovementSerializer, UserSerializer,
+)
+from .stock import adjust_stock
+from .sync import InvalidCursor, collect_tombstones, cursor_expired, decode_cursor, next_cursor
 
 # Create your views here.
 class IsManager(permissions.BasePermission):
     def has_permission(self, request, view):
         return request.user.is_authenticated and request.user.role == 'manager'
 
-class EmployeeViewSet(viewsets.ModelViewSet):
+class BulkMixin:
+    bulk_max_rows = getattr(settings, 'CORE_BULK_MAX_ROWS', 5000)
+    throttle_scope = None  # set per action by @action(throttle_scope=...), see throttling.py
+
+    @action(detail=False, methods=['post', 'patch', 'delete'], url_path='bulk', throttle_scope='bulk')
+    def bulk(self, request):
+        rows = request.data
+        if not isinstance(rows, list):
+            return Response({'error': 'Expected a list of rows.'}, status=400)
+        if len(rows) > self.bulk_max_rows:
+            return Response({'error': f'At most {self.bulk_max_rows} rows per request.'}, status=400)
+        if request.method == 'POST':
+            return self.bulk_create(rows)
+        if request.method == 'PATCH':
+            return self.bulk_update(rows)
+        return self.bulk_destroy(rows)
+
+    def bulk_create(self, rows):
+        serializer = self.get_serializer(data=rows, many=True)
+        valid, errors = serializer.partition(rows)
+        model = self.queryset.model
+        objs = [model(**data) for _, data in valid]
+        with transaction.atomic():
+            model.objects.bulk_create(objs)
+            self.bulk_saved(objs)
+        return Response(
+            {'created': self.get_serializer(objs, many=True).data, 'errors': errors},
+            status=status.HTTP_201_CREATED if objs or not errors else status.HTTP_400_BAD_REQUEST,
+        )
+
+    def bulk_update(self, rows):
+        model = self.queryset.model
+        serializer = self.get_serializer(data=rows, many=True, partial=True)
+        valid, errors = serializer.partition(rows)
+        ids = [rows[index].get('id') for index, _ in valid]
+        auto_now = [f for f in model._meta.concrete_fields if getattr(f, 'auto_now', False)]
+        updated, fields = [], {f.name for f in auto_now}
+        with transaction.atomic():
+            instances = self.get_queryset().select_for_update().in_bulk(
+                [pk for pk in ids if isinstance(pk, int)]
+            )
+            now = timezone.now()
+            for index, data in valid:
+                instance = instances.get(rows[index].get('id'))
+                if instance is None:
+                    errors.append({'index': index, 'errors': {'id': ['Not found.']}})
+                    continue
+                for name, value in data.items():
+                    setattr(instance, name, value)
+                for field in auto_now:
+                    setattr(instance, field.attname, now)
+                fields.update(data)
+                updated.append(instance)
+            if updated and fields:
+                model.objects.bulk_update(updated, sorted(fields))
+                self.bulk_saved(updated)
+        errors.sort(key=lambda error: error['index'])
+        return Response(
+            {'updated': self.get_serializer(updated, many=True).data, 'errors': errors},
+            status=status.HTTP_200_OK if updated or not errors else status.HTTP_400_BAD_REQUEST,
+        )
+
+    def bulk_saved(self, objs):
+        """Called inside the transaction after a bulk write, which sends no post_save signals."""
+        bump_generation(self.queryset.model)
+
+    def bulk_destroy(self, rows):
+        ids = [row for row in rows if isinstance(row, int)]
+        errors = [{'index': index, 'errors': ['Expected an integer id.']}
+                  for index, row in enumerate(rows) if not isinstance(row, int)]
+        with transaction.atomic(), collect_tombstones():
+            deleted, _ = self.get_queryset().filter(id__in=ids).delete()
+        return Response({'deleted': deleted, 'errors': errors})
+
+class ExportMixin:
+    export_chunk_size = getattr(settings, 'CORE_EXPORT_CHUNK_SIZE', 2000)
+
+    @action(detail=False, methods=['get'], url_path='export')
+    def export(self, request):
+        output = request.query_params.get('output', 'csv')
+        if output not in EXPORT_FORMATS:
+            return Response({'error': f'Unsupported output: {output}.'}, status=400)
+        model = self.queryset.model
+        fieldset = self.get_fieldset() if isinstance(self, SparseFieldsMixin) else None
+        fields = [field.attname for field in model._meta.concrete_fields if fieldset is None or field.name in fieldset]
+        queryset = self.filter_queryset(self.get_queryset()).order_by('id')
+        # The body is streamed after ReplicaMiddleware has reset the route, so pick the database now
+        queryset = queryset.using(queryset.db)
+        return stream_export(queryset, fields, output, self.export_chunk_size, model._meta.model_name,
+                             asynchronous=isinstance(request._request, ASGIRequest))
+
+class ChangesMixin:
+    changes_page_size = getattr(settings, 'CORE_CHANGES_PAGE_SIZE', 1000)
+    changes_overlap = getattr(settings, 'CORE_CHANGES_OVERLAP', 5)
+
+    @action(detail=False, methods=['get'], url_path='changes')
+    def changes(self, request):
+        field = self.updated_field
+        try:
+            since = decode_cursor(request.query_params.get('since'))
+        except InvalidCursor:
+            return Response({'error': 'Invalid since cursor.'}, status=400)
+        if cursor_expired(since):
+            return Response({'error': 'Cursor older than the deletion history, sync again without since.'},
+                            status=status.HTTP_410_GONE)
+        after = Q(**{f'{field}__gt': since[0]}) | Q(**{field: since[0], 'pk__gt': since[1]})
+        queryset = self.filter_queryset(self.get_queryset()).filter(after).order_by(field, 'pk')
+        rows = list(queryset[:self.changes_page_size + 1])
+        has_more = len(rows) > self.changes_page_size
+        rows = rows[:self.changes_page_size]
+        deleted = Tombstone.objects.filter(
+            model=self.queryset.model._meta.label_lower, deleted_at__gt=since[0]
+        )
+        if has_more:
+            deleted = deleted.filter(deleted_at__lte=getattr(rows[-1], field))
+        return Response({
+            'changed': self.get_serializer(rows, many=True).data,
+            'deleted': list(deleted.values_list('object_id', flat=True).distinct()),
+            'next': next_cursor(rows, field, since, has_more, self.changes_overlap),
+            'has_more': has_more,
+        })
+
+CORE_FILTER_BACKENDS = [FieldFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+NAME_LOOKUPS = ['istartswith', 'icontains']
+
+class EmployeeViewSet(CachedResponseMixin, SparseFieldsMixin, BulkMixin, ExportMixin, ChangesMixin, viewsets.ModelViewSet):
     queryset = Employee.objects.all()
     serializer_class = EmployeeSerializer
+    pagination_class = CoreCursorPagination
+    updated_field = 'updated_at'
+    filter_backends = CORE_FILTER_BACKENDS
+    filter_fields = {'name': NAME_LOOKUPS, 'base_salary': ['gte', 'lte']}
+    search_fields = ['name']
+    ordering_fields = ['id', 'name', 'base_salary', 'updated_at']
     #permission_classes = [permissions.IsAuthenticated, IsManager]
     permission_classes = []
 
-class InventoryItemViewSet(viewsets.ModelViewSet):
+class InventoryItemViewSet(CachedResponseMixin, SparseFieldsMixin, BulkMixin, ExportMixin, ChangesMixin, viewsets.ModelViewSet):
     queryset = InventoryItem.objects.all()
     serializer_class = InventoryItemSerializer
+    pagination_class = CoreCursorPagination
+    updated_field = 'last_updated'
+    filter_backends = CORE_FILTER_BACKENDS
+    filter_fields = {'name': NAME_LOOKUPS, 'quantity': ['gte', 'lte', 'gt', 'lt'], 'unit': []}
+    search_fields = ['name']
+    ordering_fields = ['id', 'name', 'quantity', 'last_updated']
     permission_classes = [permissions.IsAuthenticated]
 
-class ProductViewSet(viewsets.ModelViewSet):
+    def bulk_saved(self, objs):
+        super().bulk_saved(objs)
+        publish_inventory(objs)
+
+    @action(detail=False, methods=['post'], url_path='import', parser_classes=[MultiPartParser], throttle_scope='import')
+    def import_csv(self, request):
+        upload = request.FILES.get('file')
+        if upload is None:
+            return Response({'error': 'Upload a CSV file in the "file" field.'}, status=400)
+        stream = io.TextIOWrapper(upload.file, encoding='utf-8-sig', newline='')
+        chunk_size = getattr(settings, 'CORE_IMPORT_CHUNK_SIZE', 5000)
+        return Response(import_inventory_csv(stream, chunk_size))
+
+    @action(detail=False, methods=['post'], url_path='adjust')
+    def adjust(self, request):
+        rows = request.data if isinstance(request.data, list) else [request.data]
+        if len(rows) > self.bulk_max_rows:
+            return Response({'error': f'At most {self.bulk_max_rows} rows per request.'}, status=400)
+        guard = str(request.query_params.get('allow_negative', '')).lower() not in ('1', 'true')
+        atomic = str(request.query_params.get('atomic', '')).lower() in ('1', 'true')
+        movements, errors = adjust_stock(rows, request.user, guard=guard, atomic=atomic)
+        code = status.HTTP_409_CONFLICT if errors and not movements else status.HTTP_200_OK
+        return Response({'applied': StockMovementSerializer(movements, many=True).data, 'errors': errors}, status=code)
+
+    @action(detail=True, methods=['get'])
+    def movements(self, request, pk=None):
+        item = self.get_object()
+        page = self.paginate_queryset(item.movements.all())
+        return self.get_paginated_response(StockMovementSerializer(page, many=True).data)
+
+class ProductViewSet(CachedResponseMixin, SparseFieldsMixin, BulkMixin, ExportMixin, ChangesMixin, viewsets.ModelViewSet):
     queryset = Product.objects.all()
     serializer_class = ProductSerializer
+    pagination_class = CoreCursorPagination
+    updated_field = 'updated_at'
+    filter_backends = CORE_FILTER_BACKENDS
+    filter_fields = {'name': NAME_LOOKUPS, 'price': ['gte', 'lte', 'gt', 'lt']}
+    search_fields = ['name']
+    ordering_fields = ['id', 'name', 'price', 'updated_at']
+
+class AttendanceEventViewSet(viewsets.ReadOnlyModelViewSet):
+    queryset = AttendanceEvent.objects.all()
+    serializer_class = AttendanceEventSerializer
+    pagination_class = CoreCursorPagination
+    permission_classes = [permissions.IsAuthenticated]
+    filter_backends = [FieldFilterBackend]
+    filter_fields = {'employee': [], 'event_type': [], 'timestamp': ['gte', 'lt']}
+    ingest_max_rows = getattr(settings, 'CORE_ATTENDANCE_MAX_BATCH', 10000)
+
+    @action(detail=False, methods=['post'], url_path='ingest')
+    def ingest(self, request):
+        rows = request.data
+        if not isinstance(rows, list):
+            return Response({'error': 'Expected a list of events.'}, status=400)
+        if len(rows) > self.ingest_max_rows:
+            return Response({'error': f'At most {self.ingest_max_rows} events per request.'}, status=400)
+        result = ingest_events(rows)
+        code = status.HTTP_400_BAD_REQUEST if result['errors'] and not result['accepted'] else status.HTTP_201_CREATED
+        return Response(result, status=code)
+
+class DailyAttendanceSummaryViewSet(viewsets.ReadOnlyModelViewSet):
+    queryset = DailyAttendanceSummary.objects.all()
+    serializer_class = DailyAttendanceSummarySerializer
+    pagination_class = CoreCursorPagination
+    permission_classes = [permissions.IsAuthenticated]
+    filter_backends = [FieldFilterBackend]
+    filter_fields = {'employee': [], 'date': ['gte', 'lte'], 'late': []}
+
+    @action(detail=False, methods=['post'], permission_classes=[IsManager])
+    def refresh(self, request):
+        full = str(request.data.get('full', '')).lower() in ('1', 'true')
+        return Response({'refreshed': refresh_daily_attendance(full=full)})
+
+class PayrollRunViewSet(viewsets.ReadOnlyModelViewSet):
+    queryset = PayrollRun.objects.all()
+    serializer_class = PayrollRunSerializer
+    pagination_class = CoreCursorPagination
+    permission_classes = [IsManager]
+
+    def create(self, request):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = dict(serializer.validated_data)
+        run = run_payroll(data.pop('period_start'), data.pop('period_end'), data)
+        return Response(self.get_serializer(run).data, status=status.HTTP_201_CREATED)
+
+    @action(detail=True, methods=['get'])
+    def lines(self, request, pk=None):
+        run = self.get_object()
+        page = self.paginate_queryset(run.lines.all())
+        return self.get_paginated_response(PayrollLineSerializer(page, many=True).data)
+
+@primary_only
+class JobViewSet(viewsets.ReadOnlyModelViewSet):
+    queryset = Job.objects.all()
+    serializer_class = JobSerializer
+    pagination_class = CoreCursorPagination
+    permission_classes = [IsManager]
+    filter_backends = [FieldFilterBackend]
+    filter_fields = {'kind': [], 'status': []}
+    throttle_scope = None  # set per action by @action(throttle_scope=...), see throttling.py
+
+    def create(self, request):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        job = submit_job(serializer.validated_data['kind'], serializer.validated_data.get('params'), request.user)
+        return Response(self.get_serializer(job).data, status=status.HTTP_202_ACCEPTED)
+
+    @action(detail=False, methods=['post'], url_path='import', parser_classes=[MultiPartParser],
+            throttle_scope='import')
+    def import_csv(self, request):
+        upload = request.FILES.get('file')
+        if upload is None:
+            return Response({'error': 'Upload a CSV file in the "file" field.'}, status=400)
+        job = submit_job('import_inventory', {'file': store_upload(upload)}, request.user)
+        return Response(self.get_serializer(job).data, status=status.HTTP_202_ACCEPTED)
+
+    @action(detail=True, methods=['get'])
+    def result(self, request, pk=None):
+        job = self.get_object()
+        if job.status == Job.SUCCEEDED:
+            if job.kind == 'export':
+                return Response({**job.result, 'download': reverse('job-download', args=[job.pk], request=request)})
+            return Response(job.result)
+        if job.status == Job.FAILED:
+            return Response({'status': job.status, 'error': job.error})
+        return Response({'status': job.status, 'progress': job.progress}, status=status.HTTP_409_CONFLICT)
+
+    @action(detail=True, methods=['get'])
+    def download(self, request, pk=None):
+        job = self.get_object()
+        if job.kind != 'export':
+            return Response({'error': 'Only export jobs have a file to download.'}, status=404)
+        if job.status != Job.SUCCEEDED:
+            return Response({'status': job.status, 'progress': job.progress}, status=status.HTTP_409_CONFLICT)
+        try:
+            path = job_file(job.result['file'])
+        except ValueError:
+            return Response({'error': 'The export file is no longer available.'}, status=410)
+        output = path.suffix.lstrip('.')
+        return FileResponse(open(path, 'rb'), as_attachment=True, filename=path.name,
+                            content_type=EXPORT_FORMATS[output])
 
 class UserViewSet(viewsets.ReadOnlyModelViewSet):
     queryset = User.objects.all()
     serializer_class = UserSerializer
+    pagination_class = CoreCursorPagination
 
 class RegisterView(generics.CreateAPIView):
     queryset = User.objects.all()
     serializer_class = RegisterSerializer
+    throttle_scope = 'register'
 
 class LogoutView(APIView):
     def post(self, request):
-        request.user.auth_token.delete()
+        token = request.auth  # the Token the request authenticated with, already loaded
+        if not isinstance(token, Token):
+            return Response({'error': 'Log out with the token to revoke.'}, status=400)
+        invalidate_token(token.key)
+        token.delete()
         return Response({"message": "Logged out successfully."})
 
 class LoginView(APIView):
+    throttle_scope = 'login'
+
+    def get_throttle_ident(self, request):
+        # The "login" budget is per username and IP: a whole site logs in from one address at shift start
+        username = str(request.data.get('username') or '')
+        return 'username:' + hashlib.sha256(username.encode()).hexdigest()[:32]
+
     def post(self, request):
         username = request.data.get('username')
         password = request.data.get('password')
-        user = authenticate(username=username, password=password)
+        try:
+            user = authenticate(request, username=username, password=password)
+        except LoginBusy:
+            return Response({'error': 'Too many logins in progress, retry shortly'},
+                            status=503, headers={'Retry-After': '1'})
         if user:
-            token, _ = Token.objects.get_or_create(user=user)
+            try:
+                token = user.auth_token  # loaded with the user by PooledModelBackend
+            except Token.DoesNotExist:
+                token, _ = Token.objects.get_or_create(user=user)
             return Response({'token': token.key})
         return Response({'error': 'Invalid credentials'}, status=400)
\ No newline at end of file
@@ -10,6 +10,10 @@ https://docs.djangoproject.com/en/3.2/howto/deployment/asgi/
 import os
 from django.core.asgi import get_asgi_application
 
-os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'django_backend.settings')
+# DJANGO_ENV=production selects the production profile (settings_production.py)
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', (
+    'django_backend.settings_production' if os.environ.get('DJANGO_ENV') == 'production'
+    else 'django_backend.settings'
+))
 
 application = get_asgi_application()
\ No newline at end of file
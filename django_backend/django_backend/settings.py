@@ -27,7 +27,7 @@ Relationship with Other Components
 
 2. Security and Authentication
 - Manages security settings like SECRET_KEY
-- Configures authentication backends
+- Configures authentication backends (password checks in a bounded pool, see core/passwords.py)
 - Sets password validation rules
 
 3. Middleware and URLs
@@ -39,8 +39,9 @@ Current Implementation
 1. Core Settings
 - Debug mode enabled for development
 - Custom user model configured
-- PostgreSQL database connection
+- PostgreSQL database connection (persistent connections or a psycopg 3 pool, set from the environment)
 - CORS configuration for frontend integration
+- Cursor pagination for list endpoints (REST_FRAMEWORK)
 
 2. Security Settings
 - Development-focused configuration
@@ -52,13 +53,26 @@ Current Implementation
 - REST Framework integration
 - Custom core app
 - CORS headers support
+
+4. Production Profile
+- settings_production.py builds on this module (DEBUG off, JSON-only API, cached templates,
+  cache backend and secrets from the environment); select it with DJANGO_ENV=production
 """
 
+import importlib.util
+import os
 from pathlib import Path
 
+from django.core.exceptions import ImproperlyConfigured
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
+
+def _env_flag(name, default):
+    return os.environ.get(name, default).strip().lower() in ('1', 'true', 'yes', 'on')
+
+
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/4.2/howto/deployment/checklist/
 
@@ -70,6 +84,106 @@ DEBUG = True
 
 ALLOWED_HOSTS = []
 
+REST_FRAMEWORK = {
+    'DEFAULT_AUTHENTICATION_CLASSES': [
+        'core.authentication.CachedTokenAuthentication',
+        'rest_framework.authentication.SessionAuthentication',
+        'rest_framework.authentication.BasicAuthentication',
+    ],
+    'DEFAULT_PAGINATION_CLASS': 'core.pagination.CoreCursorPagination',
+    'PAGE_SIZE': 100,
+    # Sliding-window throttles (core.throttling); per-route budgets are named by throttle_scope.
+    # CORE_THROTTLE=0 turns them off (the benchmark scripts do, so they measure the endpoints)
+    'DEFAULT_THROTTLE_CLASSES': [
+        'core.throttling.AnonSlidingWindowThrottle',
+        'core.throttling.UserSlidingWindowThrottle',
+        'core.throttling.ScopedSlidingWindowThrottle',
+    ] if _env_flag('CORE_THROTTLE', '1') else [],
+    'DEFAULT_THROTTLE_RATES': {
+        'anon': '300/min',     # per IP address
+        'user': '6000/min',    # per user id
+        'login': '10/min',     # per username and IP address (LoginView), see core/throttling.py
+        'register': '5/hour',
+        'bulk': '120/min',
+        'import': '10/hour',
+    },
+}
+
+# Where throttle counters live: LocalMemoryStore (per process) or CacheStore (Django's cache, shared
+# by all workers when the cache backend is)
+CORE_THROTTLE_STORE = 'core.throttling.LocalMemoryStore'
+
+# Upper bound for the ?page_size= query parameter on cursor-paginated endpoints
+CORE_MAX_PAGE_SIZE = 1000
+
+# Maximum number of rows accepted by one /bulk/ request
+CORE_BULK_MAX_ROWS = 5000
+
+# Rows fetched per server-side cursor round trip by the /export/ endpoints
+CORE_EXPORT_CHUNK_SIZE = 2000
+
+# Rows validated and loaded per batch by the inventory CSV import
+CORE_IMPORT_CHUNK_SIZE = 5000
+
+# Seconds a token -> user lookup stays in the cache (core.authentication)
+CORE_TOKEN_CACHE_TTL = 300
+
+# Seconds a cached list/detail API response is kept (core.caching)
+CORE_RESPONSE_CACHE_TTL = 60
+
+# Rows per page of the /changes/ feed, and how many seconds the caught-up cursor is moved back
+# so rows committed late by slow transactions are not missed (core.sync)
+CORE_CHANGES_PAGE_SIZE = 1000
+CORE_CHANGES_OVERLAP = 5
+
+# Days deletions are kept for the /changes/ feed; older cursors get 410 Gone (core.sync).
+# Run `python manage.py prune_tombstones` daily to delete older tombstones.
+CORE_TOMBSTONE_RETENTION_DAYS = 30
+
+# Maximum number of clock events accepted by one POST /attendance/ingest/ request
+CORE_ATTENDANCE_MAX_BATCH = 10000
+
+# Shift start (local time) and grace period used to flag late arrivals in the daily rollup
+CORE_SHIFT_START = '09:00'
+CORE_LATE_GRACE_MINUTES = 5
+
+# Live inventory stream (core.live): CORE_LIVE=0 turns it off (no publishing on saves), how long to
+# gather a burst of changes into one event, seconds between keepalive comments, and pending items
+# above which clients get a "reset" instead
+CORE_LIVE_ENABLED = _env_flag('CORE_LIVE', '1')
+CORE_LIVE_COALESCE_MS = 250
+CORE_LIVE_HEARTBEAT = 15
+CORE_LIVE_MAX_PENDING = 1000
+
+# Database aliases that safe GETs on the core API and reporting jobs read from (core.replicas),
+# and how many seconds a client reads from the primary after a write
+CORE_READ_REPLICAS = []
+CORE_REPLICA_PIN_SECONDS = 5
+
+# Request metrics (core.metrics): per-route latency, query counts and phase timings at /metrics and
+# in a Server-Timing header; requests over the query threshold are flagged as likely N+1.
+# CORE_METRICS_TOKEN, when set, is required as "Authorization: Bearer <token>" on /metrics.
+CORE_METRICS_ENABLED = _env_flag('CORE_METRICS', '1')
+CORE_METRICS_SERVER_TIMING = _env_flag('CORE_METRICS_SERVER_TIMING', '1')
+CORE_METRICS_QUERY_THRESHOLD = int(os.environ.get('CORE_METRICS_QUERY_THRESHOLD', 20))
+CORE_METRICS_TOKEN = os.environ.get('CORE_METRICS_TOKEN', '')
+
+# Directory for background job files: CSVs to import and finished exports (core.jobs). Every
+# worker and web process must see the same directory (a shared volume when they run on several hosts).
+CORE_JOB_FILES_DIR = Path(os.environ.get('CORE_JOB_FILES_DIR', BASE_DIR / 'job_files'))
+
+# Seconds a worker holds a running job between heartbeats; a job whose lease runs out (the worker
+# died) is claimed again, and failed after CORE_JOB_MAX_ATTEMPTS claims
+CORE_JOB_LEASE_SECONDS = int(os.environ.get('CORE_JOB_LEASE_SECONDS', 60))
+CORE_JOB_MAX_ATTEMPTS = 3
+
+# Default pay rules for payroll runs; each can be overridden per run (core.payroll)
+CORE_PAYROLL = {
+    'standard_hours': 160.0,
+    'overtime_multiplier': 1.5,
+    'deduction_rate': 0.1,
+}
+
 """ REST_FRAMEWORK = {
     # ...existing code...
     'DEFAULT_RENDERER_CLASSES': [
@@ -101,7 +215,37 @@ INSTALLED_APPS = [
 # Custom user model
 AUTH_USER_MODEL = 'core.User'
 
+# Password checks run in a bounded thread pool (core.passwords): CORE_LOGIN_WORKERS hashing threads
+# (default: one per CPU), CORE_LOGIN_QUEUE logins waiting for one, and the seconds a login waits for
+# a queue slot before LoginView answers 503
+AUTHENTICATION_BACKENDS = ['core.passwords.PooledModelBackend']
+CORE_LOGIN_WORKERS = int(os.environ.get('CORE_LOGIN_WORKERS', 0)) or None
+CORE_LOGIN_QUEUE = int(os.environ.get('CORE_LOGIN_QUEUE', 64))
+CORE_LOGIN_QUEUE_TIMEOUT = float(os.environ.get('CORE_LOGIN_QUEUE_TIMEOUT', 2.0))
+
+# New passwords are hashed with CORE_PASSWORD_HASHER: pbkdf2 (Django's default), scrypt, or argon2
+# (needs argon2-cffi). The other hashers still verify existing hashes, which are rehashed with the
+# preferred one when their user next logs in.
+_PASSWORD_HASHERS = {
+    'pbkdf2': 'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+    'scrypt': 'django.contrib.auth.hashers.ScryptPasswordHasher',
+    'argon2': 'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'pbkdf2_sha1': 'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'bcrypt_sha256': 'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+}
+CORE_PASSWORD_HASHER = os.environ.get('CORE_PASSWORD_HASHER', 'pbkdf2')
+if CORE_PASSWORD_HASHER not in ('pbkdf2', 'scrypt', 'argon2'):
+    raise ImproperlyConfigured('CORE_PASSWORD_HASHER must be pbkdf2, scrypt or argon2')
+if CORE_PASSWORD_HASHER == 'argon2' and importlib.util.find_spec('argon2') is None:
+    raise ImproperlyConfigured('CORE_PASSWORD_HASHER=argon2 needs the argon2-cffi package')
+PASSWORD_HASHERS = [_PASSWORD_HASHERS[CORE_PASSWORD_HASHER]] + [
+    path for name, path in _PASSWORD_HASHERS.items() if name != CORE_PASSWORD_HASHER
+]
+
 MIDDLEWARE = [
+    # Request metrics first, so they time the whole stack (removes itself when disabled)
+    'core.metrics.MetricsMiddleware',
+
     # Add CORS middleware at the top
     'corsheaders.middleware.CorsMiddleware',
 
@@ -111,6 +255,8 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'core.passwords.LoginBusyMiddleware',  # 503 when the login pool is full (core/passwords.py)
+    'core.replicas.ReplicaMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -138,14 +284,40 @@ WSGI_APPLICATION = 'django_backend.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
 
+# Connection management, read from the environment:
+#   DB_CONN_MAX_AGE        seconds a connection is reused across requests (default 60, 0 = close
+#                          after every request, "none" = never close)
+#   DB_CONN_HEALTH_CHECKS  check a reused connection before a request uses it (default 1)
+#   DB_POOL                1 = keep a psycopg 3 connection pool in each process instead
+#                          (needs psycopg[pool]). Use it under ASGI, where persistent connections
+#                          are not reused across requests.
+#   DB_POOL_MIN_SIZE, DB_POOL_MAX_SIZE, DB_POOL_TIMEOUT (seconds to wait for a free connection)
+# benchmarks/connections.py measures what each setting saves per request.
+DB_POOL = _env_flag('DB_POOL', '0')
+_conn_max_age = os.environ.get('DB_CONN_MAX_AGE', '60').strip().lower()
+DB_CONNECTION = {
+    # Django rejects persistent connections together with a pool
+    'CONN_MAX_AGE': 0 if DB_POOL else None if _conn_max_age == 'none' else int(_conn_max_age),
+    'CONN_HEALTH_CHECKS': _env_flag('DB_CONN_HEALTH_CHECKS', '1'),
+}
+DB_OPTIONS = {}
+if DB_POOL:
+    DB_OPTIONS['pool'] = {
+        'min_size': int(os.environ.get('DB_POOL_MIN_SIZE', 2)),
+        'max_size': int(os.environ.get('DB_POOL_MAX_SIZE', 10)),
+        'timeout': float(os.environ.get('DB_POOL_TIMEOUT', 10)),
+    }
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.postgresql',
-        'NAME': 'songfei_db',
-        'USER': 'songfei_user',
-        'PASSWORD': '8129',
-        'HOST': 'localhost',
-        'PORT': '5432',
+        'NAME': os.environ.get('DB_NAME', 'songfei_db'),
+        'USER': os.environ.get('DB_USER', 'songfei_user'),
+        'PASSWORD': os.environ.get('DB_PASSWORD', '8129'),
+        'HOST': os.environ.get('DB_HOST', 'localhost'),
+        'PORT': os.environ.get('DB_PORT', '5432'),
+        'OPTIONS': dict(DB_OPTIONS),
+        **DB_CONNECTION,
     }
 }
 
@@ -158,6 +330,34 @@ DATABASES = {
     }
 }"""
 
+# Read replicas: add one DATABASES entry per replica and list the aliases in CORE_READ_REPLICAS.
+# 'TEST': {'MIRROR': 'default'} makes the test runner use the primary in place of the replica.
+"""
+DATABASES['replica1'] = {
+    'ENGINE': 'django.db.backends.postgresql',
+    'NAME': 'songfei_db',
+    'USER': 'songfei_user',
+    'PASSWORD': '8129',
+    'HOST': 'replica1.internal',
+    'PORT': '5432',
+    'OPTIONS': dict(DB_OPTIONS),
+    'TEST': {'MIRROR': 'default'},
+    **DB_CONNECTION,
+}
+CORE_READ_REPLICAS = ['replica1']"""
+
+# To try the routing locally with two SQLite files, run `manage.py migrate --database replica`
+# once. Nothing copies rows between the files, so API reads show the replica's own data.
+"""
+DATABASES['replica'] = {
+    'ENGINE': 'django.db.backends.sqlite3',
+    'NAME': BASE_DIR / 'db-replica.sqlite3',
+    'TEST': {'MIRROR': 'default'},
+}
+CORE_READ_REPLICAS = ['replica']"""
+
+DATABASE_ROUTERS = ['core.replicas.ReplicaRouter']
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
@@ -0,0 +1,31 @@
+"""
+Django Settings_bench.py - Purpose and Relationship
+
+Theoretical Understanding
+The benchmark scripts (benchmarks/) seed up to a million rows per table and create their own users,
+so they must never run against the application's database. This module starts from settings.py
+and points the default connection at a separate database, named by BENCH_DB_NAME (default
+songfei_bench). DB_NAME is ignored here, so a shell that still exports the application's database
+name cannot redirect a run to it. Everything else (DB_HOST, DB_USER, DB_CONN_MAX_AGE, DB_POOL, ...)
+is read as in settings.py, so benchmarks/connections.py can still vary the connection settings.
+
+The scripts use this module unless DJANGO_SETTINGS_MODULE says otherwise, and the servers they start
+inherit it. Before seeding, datasets.require_bench_database() also refuses a database that holds
+any row the benchmarks did not create, whichever settings module is in use.
+
+Usage (from django_backend/):
+
+    createdb songfei_bench
+    DJANGO_SETTINGS_MODULE=django_backend.settings_bench python manage.py migrate
+    python benchmarks/api_suite.py --scale 0.01
+"""
+
+import os
+
+from .settings import *  # noqa: F401,F403
+from .settings import DATABASES
+
+DATABASES = {
+    **DATABASES,
+    'default': {**DATABASES['default'], 'NAME': os.environ.get('BENCH_DB_NAME', 'songfei_bench')},
+}
@@ -0,0 +1,109 @@
+"""
+Django Settings_production.py - Purpose and Relationship
+
+Theoretical Understanding
+settings.py is tuned for development: DEBUG = True makes Django keep every executed SQL query in
+memory (connection.queries) for the life of the process, and the browsable API renders HTML for
+every response. Under sustained load both cost memory and throughput. This module starts from
+settings.py and overrides what production needs:
+
+- DEBUG off, secret key and allowed hosts from the environment
+- JSON-only renderers (no browsable API, no HTML rendering), encoded with orjson when installed
+- cached template loaders
+- a shared cache backend (Redis, Memcached) from the environment: throttle counters,
+  response-cache generations, token lookups and read-replica pins live in the cache
+- persistent database connections (DB_CONN_MAX_AGE defaults to 600 here), or DB_POOL=1 under ASGI
+- throttle counters in the shared cache (CORE_THROTTLE_STORE)
+- new passwords hashed with scrypt (CORE_PASSWORD_HASHER; argon2 with argon2-cffi installed)
+- request metrics stay on, but the Server-Timing header is off unless CORE_METRICS_SERVER_TIMING=1,
+  and /metrics requires CORE_METRICS_TOKEN
+
+Selecting the profile
+Set DJANGO_ENV=production (manage.py, wsgi.py and asgi.py then load this module), or set
+DJANGO_SETTINGS_MODULE=django_backend.settings_production directly.
+
+Environment
+- DJANGO_SECRET_KEY (required), DJANGO_ALLOWED_HOSTS (comma-separated)
+- DJANGO_CORS_ALLOWED_ORIGINS (comma-separated, default: the development origins)
+- CORE_METRICS_TOKEN (required unless CORE_METRICS=0): the bearer token Prometheus scrapes /metrics with
+- CACHE_BACKEND and CACHE_LOCATION (required), e.g. django.core.cache.backends.redis.RedisCache and
+  redis://127.0.0.1:6379/1
+- DB_* as documented in settings.py
+
+Servers
+- WSGI: gunicorn -c gunicorn.conf.py django_backend.wsgi:application (worker settings in gunicorn.conf.py)
+- ASGI: uvicorn django_backend.asgi:application; uvicorn reads UVICORN_* variables, e.g.
+  UVICORN_WORKERS=4 UVICORN_BACKLOG=2048 UVICORN_TIMEOUT_KEEP_ALIVE=5 UVICORN_LIMIT_MAX_REQUESTS=50000
+  UVICORN_NO_ACCESS_LOG=1
+"""
+
+import os
+
+from django.core.exceptions import ImproperlyConfigured
+
+os.environ.setdefault('DB_CONN_MAX_AGE', '600')
+os.environ.setdefault('CORE_METRICS_SERVER_TIMING', '0')  # don't expose timings to public clients
+os.environ.setdefault('CORE_PASSWORD_HASHER', 'scrypt')  # existing hashes are upgraded at login
+
+from .settings import *  # noqa: E402,F401,F403
+from .settings import CORE_METRICS_ENABLED, REST_FRAMEWORK, TEMPLATES  # noqa: E402
+
+
+def _env_list(name, default=''):
+    return [value.strip() for value in os.environ.get(name, default).split(',') if value.strip()]
+
+
+def _env_required(name):
+    value = os.environ.get(name, '')
+    if not value:
+        raise ImproperlyConfigured(f'Set {name} for the production settings.')
+    return value
+
+
+DEBUG = False
+
+SECRET_KEY = _env_required('DJANGO_SECRET_KEY')
+
+ALLOWED_HOSTS = _env_list('DJANGO_ALLOWED_HOSTS')
+CORS_ALLOWED_ORIGINS = _env_list('DJANGO_CORS_ALLOWED_ORIGINS', 'http://localhost:3000')
+
+REST_FRAMEWORK = {
+    **REST_FRAMEWORK,
+    # orjson-backed when orjson is installed, DRF's stdlib JSON otherwise (core/renderers.py)
+    'DEFAULT_RENDERER_CLASSES': ['core.renderers.ORJSONRenderer'],
+    'DEFAULT_PARSER_CLASSES': [
+        'core.renderers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
+}
+
+TEMPLATES = [
+    {
+        **TEMPLATES[0],
+        'APP_DIRS': False,
+        'OPTIONS': {
+            **TEMPLATES[0]['OPTIONS'],
+            'loaders': [(
+                'django.template.loaders.cached.Loader',
+                ['django.template.loaders.filesystem.Loader', 'django.template.loaders.app_directories.Loader'],
+            )],
+        },
+    },
+]
+
+# /metrics names every route and its traffic; don't serve it unauthenticated
+if CORE_METRICS_ENABLED:
+    CORE_METRICS_TOKEN = _env_required('CORE_METRICS_TOKEN')
+
+# Throttle budgets have to hold across all workers
+CORE_THROTTLE_STORE = os.environ.get('CORE_THROTTLE_STORE', 'core.throttling.CacheStore')
+
+# Required: with a per-process cache each worker would keep its own throttle counters, token cache,
+# response-cache generations and replica pins, so budgets multiply and invalidations stay local
+CACHES = {
+    'default': {
+        'BACKEND': _env_required('CACHE_BACKEND'),
+        'LOCATION': _env_required('CACHE_LOCATION'),
+    }
+}
@@ -0,0 +1,42 @@
+"""
+Django Settings_test.py - Purpose and Relationship
+
+Theoretical Understanding
+The core tests (core/tests.py) exercise request handling, caching, throttling and the ORM paths.
+They need no PostgreSQL server: this module starts from settings.py and swaps in what makes a test
+run fast and self-contained:
+
+- an SQLite database (Django's test runner creates it in memory)
+- a fast password hasher first (the pool and the rehash-on-login path are tested with their own
+  PASSWORD_HASHERS)
+- a per-process memory cache and throttle store
+- background job files in a temporary directory
+
+Tests that need PostgreSQL (COPY, DISTINCT ON, LISTEN/NOTIFY) are skipped on SQLite; run the suite
+with the default settings against a PostgreSQL database to include them.
+
+Usage (from django_backend/):
+
+    python manage.py test core --settings=django_backend.settings_test
+"""
+
+import tempfile
+from pathlib import Path
+
+from .settings import *  # noqa: F401,F403
+from .settings import PASSWORD_HASHERS
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': ':memory:',
+    }
+}
+CORE_READ_REPLICAS = []
+
+CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+CORE_THROTTLE_STORE = 'core.throttling.LocalMemoryStore'
+
+PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher', *PASSWORD_HASHERS]
+
+CORE_JOB_FILES_DIR = Path(tempfile.mkdtemp(prefix='core-test-jobs-'))
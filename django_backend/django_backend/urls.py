@@ -65,6 +65,7 @@ Current Structure
 
 yourdomain.com/                  # Root
 ├── admin/                       # Django admin interface
+├── metrics                      # Prometheus metrics (core/metrics.py)
 └── api/                        # Your API (managed by core.urls)
     ├── employees/              # Employee endpoints
     ├── inventory/              # Inventory endpoints
@@ -77,7 +78,10 @@ This separation allows for better organization and scalability as you add more a
 from django.contrib import admin
 from django.urls import path, include
 
+from core.metrics import metrics_view
+
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/', include('core.urls')),
+    path('metrics', metrics_view),
 ]
@@ -10,5 +10,9 @@ https://docs.djangoproject.com/en/3.2/howto/deployment/wsgi/
 import os
 from django.core.wsgi import get_wsgi_application
 
-os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'django_backend.settings')
+# DJANGO_ENV=production selects the production profile (settings_production.py)
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', (
+    'django_backend.settings_production' if os.environ.get('DJANGO_ENV') == 'production'
+    else 'django_backend.settings'
+))
 application = get_wsgi_application()
@@ -0,0 +1,32 @@
+"""
+Gunicorn configuration for the WSGI app (gunicorn -c gunicorn.conf.py django_backend.wsgi:application).
+Gunicorn also loads it by default when started from this directory; set DJANGO_ENV=production to
+serve the production settings profile.
+
+Every value can be overridden from the environment. The defaults suit the API: requests spend most
+of their time waiting on PostgreSQL, so each process runs several threads (gthread), and each
+thread keeps its own persistent database connection. Size the pool of database connections as
+workers * threads (plus job workers) and keep it below PostgreSQL's max_connections.
+
+- GUNICORN_BIND             address to listen on (default 0.0.0.0:8000)
+- GUNICORN_WORKERS          processes (default: 2 * CPUs + 1)
+- GUNICORN_THREADS          threads per process (default 4)
+- GUNICORN_MAX_REQUESTS     recycle a worker after this many requests, with jitter (default 10000)
+- GUNICORN_TIMEOUT          seconds before a silent worker is restarted (default 30)
+- GUNICORN_KEEPALIVE        seconds to hold an idle keep-alive connection (default 5)
+"""
+
+import multiprocessing
+import os
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:8000')
+workers = int(os.environ.get('GUNICORN_WORKERS', multiprocessing.cpu_count() * 2 + 1))
+worker_class = 'gthread'
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 10000))
+max_requests_jitter = max_requests // 10
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 30))
+graceful_timeout = timeout
+keepalive = int(os.environ.get('GUNICORN_KEEPALIVE', 5))
+backlog = 2048
+accesslog = None
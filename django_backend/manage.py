@@ -6,7 +6,11 @@ import sys
 
 def main():
     """Run administrative tasks."""
-    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'django_backend.settings')
+    # DJANGO_ENV=production selects the production profile (settings_production.py)
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', (
+        'django_backend.settings_production' if os.environ.get('DJANGO_ENV') == 'production'
+        else 'django_backend.settings'
+    ))
     try:
         from django.core.management import execute_from_command_line
     except ImportError as exc:
@@ -12,18 +12,26 @@ export default function EmployeesPage() {
   const [employees, setEmployees] = useState<Employee[]>([]);
   const [newEmployee, setNewEmployee] = useState({ name: '', salary: '' });
   const [searchTerm, setSearchTerm] = useState('');
+  // Cursor links of the current page (null on the first/last page)
+  const [nextPage, setNextPage] = useState<string | null>(null);
+  const [previousPage, setPreviousPage] = useState<string | null>(null);
 
-  // Fetch all employees
-  const fetchEmployees = async () => {
+  // Load one page of the list; url is the first page or a next/previous link
+  const loadPage = async (url: string) => {
     try {
-      const response = await fetch('http://localhost:8000/api/employees/');
+      const response = await fetch(url);
       const data = await response.json();
-      setEmployees(data);
+      setEmployees(data.results);
+      setNextPage(data.next);
+      setPreviousPage(data.previous);
     } catch (error) {
       console.error('Error fetching employees:', error);
     }
   };
 
+  // Fetch all employees
+  const fetchEmployees = () => loadPage('http://localhost:8000/api/employees/');
+
   // Create new employee
   const createEmployee = async (e: React.FormEvent) => {
     e.preventDefault();
@@ -49,15 +57,8 @@ export default function EmployeesPage() {
   };
 
   // Search employees
-  const searchEmployees = async () => {
-    try {
-      const response = await fetch(`http://localhost:8000/api/search/?name=${searchTerm}`);
-      const data = await response.json();
-      setEmployees(data);
-    } catch (error) {
-      console.error('Error searching employees:', error);
-    }
-  };
+  const searchEmployees = () =>
+    loadPage(`http://localhost:8000/api/employees/?search=${encodeURIComponent(searchTerm)}`);
 
   // Add this with your other functions in EmployeesPage
   const deleteEmployee = async (id: number) => {
@@ -184,6 +185,22 @@ export default function EmployeesPage() {
             </table>
           </div>
         )}
+        <div className="flex justify-between mt-4">
+          <button
+            onClick={() => previousPage && loadPage(previousPage)}
+            disabled={!previousPage}
+            className="bg-gray-500 text-white px-4 py-2 rounded-md hover:bg-gray-600 disabled:opacity-50"
+          >
+            Previous
+          </button>
+          <button
+            onClick={() => nextPage && loadPage(nextPage)}
+            disabled={!nextPage}
+            className="bg-gray-500 text-white px-4 py-2 rounded-md hover:bg-gray-600 disabled:opacity-50"
+          >
+            Next
+          </button>
+        </div>
       </div>
     </div>
   );